@@ -0,0 +1,113 @@
+"""
+Latency benchmark: spawn-per-message (`python bot.py --message ...`, what the
+Node route did) vs. the persistent server (`python bot.py --serve`).
+
+    python bench_latency.py --messages 10 --concurrency 4
+
+Both paths hit the same Gemini model and MongoDB, so the difference is the
+per-message start-up cost (interpreter, imports, genai.configure, MongoClient).
+The streaming endpoint is also measured for time-to-first-token (TTFT).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+BOT_PATH = os.path.join(BOT_DIR, "bot.py")
+SAMPLE_MESSAGES = [
+    "How many open jobs are there?",
+    "Write a short job description for a backend engineer",
+    "Hello!",
+    "Which departments do we have?",
+]
+
+
+def summarize(label, samples_ms):
+    samples_ms = sorted(samples_ms)
+    p95 = samples_ms[min(len(samples_ms) - 1, int(round(0.95 * (len(samples_ms) - 1))))]
+    print(f"{label:<22} n={len(samples_ms):<4} mean={statistics.mean(samples_ms):8.1f} ms  "
+          f"p50={statistics.median(samples_ms):8.1f} ms  p95={p95:8.1f} ms")
+
+
+def spawn_once(message):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, BOT_PATH, "--message", message], cwd=BOT_DIR,
+                   capture_output=True, check=False)
+    return (time.perf_counter() - start) * 1000
+
+
+def post_once(url, message):
+    body = json.dumps({"message": message}).encode("utf-8")
+    req = urllib.request.Request(f"{url}/message", data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=120) as resp:
+        resp.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def stream_once(url, message):
+    """Return (ttft_ms, total_ms) for /message/stream as seen by the client."""
+    body = json.dumps({"message": message}).encode("utf-8")
+    req = urllib.request.Request(f"{url}/message/stream", data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    ttft = None
+    with urllib.request.urlopen(req, timeout=120) as resp:
+        for line in resp:
+            if ttft is None and json.loads(line).get("type") == "chunk":
+                ttft = (time.perf_counter() - start) * 1000
+    total = (time.perf_counter() - start) * 1000
+    return (ttft if ttft is not None else total), total
+
+
+def wait_for_server(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/health", timeout=2):
+                return True
+        except Exception:
+            time.sleep(0.25)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chatbot spawn vs. server latency benchmark")
+    parser.add_argument("--messages", type=int, default=10, help="Messages per path")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent requests against the server")
+    parser.add_argument("--port", type=int, default=5099)
+    parser.add_argument("--url", type=str, help="Use an already running server instead of starting one")
+    args = parser.parse_args()
+
+    messages = [SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)] for i in range(args.messages)]
+
+    summarize("spawn per message", [spawn_once(m) for m in messages])
+
+    server = None
+    url = args.url
+    if not url:
+        url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen([sys.executable, BOT_PATH, "--serve", "--port", str(args.port)], cwd=BOT_DIR)
+    try:
+        if not wait_for_server(url):
+            print("Chatbot server did not become healthy")
+            return
+        post_once(url, "warm-up")
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            summarize(f"server (c={args.concurrency})", list(pool.map(lambda m: post_once(url, m), messages)))
+            streamed = list(pool.map(lambda m: stream_once(url, m), messages))
+        summarize("stream TTFT", [ttft for ttft, _ in streamed])
+        summarize("stream total", [total for _, total in streamed])
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Prompt-size / CPU benchmark for knowledge rendering: `str(doc)` per document
+(KNOWLEDGE_FORMAT=repr) vs. the compact table renderer (KNOWLEDGE_FORMAT=table).
+
+    python bench_render.py --rows 5000
+
+Documents are synthetic but shaped like the backend's Mongoose models
+(ObjectId references, datetimes, enums, timestamps, __v).
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from compact_render import ReprRenderer, TableRenderer
+from knowledge_cache import CollectionSnapshot
+from retrieval import estimate_tokens
+
+
+def make_docs(name, rows, rng):
+    start = datetime(2025, 1, 1)
+    docs = []
+    for i in range(rows):
+        stamp = start + timedelta(minutes=rng.randrange(500000))
+        common = {"_id": ObjectId(), "createdAt": stamp, "updatedAt": stamp, "__v": 0}
+        if name == "users":
+            doc = {"name": f"Employee {i}", "email": f"employee{i}@example.com", "password": "$2a$10$" + "x" * 53,
+                   "role": rng.choice(["Admin", "HR", "Employee", "Candidate"]),
+                   "onboardingStatus": rng.choice(["Pending", "In Progress", "Completed"]), "googleId": None}
+        elif name == "payrolls":
+            base = rng.randrange(30000, 120000)
+            doc = {"employeeId": ObjectId(), "baseSalary": base, "bonus": 0, "deductions": 1200,
+                   "netPay": base - 1200, "month": f"2025-{rng.randrange(1, 13):02d}",
+                   "status": rng.choice(["Draft", "Approved", "Released"])}
+        else:
+            doc = {"employeeId": ObjectId(), "date": datetime(2025, rng.randrange(1, 13), rng.randrange(1, 29)),
+                   "status": rng.choice(["Present", "Absent", "On Leave"])}
+        docs.append({**common, **doc})
+    return docs
+
+
+def render(renderer, name, docs):
+    start = time.perf_counter()
+    snap = CollectionSnapshot(name)
+    for doc in docs:
+        snap.apply(doc, renderer)
+    block = snap.render_block(renderer)
+    return block, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge block rendering benchmark")
+    parser.add_argument("--rows", type=int, default=5000, help="Documents per collection")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'collection':<12} {'format':<6} {'chars':>10} {'~tokens':>9} {'render ms':>10}")
+    totals = {"repr": [0, 0.0], "table": [0, 0.0]}
+    for name in ("users", "payrolls", "attendances"):
+        docs = make_docs(name, args.rows, rng)
+        for label, renderer in (("repr", ReprRenderer()), ("table", TableRenderer())):
+            block, ms = render(renderer, name, docs)
+            totals[label][0] += estimate_tokens(block)
+            totals[label][1] += ms
+            print(f"{name:<12} {label:<6} {len(block):>10} {estimate_tokens(block):>9} {ms:>10.1f}")
+
+    repr_tokens, table_tokens = totals["repr"][0], totals["table"][0]
+    print(f"\nTotal ~tokens: repr={repr_tokens} table={table_tokens} "
+          f"({100 * (1 - table_tokens / repr_tokens):.0f}% smaller); "
+          f"render: repr={totals['repr'][1]:.0f} ms table={totals['table'][1]:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,142 @@
-import google.generativeai as genai
 from pymongo import MongoClient
-from config import GOOGLE_AI_KEY, MONGO_URI, DB_NAME, COLLECTION_NAMES
+from config import (
+    GOOGLE_AI_KEY, MONGO_URI, DB_NAME, COLLECTION_NAMES,
+    CHATBOT_HOST, CHATBOT_PORT, CHATBOT_WORKERS,
+    KNOWLEDGE_TTL_SECONDS, KNOWLEDGE_POLL_SECONDS, KNOWLEDGE_WATCH, KNOWLEDGE_FORMAT,
+    RETRIEVAL_ENABLED, RETRIEVAL_TOP_K, RETRIEVAL_CHUNK_CHARS, RETRIEVAL_EMBEDDER,
+    QUERY_ROUTING_ENABLED, QUERY_ROUTING_CREATE_INDEXES, QUERY_ROUTING_SCHEMA_TTL,
+    RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS,
+    RESPONSE_CACHE_SEMANTIC, RESPONSE_CACHE_THRESHOLD,
+    CHAT_MEMORY_TURNS, CHAT_MEMORY_SUMMARY_CHUNK, CHAT_MEMORY_TOKEN_BUDGET, CHAT_MEMORY_MAX_SESSIONS,
+    CHAT_MEMORY_COLLECTION, CHAT_MEMORY_SUMMARIZER,
+)
+from knowledge_cache import KnowledgeCache
+from compact_render import ReprRenderer, TableRenderer
+from query_router import QueryRouter, describe_result
+from response_cache import ResponseCache
+from conversation_memory import ConversationStore, format_turns, is_context_dependent
+from retrieval import ChunkIndex, GeminiEmbedder, HashingEmbedder, estimate_tokens
+from llm_client import LLMClient, make_transport
 import argparse
+import asyncio
+import json
 import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 # ---------------------------------------------
 # Gemini Configuration
 # ---------------------------------------------
-genai.configure(api_key=GOOGLE_AI_KEY)
-model = genai.GenerativeModel("gemini-2.0-flash")
+# All model calls go through the shared client (concurrency cap, rate
+# limit, retries on 429/5xx and a per-call deadline; see ai-services/common/llm_client.py).
+# LLM_BACKEND=stub swaps Gemini for an offline fake for load tests.
+llm = LLMClient(make_transport("gemini-2.0-flash", api_key=GOOGLE_AI_KEY))
 
 # ---------------------------------------------
 # MongoDB Setup
 # ---------------------------------------------
 client = MongoClient(MONGO_URI)
 db = client[DB_NAME]
+knowledge_cache = KnowledgeCache(
+    db, COLLECTION_NAMES, ttl_seconds=KNOWLEDGE_TTL_SECONDS, poll_seconds=KNOWLEDGE_POLL_SECONDS,
+    renderer=ReprRenderer() if KNOWLEDGE_FORMAT == "repr" else TableRenderer(),
+)
 
 # ---------------------------------------------
 # Fetch Knowledge from Multiple MongoDB Collections
 # ---------------------------------------------
 def get_knowledge_from_mongo():
-    knowledge_chunks = []
+    # Served from the cached per-collection snapshot; collections are only
+    # re-read incrementally (or on TTL expiry), never per message.
+    return knowledge_cache.get_text()
 
-    for col_name in COLLECTION_NAMES:
-        col = db[col_name]
-        docs = list(col.find({}, {"_id": 0}))
+# ---------------------------------------------
+# Retrieve Relevant Knowledge Chunks
+# ---------------------------------------------
+embedder = GeminiEmbedder(llm) if RETRIEVAL_EMBEDDER == "gemini" else HashingEmbedder()
+chunk_index = ChunkIndex(embedder, chunk_chars=RETRIEVAL_CHUNK_CHARS)
+
+
+def get_relevant_knowledge(user_message: str, stats: dict = None) -> str:
+    blocks = knowledge_cache.snapshot()
+    full_knowledge = "\n".join(blocks.values())
+    if not RETRIEVAL_ENABLED:
+        knowledge = full_knowledge
+    else:
+        chunk_index.sync(blocks)
+        chunks = chunk_index.search(user_message, RETRIEVAL_TOP_K)
+        knowledge = "\n".join(chunks) if chunks else "No relevant records found"
+
+    if stats is not None:
+        stats["knowledge_tokens_full"] = estimate_tokens(full_knowledge)
+        stats["knowledge_tokens_used"] = estimate_tokens(knowledge)
+    return knowledge
+
+# ---------------------------------------------
+# Route Aggregate Questions to MongoDB
+# ---------------------------------------------
+query_router = QueryRouter(
+    db, COLLECTION_NAMES, schema_ttl=QUERY_ROUTING_SCHEMA_TTL, create_indexes=QUERY_ROUTING_CREATE_INDEXES
+)
 
-        if docs:
-            knowledge_chunks.append(
-                f"--- Collection: {col_name} ---\n" + "\n".join([str(doc) for doc in docs])
-            )
-        else:
-            knowledge_chunks.append(f"--- Collection: {col_name} ---\nNo data found")
 
-    return "\n".join(knowledge_chunks)
+def build_routed_prompt(user_message: str, plan: dict, result) -> str:
+    return f"""
+You are a friendly and knowledgeable HRMS chatbot.
+
+The user's question was answered exactly by a database query:
+{describe_result(plan, result)}
+
+Phrase this result as a short, natural answer. Use only these numbers and records;
+do not estimate or add data.
+
+User: {user_message}
+"""
+
+# ---------------------------------------------
+# Response Cache
+# ---------------------------------------------
+response_cache = ResponseCache(
+    max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=RESPONSE_CACHE_TTL_SECONDS,
+    embedder=embedder if RESPONSE_CACHE_SEMANTIC else None,
+    threshold=RESPONSE_CACHE_THRESHOLD,
+)
+
+# ---------------------------------------------
+# Conversation Memory
+# ---------------------------------------------
+def summarize_turns(summary: str, turns) -> str:
+    prompt = f"""
+Update the running summary of an HRMS chatbot conversation.
+Keep names, numbers, filters and open questions the user may refer back to.
+Reply with the updated summary only, in at most 8 short bullet points.
+
+Current summary:
+{summary or "(empty)"}
+
+New messages:
+{format_turns(turns)}
+"""
+    return llm.generate(prompt, operation="chatbot.summary")
+
+
+memory = ConversationStore(
+    keep_turns=CHAT_MEMORY_TURNS,
+    summary_chunk=CHAT_MEMORY_SUMMARY_CHUNK,
+    token_budget=CHAT_MEMORY_TOKEN_BUDGET,
+    max_sessions=CHAT_MEMORY_MAX_SESSIONS,
+    summarize=summarize_turns if CHAT_MEMORY_SUMMARIZER == "llm" else None,
+    collection=db[CHAT_MEMORY_COLLECTION] if CHAT_MEMORY_COLLECTION else None,
+)
 
 # ---------------------------------------------
 # Generate Gemini Response with Fallback
 # ---------------------------------------------
-def generate_response(user_message: str) -> str:
-    knowledge = get_knowledge_from_mongo()
+def build_prompt(user_message: str, stats: dict = None, history: str = "", search_text: str = None) -> str:
+    knowledge = get_relevant_knowledge(search_text or user_message, stats)
+    history_block = f"Conversation so far:\n{history}\n\n" if history else ""
 
     prompt = f"""
 You are a friendly and knowledgeable HRMS chatbot.
@@ -55,14 +152,233 @@ Your response rules:
 2. If the question is a general or creative request (e.g., "write a job description", greetings, templates), use your own knowledge to generate a natural response.
 3. If the question is completely irrelevant to HRMS or general topics, politely say you can’t answer it.
 
-User: {user_message}
+{history_block}User: {user_message}
 """
+    if stats is not None:
+        overhead = estimate_tokens(prompt) - stats["knowledge_tokens_used"]
+        stats["prompt_tokens_before"] = overhead + stats["knowledge_tokens_full"]
+        stats["prompt_tokens_after"] = overhead + stats["knowledge_tokens_used"]
+    return prompt
+
+
+def prepare_prompt(user_message: str, stats: dict, session_id: str = None):
+    """Return (prompt, fallback) where fallback is the exact answer for routed questions."""
+    routed = query_router.route(user_message) if QUERY_ROUTING_ENABLED else None
+    if routed:
+        plan, pipeline, result = routed
+        prompt = build_routed_prompt(user_message, plan, result)
+        stats.update(route="aggregate", collection=plan["collection"], pipeline=str(pipeline),
+                     prompt_tokens_after=estimate_tokens(prompt))
+        print(f"Routed to {plan['collection']}: {pipeline}", file=sys.stderr)
+        # The exact answer is already known; don't lose it to an LLM error.
+        return prompt, describe_result(plan, result)
+
+    history, search_text = "", None
+    if session_id:
+        history = memory.context(session_id)
+        # Follow-ups ("and in Sales?") retrieve with the previous question too.
+        search_text = " ".join(memory.recent_user_messages(session_id, 1) + [user_message])
+        stats["history_tokens"] = estimate_tokens(history)
+    prompt = build_prompt(user_message, stats, history, search_text)
+    stats["route"] = "retrieval"
+    print(
+        f"Prompt tokens (est.): {stats['prompt_tokens_before']} with full collections, "
+        f"{stats['prompt_tokens_after']} with retrieval",
+        file=sys.stderr,
+    )
+    return prompt, None
+
+
+def stream_response(user_message: str, stats: dict = None, session_id: str = None):
+    """Yield the reply in text chunks as Gemini produces them.
+
+    Records `ttft_ms` (time to first chunk) and `latency_ms` in stats. With a
+    session_id the exchange is added to that conversation's memory.
+    """
+    stats = {} if stats is None else stats
+    start = time.perf_counter()
+
+    def mark_first_chunk():
+        if "ttft_ms" not in stats:
+            stats["ttft_ms"] = round((time.perf_counter() - start) * 1000, 1)
 
+    def finish():
+        stats["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    def remember(reply):
+        if session_id:
+            memory.append(session_id, user_message, reply)
+
+    # Follow-ups ("what about their salaries?") depend on earlier messages and
+    # are not reusable across sessions; standalone questions are, even mid-conversation.
+    use_cache = RESPONSE_CACHE_ENABLED and not (
+        session_id and is_context_dependent(user_message) and memory.recent_user_messages(session_id, 1)
+    )
+    if use_cache:
+        # Refresh the snapshot first so the version reflects current data.
+        knowledge_cache.snapshot()
+        version = knowledge_cache.version
+        cached, tier = response_cache.get(user_message, version)
+        stats["cache"] = tier
+        if cached is not None:
+            mark_first_chunk()
+            yield cached
+            remember(cached)
+            finish()
+            return
+
+    prompt, fallback = prepare_prompt(user_message, stats, session_id)
+    parts = []
     try:
-        response = model.generate_content(prompt)
-        return response.text.strip() if response and response.text else "I'm sorry, I didn’t understand that."
+        for text in llm.stream(prompt, operation="chatbot.reply"):
+            if not text:
+                continue
+            if not parts:
+                text = text.lstrip()
+                mark_first_chunk()
+            parts.append(text)
+            yield text
     except Exception as e:
-        return f"Error: {e}"
+        mark_first_chunk()
+        if parts:
+            yield f"\n\nError: {e}"
+        else:
+            yield fallback or f"Error: {e}"
+            if fallback:
+                remember(fallback)
+        finish()
+        return
+
+    reply = "".join(parts).strip()
+    if not reply:
+        mark_first_chunk()
+        reply = "I'm sorry, I didn’t understand that."
+        yield reply
+    else:
+        if use_cache:
+            response_cache.put(user_message, version, reply)
+        remember(reply)
+    finish()
+
+
+def generate_response(user_message: str, stats: dict = None, session_id: str = None) -> str:
+    return "".join(stream_response(user_message, stats, session_id)).strip()
+
+# ---------------------------------------------
+# Persistent HTTP Server Mode
+# ---------------------------------------------
+# Keeps the Gemini client and the Mongo connection pool warm across
+# messages instead of paying interpreter start-up, imports and connection
+# handshakes for every chat message. Blocking model/DB calls run on a
+# bounded thread pool so requests are served concurrently.
+def create_app():
+    from aiohttp import web
+
+    executor = ThreadPoolExecutor(max_workers=CHATBOT_WORKERS, thread_name_prefix="chatbot")
+    started_at = time.time()
+
+    async def handle_message(request):
+        try:
+            data = await request.json()
+        except Exception:
+            return web.json_response({"error": "Invalid JSON body"}, status=400)
+
+        message = (data.get("message") or "").strip()
+        if not message:
+            return web.json_response({"error": "Message is required"}, status=400)
+
+        session_id = data.get("session_id") or uuid.uuid4().hex
+        start = time.perf_counter()
+        stats = {}
+        loop = asyncio.get_running_loop()
+        reply = await loop.run_in_executor(executor, generate_response, message, stats, session_id)
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        return web.json_response({"response": reply, "session_id": session_id,
+                                  "latency_ms": latency_ms, "stats": stats})
+
+    async def handle_message_stream(request):
+        """NDJSON: {"type": "chunk", "text"} lines, then one {"type": "done", ...} line."""
+        try:
+            data = await request.json()
+        except Exception:
+            return web.json_response({"error": "Invalid JSON body"}, status=400)
+
+        message = (data.get("message") or "").strip()
+        if not message:
+            return web.json_response({"error": "Message is required"}, status=400)
+
+        session_id = data.get("session_id") or uuid.uuid4().hex
+        response = web.StreamResponse(headers={
+            "Content-Type": "application/x-ndjson",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        })
+        await response.prepare(request)
+
+        # The Gemini stream is a blocking iterator: drain it on the executor
+        # and hand chunks to the event loop through a queue.
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        stats = {}
+        done = object()
+
+        def produce():
+            try:
+                for text in stream_response(message, stats, session_id):
+                    loop.call_soon_threadsafe(chunks.put_nowait, text)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, done)
+
+        producer = loop.run_in_executor(executor, produce)
+        parts = []
+        while True:
+            text = await chunks.get()
+            if text is done:
+                break
+            parts.append(text)
+            await response.write((json.dumps({"type": "chunk", "text": text}) + "\n").encode("utf-8"))
+        await producer
+
+        summary = {"type": "done", "response": "".join(parts).strip(), "session_id": session_id,
+                   "ttft_ms": stats.get("ttft_ms"), "latency_ms": stats.get("latency_ms"), "stats": stats}
+        await response.write((json.dumps(summary) + "\n").encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    async def handle_health(request):
+        return web.json_response({"ok": True, "uptime_s": round(time.time() - started_at, 1)})
+
+    async def handle_session_delete(request):
+        memory.clear(request.match_info["session_id"])
+        return web.json_response({"ok": True})
+
+    async def handle_cache_stats(request):
+        return web.json_response(response_cache.stats())
+
+    async def handle_llm_stats(request):
+        return web.json_response(llm.stats())
+
+    async def on_cleanup(app):
+        executor.shutdown(wait=False)
+
+    app = web.Application()
+    app.router.add_post("/message", handle_message)
+    app.router.add_post("/message/stream", handle_message_stream)
+    app.router.add_get("/health", handle_health)
+    app.router.add_get("/cache/stats", handle_cache_stats)
+    app.router.add_get("/llm/stats", handle_llm_stats)
+    app.router.add_delete("/sessions/{session_id}", handle_session_delete)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+def serve(host=CHATBOT_HOST, port=CHATBOT_PORT):
+    from aiohttp import web
+
+    if KNOWLEDGE_WATCH:
+        knowledge_cache.watch()
+    print(f"🤖 HRMS Chatbot server listening on http://{host}:{port}")
+    web.run_app(create_app(), host=host, port=port, print=None)
 
 # ---------------------------------------------
 # CLI Chat Interface or API Mode
@@ -70,17 +386,37 @@ User: {user_message}
 def main():
     parser = argparse.ArgumentParser(description='HRMS Chatbot with MongoDB + Gemini')
     parser.add_argument('--message', type=str, help='Message to process (API mode)')
+    parser.add_argument('--stream', action='store_true', help='With --message, print NDJSON chunks as they arrive')
+    parser.add_argument('--session', type=str, help='Conversation id to continue (needs CHAT_MEMORY_COLLECTION across runs)')
+    parser.add_argument('--serve', action='store_true', help='Run as a persistent HTTP server')
+    parser.add_argument('--host', type=str, default=CHATBOT_HOST, help='Server bind address')
+    parser.add_argument('--port', type=int, default=CHATBOT_PORT, help='Server port')
     args = parser.parse_args()
 
+    # Server mode (used by the Node backend when CHATBOT_SERVICE_URL is set)
+    if args.serve:
+        serve(args.host, args.port)
+        return
+
     # API mode (useful for frontend calls)
+    if args.message and args.stream:
+        stats, parts = {}, []
+        for text in stream_response(args.message, stats, args.session):
+            parts.append(text)
+            print(json.dumps({"type": "chunk", "text": text}), flush=True)
+        print(json.dumps({"type": "done", "response": "".join(parts).strip(), "ttft_ms": stats.get("ttft_ms"),
+                          "latency_ms": stats.get("latency_ms")}), flush=True)
+        return
+
     if args.message:
-        reply = generate_response(args.message)
+        reply = generate_response(args.message, session_id=args.session)
         print(reply)
         return
 
     # CLI mode
     print("🤖 HRMS Chatbot (MongoDB + Gemini)")
     print("Type 'exit' to quit.\n")
+    session_id = args.session or f"cli-{uuid.uuid4().hex}"
 
     while True:
         user_input = input("You: ")
@@ -88,7 +424,7 @@ def main():
             print("Chatbot: Goodbye! 👋")
             break
 
-        reply = generate_response(user_input)
+        reply = generate_response(user_input, session_id=session_id)
         print(f"Chatbot: {reply}\n")
 
 
@@ -0,0 +1,102 @@
+import re
+from datetime import datetime
+
+from bson import ObjectId
+
+# ---------------------------------------------
+# Compact Tabular Rendering of Collection Documents
+# ---------------------------------------------
+# `str(doc)` repeats every key on every row and spells out ObjectId(...) and
+# datetime.datetime(...) reprs. The table renderer instead writes the
+# column names once per collection ("# name | email | role") followed by
+# one delimited row per document, keeps only useful fields, formats dates
+# and nested values compactly and orders rows deterministically by _id.
+# Measured with bench_render.py.
+
+# Fields kept per collection (in this order). Collections not listed keep
+# every field except HIDDEN_FIELDS, in first-seen order.
+DEFAULT_FIELDS = {
+    "users": ["name", "email", "role", "onboardingStatus"],
+    "jobs": ["title", "location", "description", "applications", "createdAt"],
+    "jobapplications": ["candidateName", "candidateEmail", "jobId", "createdAt"],
+    "leaverequests": ["employeeId", "startDate", "endDate", "reason", "status"],
+    "payrolls": ["employeeId", "month", "baseSalary", "bonus", "deductions", "netPay", "status"],
+    "attendances": ["employeeId", "date", "status"],
+    "projects": ["title", "description", "deadline", "status"],
+    "feedbacks": ["employeeId", "rating", "message"],
+    "interviews": ["title", "candidateId", "scheduledAt", "duration", "status"],
+}
+
+HIDDEN_FIELDS = {"_id", "__v", "password", "googleId", "resumePath", "roomId", "createdBy"}
+WHITESPACE_RE = re.compile(r"\s+")
+NEEDS_CLEANUP_RE = re.compile(r"[\n\r\t|]|  ")
+
+
+class ReprRenderer:
+    """The original one-`str(dict)`-per-document format."""
+
+    def update_columns(self, snap, doc) -> bool:
+        return False
+
+    def header(self, snap) -> str:
+        return ""
+
+    def row(self, snap, doc) -> str:
+        return str({k: v for k, v in doc.items() if k != "_id"})
+
+
+class TableRenderer:
+    def __init__(self, fields=None, max_cell_chars=160, delimiter=" | "):
+        self.fields = DEFAULT_FIELDS if fields is None else fields
+        self.max_cell_chars = max_cell_chars
+        self.delimiter = delimiter
+
+    def update_columns(self, snap, doc) -> bool:
+        """Set/extend snap.columns for `doc`; True if existing rows must be re-rendered."""
+        if snap.columns is None:
+            snap.columns = list(self.fields.get(snap.name, []))
+            if snap.name in self.fields:
+                return False
+        if snap.name in self.fields:
+            return False
+        added = [k for k in doc if k not in HIDDEN_FIELDS and k not in snap.columns]
+        snap.columns.extend(added)
+        return bool(added)
+
+    def header(self, snap) -> str:
+        return "# " + self.delimiter.join(snap.columns or [])
+
+    def row(self, snap, doc) -> str:
+        return self.delimiter.join(self.format_value(doc.get(column)) for column in snap.columns or [])
+
+    def format_value(self, value) -> str:
+        # Fast paths first: plain strings and ints are most cells.
+        kind = type(value)
+        if kind is str and len(value) <= self.max_cell_chars and not NEEDS_CLEANUP_RE.search(value):
+            return value
+        if kind is int:
+            return str(value)
+        if value is None:
+            return ""
+        if kind is ObjectId:
+            return value.binary[-3:].hex()  # short, still distinguishes references
+        if isinstance(value, datetime):
+            date = f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
+            if value.hour == value.minute == value.second == 0:
+                return date
+            return f"{date} {value.hour:02d}:{value.minute:02d}"
+        if isinstance(value, float):
+            return f"{value:g}"
+        if isinstance(value, dict):
+            text = ";".join(f"{k}={self.format_value(v)}" for k, v in value.items() if k not in HIDDEN_FIELDS)
+        elif isinstance(value, (list, tuple)):
+            if value and all(isinstance(v, dict) for v in value):
+                text = f"{len(value)} items"
+            else:
+                text = ";".join(self.format_value(v) for v in value)
+        else:
+            text = str(value)
+        text = WHITESPACE_RE.sub(" ", text).replace(self.delimiter.strip(), "/").strip()
+        if len(text) > self.max_cell_chars:
+            text = text[: self.max_cell_chars - 1] + "…"
+        return text
@@ -15,6 +15,44 @@ DB_NAME = os.getenv('DB_NAME')
 # Fetch collection names from env
 COLLECTION_NAMES = os.getenv('COLLECTION_NAMES').split(',')
 
+# Persistent server mode (python bot.py --serve)
+CHATBOT_HOST = os.getenv('CHATBOT_HOST', '127.0.0.1')
+CHATBOT_PORT = int(os.getenv('CHATBOT_PORT', '5005'))
+CHATBOT_WORKERS = int(os.getenv('CHATBOT_WORKERS', '8'))
+
+# Knowledge snapshot refresh (see knowledge_cache.py)
+KNOWLEDGE_TTL_SECONDS = int(os.getenv('KNOWLEDGE_TTL_SECONDS', '300'))
+KNOWLEDGE_POLL_SECONDS = int(os.getenv('KNOWLEDGE_POLL_SECONDS', '5'))
+KNOWLEDGE_WATCH = os.getenv('KNOWLEDGE_WATCH', 'true').lower() == 'true'
+KNOWLEDGE_FORMAT = os.getenv('KNOWLEDGE_FORMAT', 'table')  # 'table' (compact) or 'repr' (str(doc))
+
+# Retrieval-based prompt context (see retrieval.py)
+RETRIEVAL_ENABLED = os.getenv('RETRIEVAL_ENABLED', 'true').lower() == 'true'
+RETRIEVAL_TOP_K = int(os.getenv('RETRIEVAL_TOP_K', '8'))
+RETRIEVAL_CHUNK_CHARS = int(os.getenv('RETRIEVAL_CHUNK_CHARS', '800'))
+RETRIEVAL_EMBEDDER = os.getenv('RETRIEVAL_EMBEDDER', 'hashing')  # 'hashing' (local) or 'gemini'
+
+# Structured query routing for count/filter/aggregate questions (see query_router.py)
+QUERY_ROUTING_ENABLED = os.getenv('QUERY_ROUTING_ENABLED', 'true').lower() == 'true'
+# Off by default: the router should not add indexes to the production database unasked.
+QUERY_ROUTING_CREATE_INDEXES = os.getenv('QUERY_ROUTING_CREATE_INDEXES', 'false').lower() == 'true'
+QUERY_ROUTING_SCHEMA_TTL = int(os.getenv('QUERY_ROUTING_SCHEMA_TTL', '600'))
+
+# Response cache for repeated questions (see response_cache.py)
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '3600'))
+RESPONSE_CACHE_SEMANTIC = os.getenv('RESPONSE_CACHE_SEMANTIC', 'false').lower() == 'true'  # paraphrase hits; exact-match tier only by default
+RESPONSE_CACHE_THRESHOLD = float(os.getenv('RESPONSE_CACHE_THRESHOLD', '0.6'))
+
+# Conversation memory (see conversation_memory.py)
+CHAT_MEMORY_TURNS = int(os.getenv('CHAT_MEMORY_TURNS', '6'))                # turns kept verbatim
+CHAT_MEMORY_SUMMARY_CHUNK = int(os.getenv('CHAT_MEMORY_SUMMARY_CHUNK', '4'))  # turns folded per summary call
+CHAT_MEMORY_TOKEN_BUDGET = int(os.getenv('CHAT_MEMORY_TOKEN_BUDGET', '1200'))  # max history tokens per prompt
+CHAT_MEMORY_MAX_SESSIONS = int(os.getenv('CHAT_MEMORY_MAX_SESSIONS', '1000'))
+CHAT_MEMORY_COLLECTION = os.getenv('CHAT_MEMORY_COLLECTION', '')            # e.g. 'chatbot_sessions' to persist
+CHAT_MEMORY_SUMMARIZER = os.getenv('CHAT_MEMORY_SUMMARIZER', 'llm')         # 'llm' or 'extractive'
+
 # Optional Gemini settings (you can tune later)
 text_generation_config = {
     "temperature": 0.7,
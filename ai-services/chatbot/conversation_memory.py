@@ -0,0 +1,202 @@
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from pymongo.errors import PyMongoError
+
+from retrieval import estimate_tokens
+
+# ---------------------------------------------
+# Conversation Memory with Bounded Summarization
+# ---------------------------------------------
+# Each session keeps its last `keep_turns` exchanges verbatim; once
+# `summary_chunk` more have piled up, the older turns are folded into a
+# running summary by one `summarize(summary, turns)` call on a background
+# thread, so replies are never delayed by it and an LLM summarizer costs one
+# call per `summary_chunk` messages rather than one per message. The history text
+# handed to prompts never exceeds `token_budget` (estimated tokens): the
+# summary gets at most half of it and the oldest verbatim turns are dropped
+# first if a compaction is still pending. Sessions live in an in-memory LRU
+# and are optionally persisted to a Mongo collection so they survive
+# restarts and are shared by several chatbot processes.
+
+
+class Conversation:
+    def __init__(self, session_id: str, summary: str = "", turns=None, updated_at: float = 0.0):
+        self.session_id = session_id
+        self.summary = summary
+        self.turns = list(turns or [])   # [(user, bot), ...] oldest first
+        self.updated_at = updated_at or time.time()
+        self.lock = threading.Lock()
+
+    def to_document(self) -> dict:
+        return {"_id": self.session_id, "summary": self.summary,
+                "turns": [{"user": u, "bot": b} for u, b in self.turns], "updatedAt": self.updated_at}
+
+    @classmethod
+    def from_document(cls, doc: dict):
+        turns = [(t.get("user", ""), t.get("bot", "")) for t in doc.get("turns", [])]
+        return cls(doc["_id"], doc.get("summary", ""), turns, doc.get("updatedAt", 0.0))
+
+
+# Pronouns and follow-up markers that make a message depend on earlier turns.
+CONTEXT_RE = re.compile(
+    r"\b(it|its|they|them|their|theirs|he|she|him|her|his|hers|those|these|that one|this one|"
+    r"same|also|too|else|again|another|previous|above|earlier|instead|more|"
+    r"what about|how about|and what|and how)\b"
+)
+
+
+def is_context_dependent(message: str) -> bool:
+    """True if the message refers back to the conversation ("what about their salaries?")."""
+    text = message.lower().strip()
+    return bool(CONTEXT_RE.search(text)) or text.startswith(("and ", "but ", "so ", "then "))
+
+
+def format_turns(turns) -> str:
+    return "\n".join(f"User: {user}\nChatbot: {bot}" for user, bot in turns)
+
+
+def extractive_summary(summary: str, turns, max_chars: int = 1200) -> str:
+    """LLM-free fallback: keep the user's questions, newest last, within max_chars."""
+    lines = [line for line in summary.split("\n") if line] if summary else []
+    lines += [f"- User asked: {user[:160]}" for user, _ in turns]
+    while lines and len("\n".join(lines)) > max_chars:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4
+    return text if len(text) <= max_chars else "…" + text[-(max_chars - 1):]
+
+
+class ConversationStore:
+    def __init__(self, keep_turns=6, token_budget=1200, max_sessions=1000,
+                 summarize=None, collection=None, summary_chunk=4):
+        self.keep_turns = keep_turns
+        self.summary_chunk = max(1, summary_chunk)
+        self.token_budget = token_budget
+        self.max_sessions = max_sessions
+        self.summarize = summarize or extractive_summary
+        self.collection = collection
+        self._lock = threading.Lock()
+        self._sessions = OrderedDict()
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-memory")
+
+    # ---------------------------------------------
+    # Session Lookup (LRU + optional Mongo)
+    # ---------------------------------------------
+    def get(self, session_id: str) -> Conversation:
+        with self._lock:
+            conversation = self._sessions.get(session_id)
+            if conversation is not None:
+                self._sessions.move_to_end(session_id)
+                return conversation
+
+        conversation = None
+        if self.collection is not None:
+            try:
+                doc = self.collection.find_one({"_id": session_id})
+                if doc:
+                    conversation = Conversation.from_document(doc)
+            except PyMongoError as e:
+                print(f"Could not load conversation {session_id}: {e}", file=sys.stderr)
+        if conversation is None:
+            conversation = Conversation(session_id)
+
+        with self._lock:
+            # Another thread may have loaded it meanwhile; keep the first one.
+            conversation = self._sessions.setdefault(session_id, conversation)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        return conversation
+
+    def _persist(self, conversation: Conversation):
+        if self.collection is None:
+            return
+        try:
+            self.collection.replace_one({"_id": conversation.session_id}, conversation.to_document(), upsert=True)
+        except PyMongoError as e:
+            print(f"Could not save conversation {conversation.session_id}: {e}", file=sys.stderr)
+
+    # ---------------------------------------------
+    # Prompt Context
+    # ---------------------------------------------
+    def context(self, session_id: str) -> str:
+        """History text for the prompt, at most `token_budget` estimated tokens."""
+        conversation = self.get(session_id)
+        with conversation.lock:
+            summary, turns = conversation.summary, list(conversation.turns)
+        if not summary and not turns:
+            return ""
+
+        parts = []
+        if summary:
+            summary = truncate_to_tokens(summary, self.token_budget // 2)
+            parts.append(f"Summary of the earlier conversation:\n{summary}")
+        remaining = self.token_budget - estimate_tokens("\n\n".join(parts)) - 10
+        recent = []
+        for turn in reversed(turns):
+            cost = estimate_tokens(format_turns([turn]))
+            if cost > remaining:
+                break
+            recent.insert(0, turn)
+            remaining -= cost
+        if recent:
+            parts.append("Recent messages:\n" + format_turns(recent))
+        elif turns:
+            # Even the latest exchange alone is over budget: keep its tail.
+            parts.append("Recent messages:\n" + truncate_to_tokens(format_turns(turns[-1:]), max(remaining, 1)))
+        return "\n\n".join(parts)
+
+    def recent_user_messages(self, session_id: str, n: int = 2):
+        conversation = self.get(session_id)
+        with conversation.lock:
+            return [user for user, _ in conversation.turns[-n:]]
+
+    # ---------------------------------------------
+    # Recording Turns
+    # ---------------------------------------------
+    def append(self, session_id: str, user_message: str, reply: str):
+        conversation = self.get(session_id)
+        with conversation.lock:
+            conversation.turns.append((user_message, reply))
+            conversation.updated_at = time.time()
+            needs_compaction = len(conversation.turns) >= self.keep_turns + self.summary_chunk
+        if needs_compaction:
+            self._compactor.submit(self._compact, conversation)
+        else:
+            self._persist(conversation)
+
+    def _compact(self, conversation: Conversation):
+        with conversation.lock:
+            overflow = len(conversation.turns) - self.keep_turns
+            if overflow < self.summary_chunk:
+                return   # already folded by a compaction queued earlier
+            rolled = conversation.turns[:overflow]
+            summary = conversation.summary
+        try:
+            new_summary = self.summarize(summary, rolled)
+        except Exception as e:
+            print(f"Conversation summary failed, using extractive fallback: {e}", file=sys.stderr)
+            new_summary = extractive_summary(summary, rolled)
+        new_summary = truncate_to_tokens(new_summary.strip(), self.token_budget // 2)
+        with conversation.lock:
+            # Turns appended meanwhile stay verbatim; only the rolled prefix is replaced.
+            conversation.turns = conversation.turns[len(rolled):]
+            conversation.summary = new_summary
+        self._persist(conversation)
+
+    def clear(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        if self.collection is not None:
+            try:
+                self.collection.delete_one({"_id": session_id})
+            except PyMongoError as e:
+                print(f"Could not delete conversation {session_id}: {e}", file=sys.stderr)
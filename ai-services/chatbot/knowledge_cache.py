@@ -0,0 +1,181 @@
+import sys
+import threading
+import time
+
+from pymongo.errors import PyMongoError
+
+from compact_render import TableRenderer
+
+# ---------------------------------------------
+# Cached Knowledge Snapshot for Chatbot Prompts
+# ---------------------------------------------
+# Each collection is loaded once and its rendered text block is kept in
+# memory. Afterwards it is kept fresh by, in order of preference:
+#   1. a change stream (replica sets / Atlas), applied as events arrive;
+#   2. an `updatedAt` watermark poll that fetches only newer documents;
+#   3. a full reload once the TTL expires (catches deletes and collections
+#      without timestamps when change streams are unavailable).
+# Building a prompt therefore never scans a whole collection. Rows are
+# rendered once per document change by the configured renderer (see
+# compact_render.py) and kept in _id order so blocks are deterministic.
+
+
+class CollectionSnapshot:
+    def __init__(self, name: str):
+        self.name = name
+        self.docs = {}
+        self.lines = {}
+        self.watermark = None
+        self.loaded_at = 0.0
+        self.polled_at = 0.0
+        self.block = None
+        self.watching = False
+        self.columns = None
+
+    def apply(self, doc: dict, renderer):
+        self.docs[doc["_id"]] = doc
+        if renderer.update_columns(self, doc):
+            # A new column appeared: earlier rows need an (empty) cell for it.
+            self.lines = {doc_id: renderer.row(self, d) for doc_id, d in self.docs.items()}
+        else:
+            self.lines[doc["_id"]] = renderer.row(self, doc)
+        self.block = None
+
+    def remove(self, doc_id):
+        if self.docs.pop(doc_id, None) is not None:
+            self.lines.pop(doc_id, None)
+            self.block = None
+
+    def render_block(self, renderer) -> str:
+        if self.block is None:
+            if self.lines:
+                header = renderer.header(self)
+                rows = [line for _, line in sorted(self.lines.items(), key=lambda item: str(item[0]))]
+                self.block = f"--- Collection: {self.name} ---\n" + "\n".join(([header] if header else []) + rows)
+            else:
+                self.block = f"--- Collection: {self.name} ---\nNo data found"
+        return self.block
+
+
+class KnowledgeCache:
+    def __init__(self, db, collection_names, ttl_seconds=300, poll_seconds=5,
+                 watermark_field="updatedAt", renderer=None):
+        self.db = db
+        self.collection_names = list(collection_names)
+        self.ttl_seconds = ttl_seconds
+        self.poll_seconds = poll_seconds
+        self.watermark_field = watermark_field
+        self.renderer = renderer or TableRenderer()
+        self.version = 0
+        self._lock = threading.RLock()
+        self._snapshots = {name: CollectionSnapshot(name) for name in self.collection_names}
+
+    # ---------------------------------------------
+    # Loading and Incremental Refresh
+    # ---------------------------------------------
+    def _full_load(self, snap: CollectionSnapshot):
+        docs = list(self.db[snap.name].find({}))
+        previous = snap.lines
+        snap.docs, snap.lines = {}, {}
+        snap.columns = None
+        snap.block = None
+        snap.watermark = None
+        for doc in docs:
+            snap.apply(doc, self.renderer)
+            snap.watermark = self._max_watermark(snap.watermark, doc)
+        snap.loaded_at = snap.polled_at = time.time()
+        # Only a real change bumps the version (it keys downstream caches).
+        if snap.lines != previous:
+            self.version += 1
+
+    def _max_watermark(self, current, doc):
+        value = doc.get(self.watermark_field)
+        if value is None:
+            return current
+        return value if current is None or value > current else current
+
+    def _poll(self, snap: CollectionSnapshot):
+        snap.polled_at = time.time()
+        if snap.watermark is None:
+            return
+        changed = list(self.db[snap.name].find({self.watermark_field: {"$gt": snap.watermark}}))
+        for doc in changed:
+            snap.apply(doc, self.renderer)
+            snap.watermark = self._max_watermark(snap.watermark, doc)
+        if changed:
+            self.version += 1
+
+    def _refresh(self, snap: CollectionSnapshot):
+        now = time.time()
+        if snap.watching and snap.loaded_at:
+            return
+        if not snap.loaded_at or now - snap.loaded_at > self.ttl_seconds:
+            self._full_load(snap)
+        elif now - snap.polled_at > self.poll_seconds:
+            self._poll(snap)
+
+    # ---------------------------------------------
+    # Change Streams
+    # ---------------------------------------------
+    def watch(self):
+        """Start one change-stream thread per collection (no-op where unsupported)."""
+        for name in self.collection_names:
+            threading.Thread(target=self._watch_collection, args=(name,),
+                             name=f"knowledge-watch-{name}", daemon=True).start()
+
+    def _watch_collection(self, name: str):
+        snap = self._snapshots[name]
+        while True:
+            try:
+                with self.db[name].watch(full_document="updateLookup") as stream:
+                    with self._lock:
+                        # Reload so nothing written before the stream opened is missed.
+                        self._full_load(snap)
+                        snap.watching = True
+                    for change in stream:
+                        self._apply_change(snap, change)
+            except PyMongoError as e:
+                with self._lock:
+                    snap.watching = False
+                if getattr(e, "code", None) == 40573:  # change streams need a replica set
+                    print(f"Change streams unavailable for {name}; using watermark polling", file=sys.stderr)
+                    return
+                print(f"Change stream for {name} dropped ({e}); retrying", file=sys.stderr)
+                time.sleep(5)
+
+    def _apply_change(self, snap: CollectionSnapshot, change: dict):
+        with self._lock:
+            op = change.get("operationType")
+            if op in ("insert", "update", "replace") and change.get("fullDocument"):
+                snap.apply(change["fullDocument"], self.renderer)
+            elif op == "delete":
+                snap.remove(change["documentKey"]["_id"])
+            elif op in ("drop", "rename", "invalidate"):
+                self._full_load(snap)
+                return
+            else:
+                return
+            self.version += 1
+
+    # ---------------------------------------------
+    # Public API
+    # ---------------------------------------------
+    def snapshot(self, collection_names=None):
+        """Return {collection: rendered block} for the requested collections."""
+        with self._lock:
+            blocks = {}
+            for name in collection_names or self.collection_names:
+                snap = self._snapshots[name]
+                self._refresh(snap)
+                blocks[name] = snap.render_block(self.renderer)
+            return blocks
+
+    def get_text(self) -> str:
+        return "\n".join(self.snapshot().values())
+
+    def documents(self, name: str):
+        """Current (refreshed) documents of one collection."""
+        with self._lock:
+            snap = self._snapshots[name]
+            self._refresh(snap)
+            return list(snap.docs.values())
@@ -0,0 +1,9 @@
+"""Shared LLM client; the implementation lives in ai-services/common/llm_client.py."""
+import os
+import sys
+
+_AI_SERVICES = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _AI_SERVICES not in sys.path:
+    sys.path.append(_AI_SERVICES)
+
+from common.llm_client import *  # noqa: E402,F401,F403
@@ -0,0 +1,327 @@
+import re
+import sys
+import threading
+import time
+
+from pymongo.errors import PyMongoError
+
+# ---------------------------------------------
+# Structured Query Routing for Aggregate Questions
+# ---------------------------------------------
+# Count / filter / aggregate questions ("how many employees are in
+# Engineering", "average netPay by status") are answered with a Mongo
+# aggregation pipeline instead of asking the LLM to read every document.
+# The LLM only phrases the exact result, so cost and accuracy no longer
+# depend on collection size. Anything the router does not recognise
+# returns None and goes through the normal retrieval prompt. That includes
+# questions with a qualifier it cannot turn into part of the pipeline (a
+# group-by field, a filter value, a numeric field, a month...): answering
+# them without it would present a wrong number as exact.
+#
+# Field names, numeric fields and categorical values are learned from a
+# small $sample of each collection (refreshed every `schema_ttl` seconds),
+# so no schema has to be configured here.
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+INTENT_PATTERNS = [
+    ("count", re.compile(r"\b(how many|number of|count|total number)\b")),
+    ("avg", re.compile(r"\b(average|avg|mean)\b")),
+    ("sum", re.compile(r"\b(total|sum)\b")),
+    ("max", re.compile(r"\b(highest|maximum|max|largest|most)\b")),
+    ("min", re.compile(r"\b(lowest|minimum|min|smallest|least)\b")),
+    ("list", re.compile(r"\b(list|show|which|who)\b")),
+]
+GROUP_RE = re.compile(r"\b(?:by|per|for each|each)\s+([a-z ]+)")
+# "who has the highest salary" asks for a record, not the aggregate value.
+RECORD_RE = re.compile(r"\b(who|whose|which|name|named)\b")
+
+# Words that carry no qualifier; every other word in a routed question must
+# be explained by the collection, a field or a filter value.
+STOPWORDS = set("""
+    a an the is are was were be been being do does did we our us you your i my me
+    there here what whats how many much of in on at for to with by per each from
+    and or currently right now please tell give show me list which who whose have
+    has had all any every number count total sum average avg mean highest maximum
+    max largest most lowest minimum min smallest least value amount it its them
+    they their this that these those can could would get find
+""".split())
+
+# Common HR phrasings -> collection names (used only if the collection exists).
+COLLECTION_ALIASES = {
+    "employee": "users", "staff": "users", "user": "users", "candidate": "users",
+    "job": "jobs", "opening": "jobs", "position": "jobs",
+    "application": "jobapplications", "applicant": "jobapplications",
+    "leave": "leaverequests", "payroll": "payrolls", "salary": "payrolls", "payslip": "payrolls",
+    "attendance": "attendances", "project": "projects", "feedback": "feedbacks",
+    "interview": "interviews", "department": "departments",
+}
+
+# Nouns naming one kind of account in a shared collection ("users" holds
+# employees, HR, admins and candidates). They route only together with a
+# filter on the field that stores that role; otherwise the question falls
+# back to retrieval rather than counting every account.
+ROLE_NOUNS = {"employee", "staff", "candidate"}
+
+# Numeric fields aggregated by default when the question names none.
+NUMERIC_ALIASES = {"salary": ["netPay", "baseSalary", "salary"], "pay": ["netPay", "baseSalary"]}
+
+MAX_CATEGORY_VALUES = 50
+LIST_LIMIT = 25
+
+
+def singular(word: str) -> str:
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def field_words(field: str):
+    """`baseSalary` -> ['base', 'salary', 'basesalary'] so fields can be matched against questions."""
+    words = [w.lower() for w in re.findall(r"[A-Za-z][a-z0-9]*|[0-9]+", field)]
+    return words + [field.lower()] if len(words) > 1 else words
+
+
+class CollectionSchema:
+    def __init__(self, name: str):
+        self.name = name
+        self.numeric = []
+        self.categorical = {}   # field -> {lowercased value: stored value}
+        self.fields = []
+        self.loaded_at = 0.0
+
+
+class QueryRouter:
+    def __init__(self, db, collection_names, schema_ttl=600, sample_size=500, create_indexes=False):
+        self.db = db
+        self.collection_names = list(collection_names)
+        self.schema_ttl = schema_ttl
+        self.sample_size = sample_size
+        self.create_indexes = create_indexes
+        self._lock = threading.Lock()
+        self._schemas = {}
+        self._indexed = set()
+
+    # ---------------------------------------------
+    # Schema Discovery
+    # ---------------------------------------------
+    def _schema(self, name: str) -> CollectionSchema:
+        with self._lock:
+            schema = self._schemas.get(name)
+            if schema and time.time() - schema.loaded_at < self.schema_ttl:
+                return schema
+
+        schema = CollectionSchema(name)
+        docs = list(self.db[name].aggregate([{"$sample": {"size": self.sample_size}}]))
+        values = {}
+        for doc in docs:
+            for field, value in doc.items():
+                if field.startswith("_") or field in ("password", "googleId"):
+                    continue
+                if isinstance(value, bool):
+                    continue
+                if isinstance(value, (int, float)):
+                    if field not in schema.numeric:
+                        schema.numeric.append(field)
+                elif isinstance(value, str) and len(value) <= 60:
+                    values.setdefault(field, set()).add(value)
+                if field not in schema.fields:
+                    schema.fields.append(field)
+        for field, seen in values.items():
+            # Low-cardinality strings (status, role, department...) are filterable;
+            # tiny collections are too small to tell, so all their strings are.
+            if len(seen) <= MAX_CATEGORY_VALUES and (len(docs) < 20 or len(seen) < len(docs)):
+                schema.categorical[field] = {v.lower(): v for v in seen}
+        schema.loaded_at = time.time()
+
+        with self._lock:
+            self._schemas[name] = schema
+        return schema
+
+    def _ensure_index(self, name: str, fields):
+        if not self.create_indexes:
+            return
+        for field in fields:
+            if (name, field) in self._indexed:
+                continue
+            self._indexed.add((name, field))
+            try:
+                self.db[name].create_index(field)
+            except PyMongoError as e:
+                print(f"Could not index {name}.{field}: {e}", file=sys.stderr)
+
+    # ---------------------------------------------
+    # Question Parsing
+    # ---------------------------------------------
+    def _find_collection(self, words):
+        available = {name.lower(): name for name in self.collection_names}
+        for word in words:
+            base = singular(word)
+            for candidate in (word, base, base + "s", COLLECTION_ALIASES.get(base)):
+                if candidate and candidate in available:
+                    return available[candidate]
+        return None
+
+    def _find_field(self, phrase_words, fields):
+        best, best_hits = None, 0
+        for field in fields:
+            parts = field_words(field)
+            hits = sum(1 for w in phrase_words if w in parts or singular(w) in parts)
+            if hits > best_hits:
+                best, best_hits = field, hits
+        return best
+
+    def _find_numeric(self, words, schema: CollectionSchema):
+        field = self._find_field(words, schema.numeric)
+        if field:
+            return field
+        for word in words:
+            for alias in NUMERIC_ALIASES.get(singular(word), []):
+                if alias in schema.numeric:
+                    return alias
+        return None
+
+    def _find_filters(self, text: str, schema: CollectionSchema, skip=()):
+        filters = {}
+        for field, values in schema.categorical.items():
+            if field in skip:
+                continue
+            for lowered, stored in values.items():
+                if re.search(rf"\b{re.escape(lowered)}\b", text):
+                    filters[field] = stored
+                    break
+        return filters
+
+    def _role_filters(self, words, collection, schema: CollectionSchema):
+        """{field: role} for each role noun in the question, or None if one has no stored role value."""
+        roles = {}
+        for word in words:
+            noun = singular(word)
+            if noun not in ROLE_NOUNS or COLLECTION_ALIASES.get(noun) != collection:
+                continue
+            field = next((f for f, values in schema.categorical.items() if noun in values), None)
+            if field is None or roles.get(field, schema.categorical[field][noun]) != schema.categorical[field][noun]:
+                return None
+            roles[field] = schema.categorical[field][noun]
+        return roles
+
+    def _unexplained(self, words, collection, plan):
+        """Words of the question that no part of the plan accounts for."""
+        covered = set()
+        for name in [plan["field"], plan["group_by"], *plan["filters"]]:
+            if name:
+                covered.update(field_words(name))
+        for value in plan["filters"].values():
+            covered.update(WORD_RE.findall(str(value).lower()))
+        if plan["field"]:
+            covered.update(alias for alias, fields in NUMERIC_ALIASES.items() if plan["field"] in fields)
+        leftover = []
+        for word in words:
+            if word in STOPWORDS or word in covered or singular(word) in covered:
+                continue
+            if self._find_collection([word]) == collection:
+                continue
+            leftover.append(word)
+        return leftover
+
+    def parse(self, message: str):
+        """Return a query plan dict, or None if this is not a structured question
+        or part of it cannot be expressed in the pipeline."""
+        text = message.lower()
+        intent = next((name for name, pattern in INTENT_PATTERNS if pattern.search(text)), None)
+        if intent is None:
+            return None
+        if intent in ("max", "min") and RECORD_RE.search(text):
+            return None
+        words = WORD_RE.findall(text)
+        collection = self._find_collection(words)
+        if collection is None:
+            return None
+
+        schema = self._schema(collection)
+        group_by = None
+        group_match = GROUP_RE.search(text)
+        if group_match:
+            group_by = self._find_field(WORD_RE.findall(group_match.group(1)), schema.categorical)
+            if group_by is None:
+                return None
+
+        field = None
+        if intent in ("avg", "sum", "max", "min"):
+            field = self._find_numeric(words, schema)
+            if field is None:
+                return None
+        filters = self._find_filters(text, schema, skip={group_by} if group_by else ())
+        roles = self._role_filters(words, collection, schema)
+        if roles is None or any(filters.get(f, v) != v for f, v in roles.items()):
+            return None
+        filters.update(roles)
+        if intent == "list" and not filters:
+            return None   # open-ended "show me..." questions are better served by retrieval
+
+        plan = {"collection": collection, "intent": intent, "field": field,
+                "filters": filters, "group_by": group_by}
+        if self._unexplained(words, collection, plan):
+            return None
+        return plan
+
+    # ---------------------------------------------
+    # Pipeline Execution
+    # ---------------------------------------------
+    def build_pipeline(self, plan: dict):
+        pipeline = []
+        if plan["filters"]:
+            pipeline.append({"$match": plan["filters"]})
+        if plan["intent"] == "list":
+            projection = {"_id": 0, "password": 0}
+            pipeline += [{"$project": projection}, {"$limit": LIST_LIMIT}]
+            return pipeline
+
+        accumulator = {"$sum": 1} if plan["intent"] == "count" else {f"${plan['intent']}": f"${plan['field']}"}
+        group_key = f"${plan['group_by']}" if plan["group_by"] else None
+        pipeline.append({"$group": {"_id": group_key, "value": accumulator}})
+        if plan["group_by"]:
+            pipeline.append({"$sort": {"value": -1}})
+        return pipeline
+
+    def run(self, plan: dict):
+        self._ensure_index(plan["collection"], list(plan["filters"]) + ([plan["group_by"]] if plan["group_by"] else []))
+        pipeline = self.build_pipeline(plan)
+        rows = list(self.db[plan["collection"]].aggregate(pipeline))
+        if plan["intent"] == "list":
+            result = rows
+        elif plan["group_by"]:
+            result = {str(row["_id"]): row["value"] for row in rows}
+        else:
+            result = rows[0]["value"] if rows else 0
+        return pipeline, result
+
+    def route(self, message: str):
+        """Answer a structured question exactly. Returns (plan, pipeline, result) or None."""
+        try:
+            plan = self.parse(message)
+            if plan is None:
+                return None
+            pipeline, result = self.run(plan)
+        except PyMongoError as e:
+            print(f"Query routing failed, falling back to retrieval: {e}", file=sys.stderr)
+            return None
+        return plan, pipeline, result
+
+
+def describe_result(plan: dict, result) -> str:
+    """Plain-text rendering of a routed result (also the fallback reply)."""
+    what = {"count": "Count", "avg": "Average", "sum": "Total",
+            "max": "Maximum", "min": "Minimum", "list": "Matching records"}[plan["intent"]]
+    subject = plan["collection"] + (f" {plan['field']}" if plan["field"] else "")
+    where = ", ".join(f"{k} = {v}" for k, v in plan["filters"].items())
+    header = f"{what} of {subject}" + (f" where {where}" if where else "")
+    if plan["intent"] == "list":
+        return header + ":\n" + "\n".join(str(row) for row in result) if result else header + ": none"
+    if plan["group_by"]:
+        lines = [f"- {key}: {round(value, 2) if isinstance(value, float) else value}" for key, value in result.items()]
+        return f"{header} by {plan['group_by']}:\n" + "\n".join(lines)
+    value = round(result, 2) if isinstance(result, float) else result
+    return f"{header}: {value}"
@@ -0,0 +1,208 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+# ---------------------------------------------
+# Response Cache for Repeated Chatbot Questions
+# ---------------------------------------------
+# Replies are keyed on the normalized message plus the knowledge snapshot
+# version, so any change to the underlying collections invalidates every
+# cached answer (stale entries are dropped as soon as the version moves).
+# An optional semantic tier (off by default) embeds each cached question and
+# serves a rewording ("how many open jobs?" / "what's the number of open
+# positions") when cosine similarity clears `threshold` and both messages
+# have the same key terms once stop words, plurals and the synonyms in
+# SYNONYMS are folded. On top of that, numbers, capitalized names, the word
+# a scoping preposition points at ("in sales", "named priya") and
+# negations/comparatives must appear on both sides. So "closed jobs" never
+# serves "open jobs" and "data scientist" never serves "data engineer".
+# Entries expire after `ttl_seconds` and the least recently used entry is
+# evicted beyond `max_entries`.
+
+NORMALIZE_RE = re.compile(r"[^a-z0-9 ]+")
+STOP_WORDS = frozenset(
+    "a an the is are was were be of in on at for to from by with and or me my our we us you "
+    "there this that these those please can could would will do does did what how now currently "
+    "s have has had i it its".split()
+)
+# Words folded to one canonical term before key terms are compared.
+SYNONYMS = {
+    "many": "count", "number": "count", "total": "count",
+    "position": "job", "opening": "job", "vacancy": "job", "vacancies": "job",
+    "staff": "employee", "worker": "employee",
+    "show": "list", "display": "list", "give": "list", "tell": "list",
+    "salaries": "salary", "pay": "salary",
+}
+
+SCOPE_WORDS = frozenset("in for from at of on by with about under named called".split())
+CONTRAST_WORDS = frozenset(
+    "not no without except more less above below over highest lowest max min maximum minimum "
+    "most least top bottom before after".split()
+)
+SEMANTIC_CANDIDATES = 4
+
+
+def normalize_message(message: str) -> str:
+    return " ".join(NORMALIZE_RE.sub(" ", message.lower()).split())
+
+
+def canonical_term(word: str) -> str:
+    word = SYNONYMS.get(word, word)
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return SYNONYMS.get(word, word)
+
+
+def key_terms(normalized: str) -> frozenset:
+    return frozenset(canonical_term(w) for w in normalized.split() if w not in STOP_WORDS)
+
+
+def entity_terms(message: str) -> frozenset:
+    """Words that pin down what a message is about, so similar questions about different things never share a reply."""
+    tokens = normalize_message(message).split()
+    entities = {t for t in tokens if any(c.isdigit() for c in t) or t in CONTRAST_WORDS}
+    scoped = False
+    for i, token in enumerate(tokens):
+        if token in SCOPE_WORDS:
+            scoped = True
+        elif scoped and token not in STOP_WORDS:
+            entities.add(token)
+            scoped = False
+        if i + 1 < len(tokens) and tokens[i + 1] == "s":   # possessive: "john's salary"
+            entities.add(token)
+    for word in message.split()[1:]:
+        word = word.strip(".,;:!?\"'()")
+        if len(word) > 1 and word[0].isupper():
+            entities.update(normalize_message(word).split())
+    return frozenset(entities - STOP_WORDS - {"s"})
+
+
+def same_subject(entities_a: frozenset, terms_a: frozenset, entities_b: frozenset, terms_b: frozenset) -> bool:
+    if terms_a != terms_b:
+        return False
+    entities_a = frozenset(canonical_term(t) for t in entities_a)
+    entities_b = frozenset(canonical_term(t) for t in entities_b)
+    return entities_a <= terms_b and entities_b <= terms_a
+
+
+class ResponseCache:
+    def __init__(self, max_entries=1024, ttl_seconds=3600, embedder=None, threshold=0.6):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embedder = embedder
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # normalized message -> entry dict
+        self._version = None
+        self._matrix = None             # one embedding row per slot (semantic tier)
+        self._slot_keys = [None] * max_entries
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self.hits_exact = 0
+        self.hits_semantic = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # ---------------------------------------------
+    # Internal Bookkeeping (call with the lock held)
+    # ---------------------------------------------
+    def _check_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._slot_keys = [None] * self.max_entries
+            self._free_slots = list(range(self.max_entries - 1, -1, -1))
+            if self._matrix is not None:
+                self._matrix[:] = 0
+            self._version = version
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry["slot"] is not None:
+            self._slot_keys[entry["slot"]] = None
+            self._matrix[entry["slot"]] = 0
+            self._free_slots.append(entry["slot"])
+
+    def _expired(self, entry) -> bool:
+        return time.time() - entry["stored_at"] > self.ttl_seconds
+
+    # ---------------------------------------------
+    # Public API
+    # ---------------------------------------------
+    def get(self, message: str, version):
+        """Return (reply, tier) where tier is 'exact' / 'semantic', or (None, 'miss')."""
+        key = normalize_message(message)
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                self._drop(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits_exact += 1
+                return entry["reply"], "exact"
+            if self.embedder is None or self._matrix is None or not self._entries:
+                self.misses += 1
+                return None, "miss"
+
+        vector = self.embedder.embed([key])[0]
+        entities, terms = entity_terms(message), key_terms(key)
+        with self._lock:
+            if version != self._version or self._matrix is None:
+                self.misses += 1
+                return None, "miss"
+            scores = self._matrix @ vector
+            candidates = np.argpartition(-scores, min(SEMANTIC_CANDIDATES, len(scores)) - 1)[:SEMANTIC_CANDIDATES]
+            for slot in candidates[np.argsort(-scores[candidates])]:
+                if scores[slot] < self.threshold:
+                    break
+                match = self._slot_keys[slot]
+                entry = self._entries.get(match) if match is not None else None
+                if (entry is None or self._expired(entry)
+                        or not same_subject(entities, terms, entry["entities"], entry["terms"])):
+                    continue
+                self._entries.move_to_end(match)
+                self.hits_semantic += 1
+                return entry["reply"], "semantic"
+            self.misses += 1
+            return None, "miss"
+
+    def put(self, message: str, version, reply: str):
+        key = normalize_message(message)
+        vector = self.embedder.embed([key])[0] if self.embedder is not None else None
+        with self._lock:
+            self._check_version(version)
+            self._drop(key)
+            while len(self._entries) >= self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+            slot = None
+            if vector is not None:
+                if self._matrix is None:
+                    self._matrix = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+                slot = self._free_slots.pop()
+                self._matrix[slot] = vector
+                self._slot_keys[slot] = key
+            self._entries[key] = {"reply": reply, "stored_at": time.time(), "slot": slot,
+                                  "entities": entity_terms(message), "terms": key_terms(key)}
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits_exact + self.hits_semantic + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits_exact": self.hits_exact,
+                "hits_semantic": self.hits_semantic,
+                "misses": self.misses,
+                "hit_rate": round((self.hits_exact + self.hits_semantic) / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "version": self._version,
+            }
@@ -0,0 +1,140 @@
+import hashlib
+import math
+import re
+import threading
+
+import numpy as np
+
+# ---------------------------------------------
+# Local Retrieval Over the Knowledge Snapshot
+# ---------------------------------------------
+# Collection documents are grouped into small chunks, embedded, and kept in
+# an in-process matrix. Only the top-k chunks most similar to the user's
+# message go into the prompt, so prompt size no longer grows with headcount.
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English/JSON-ish text; avoids a network
+    # round trip to count_tokens just for reporting.
+    return (len(text) + 3) // 4
+
+
+class HashingEmbedder:
+    """Hashed unigram+bigram TF vectors (sublinear, L2-normalized). No model needed."""
+
+    def __init__(self, dim: int = 4096):
+        self.dim = dim
+
+    def _bucket(self, feature: str) -> int:
+        return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little") % self.dim
+
+    def embed(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = TOKEN_RE.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                out[row, self._bucket(feature)] += 1.0
+        np.log1p(out, out=out)
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+class GeminiEmbedder:
+    """Gemini text embeddings via LLMClient.embed, batch_size texts per call (the API accepts at most 100)."""
+
+    def __init__(self, llm, operation: str = "chatbot.embed", batch_size: int = 100):
+        self.llm = llm
+        self.operation = operation
+        self.batch_size = batch_size
+
+    def embed(self, texts):
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, 1), dtype=np.float32)
+        rows = []
+        for start in range(0, len(texts), self.batch_size):
+            rows.extend(self.llm.embed(texts[start:start + self.batch_size], operation=self.operation))
+        vectors = np.asarray(rows, dtype=np.float32).reshape(len(texts), -1)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+def _line_hash(line: str) -> int:
+    return int.from_bytes(hashlib.blake2b(line.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class ChunkIndex:
+    def __init__(self, embedder, chunk_chars: int = 800):
+        self.embedder = embedder
+        self.chunk_chars = chunk_chars
+        self._lock = threading.Lock()
+        self._blocks = {}
+        self._chunks = {}
+        self._vectors = {}
+        self._all_chunks = []
+        self._matrix = None
+
+    def _chunk_block(self, name: str, block: str):
+        lines = block.split("\n")[1:]  # drop the "--- Collection: x ---" header
+        # Tabular blocks start with a "# col | col" header; repeat it in every chunk.
+        prefix = f"[{name}]\n"
+        if lines and lines[0].startswith("# "):
+            prefix += lines.pop(0) + "\n"
+        # A chunk ends after a line whose hash falls in a 1-in-n bucket (n is
+        # the power of two at or below chunk_chars / average line), or at
+        # chunk_chars. Boundaries follow the records rather than running
+        # offsets, so a changed or new record only changes the chunks around
+        # it and the rest keep their embeddings.
+        average = sum(len(line) + 1 for line in lines) / len(lines) if lines else 1.0
+        n = 1 << int(math.log2(max(1.0, self.chunk_chars / average)))
+        chunks, current = [], []
+        size = 0
+        for line in lines:
+            if current and size + len(line) > self.chunk_chars:
+                chunks.append(prefix + "\n".join(current))
+                current, size = [], 0
+            current.append(line)
+            size += len(line) + 1
+            if _line_hash(line) % n == 0:
+                chunks.append(prefix + "\n".join(current))
+                current, size = [], 0
+        if current:
+            chunks.append(prefix + "\n".join(current))
+        return chunks
+
+    def sync(self, blocks: dict):
+        """Re-chunk the collections whose rendered block changed; embed only chunks not seen before."""
+        with self._lock:
+            changed = False
+            for name, block in blocks.items():
+                if self._blocks.get(name) == block:
+                    continue
+                chunks = self._chunk_block(name, block)
+                known = dict(zip(self._chunks.get(name, []), self._vectors.get(name, [])))
+                fresh = list(dict.fromkeys(chunk for chunk in chunks if chunk not in known))
+                if fresh:
+                    known.update(zip(fresh, self.embedder.embed(fresh)))
+                self._chunks[name] = chunks
+                self._vectors[name] = np.vstack([known[chunk] for chunk in chunks]) if chunks else None
+                self._blocks[name] = block
+                changed = True
+            if changed:
+                names = [n for n in self._chunks if self._chunks[n]]
+                self._all_chunks = [chunk for n in names for chunk in self._chunks[n]]
+                self._matrix = np.vstack([self._vectors[n] for n in names]) if names else None
+
+    def search(self, query: str, k: int = 8):
+        with self._lock:
+            chunks, matrix = self._all_chunks, self._matrix
+        if matrix is None or not chunks:
+            return []
+        scores = matrix @ self.embedder.embed([query])[0]
+        k = min(k, len(chunks))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [chunks[i] for i in top]
@@ -0,0 +1,45 @@
+import pytest
+
+from response_cache import ResponseCache
+from retrieval import HashingEmbedder
+
+CACHED = {
+    "how many open jobs are there": "There are 12 open jobs.",
+    "write a job description for a data engineer": "Data Engineer JD ...",
+    "how many employees in Sales?": "Sales has 9 employees.",
+}
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache(embedder=HashingEmbedder())
+    for message, reply in CACHED.items():
+        cache.put(message, 1, reply)
+    return cache
+
+
+@pytest.mark.parametrize("message", [
+    "how many closed jobs are there",
+    "how many jobs are there",
+    "write a job description for a data scientist",
+    "how many employees in Engineering?",
+    "how many employees are there",
+])
+def test_different_questions_do_not_share_a_reply(cache, message):
+    assert cache.get(message, 1) == (None, "miss")
+
+
+@pytest.mark.parametrize("message, cached", [
+    ("How many open jobs are there?", "how many open jobs are there"),
+    ("how many jobs are open", "how many open jobs are there"),
+    ("how many open jobs are there currently?", "how many open jobs are there"),
+    ("how many employees are in sales", "how many employees in Sales?"),
+])
+def test_rewordings_hit(cache, message, cached):
+    reply, tier = cache.get(message, 1)
+    assert reply == CACHED[cached]
+    assert tier in ("exact", "semantic")
+
+
+def test_version_change_invalidates(cache):
+    assert cache.get("how many open jobs are there", 2) == (None, "miss")
@@ -0,0 +1 @@
+"""Code shared by the AI services (each imports it through a small shim module)."""
@@ -0,0 +1,427 @@
+"""Shared LLM client: concurrency cap, rate limit, retries, deadlines, latency histograms.
+
+Every model call in the service goes through one LLMClient so a slow or
+failing Gemini call can no longer pin a request thread indefinitely:
+
+- a global semaphore caps in-flight calls (LLM_MAX_CONCURRENCY);
+- a token bucket limits the request rate (LLM_RATE_PER_SEC / LLM_BURST, 0 = off);
+- 429 and 5xx responses (and connection errors) are retried with jittered
+  exponential backoff, never sleeping past the call's deadline;
+- each call has a total deadline (LLM_DEADLINE_SECONDS) covering queueing,
+  retries and the model call itself; the caller gets LLMTimeout when it
+  expires even if the underlying HTTP request is still hanging;
+- per-operation latency histograms, counters and estimated token usage are
+  available via stats().
+
+`generate()` / `stream()` are the sync entry points and `agenerate()` the
+async one; `embed()` returns embedding vectors under the same limits. The backend is chosen by LLM_BACKEND: "gemini" (default) or
+"stub", an in-process deterministic fake with a configurable latency
+distribution (LLM_STUB_LATENCY) for load-testing our own endpoints without
+network or quota. Setting GEMINI_API_BASE instead points the Gemini REST
+transport at another endpoint, e.g. interview_analysis/fake_gemini_server.py.
+Shared by the chatbot and interview_analysis through their llm_client shims.
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Dict, Iterator, List, Optional
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_RATE_PER_SEC = float(os.getenv("LLM_RATE_PER_SEC", "0"))
+LLM_BURST = int(os.getenv("LLM_BURST", "0"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "60"))
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "")
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+LLM_STUB_LATENCY = os.getenv("LLM_STUB_LATENCY", "fixed:0")  # fixed:MS | uniform:LO,HI | normal:MEAN,SD | lognormal:MEDIAN,SIGMA
+LLM_STUB_FAIL_RATE = float(os.getenv("LLM_STUB_FAIL_RATE", "0"))
+LLM_STUB_SEED = int(os.getenv("LLM_STUB_SEED", "0"))
+LLM_EMBED_MODEL = os.getenv("LLM_EMBED_MODEL", "models/text-embedding-004")
+
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+class LLMTimeout(TimeoutError):
+    """The call's deadline expired (queueing, rate limiting, retries or the model call)."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """429 / 5xx API errors and transport-level failures are worth retrying."""
+    code = getattr(exc, "code", None)
+    if isinstance(code, int) and (code == 429 or 500 <= code < 600):
+        return True
+    return isinstance(exc, (ConnectionError, TimeoutError, OSError))
+
+
+class TokenBucket:
+    """Classic token bucket; rate <= 0 disables limiting."""
+
+    def __init__(self, rate: float, burst: int = 0):
+        self.rate = rate
+        self.capacity = max(1.0, float(burst or rate or 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> bool:
+        if self.rate <= 0:
+            return True
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token; good enough for usage reporting without a count_tokens call."""
+    return (len(text) + 3) // 4
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds) with bucket-resolution percentiles."""
+
+    def __init__(self, buckets: List[int] = LATENCY_BUCKETS_MS):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        index = next((i for i, bound in enumerate(self.buckets) if ms <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.total += 1
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.total:
+            return None
+        rank, seen = q * self.total, 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(float(self.buckets[i]), round(self.max_ms, 1)) if i < len(self.buckets) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> Dict:
+        labels = [f"<={b}" for b in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 1) if self.total else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class GeminiTransport:
+    """google-generativeai model wrapper; `api_base` switches to the REST transport at that URL."""
+
+    def __init__(self, model_name: str, api_key: Optional[str] = None, api_base: str = GEMINI_API_BASE,
+                 **model_kwargs):
+        import google.generativeai as genai
+
+        if api_base:
+            genai.configure(api_key=api_key or "local", transport="rest",
+                            client_options={"api_endpoint": api_base})
+        else:
+            genai.configure(api_key=api_key)
+        self.genai = genai
+        self.model = genai.GenerativeModel(model_name, **model_kwargs)
+
+    def generate(self, prompt: str, timeout: float) -> str:
+        response = self.model.generate_content(prompt, request_options={"timeout": timeout})
+        return response.text
+
+    def stream(self, prompt: str, timeout: float) -> Iterator[str]:
+        response = self.model.generate_content(prompt, stream=True, request_options={"timeout": timeout})
+        for chunk in response:
+            if chunk.parts:
+                yield chunk.text
+
+    def embed(self, texts: List[str], model: str, timeout: float) -> List[List[float]]:
+        result = self.genai.embed_content(model=model, content=texts, request_options={"timeout": timeout})
+        return result["embedding"]
+
+
+class StubAPIError(Exception):
+    """Injected transient failure; `code` makes it look like an HTTP 429 / 503."""
+
+    def __init__(self, code: int):
+        super().__init__(f"stub injected HTTP {code}")
+        self.code = code
+
+
+def parse_latency(spec: str):
+    """'uniform:50,200' -> function returning a latency in milliseconds for a Random."""
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v.strip()] or [0.0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[-1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1] if len(values) > 1 else 0.0))
+    if kind == "lognormal":
+        median, sigma = values[0], values[1] if len(values) > 1 else 0.5
+        return lambda rng: rng.lognormvariate(0.0, sigma) * median
+    return lambda rng: values[0]
+
+
+def stub_reply(prompt: str) -> str:
+    """Deterministic, prompt-shaped canned text (same prompt -> same reply)."""
+    digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+    lower = prompt.lower()
+    if "json array, one object per answer" in lower:
+        count = max(1, len(re.findall(r"^\s*answer \d+\s*$", lower, re.MULTILINE)))
+        return json.dumps([{"index": i, "technical_knowledge": 4 + digest[i % 32] % 7,
+                            "communication_skills": 4 + digest[(i + 1) % 32] % 7,
+                            "problem_solving": 4 + digest[(i + 2) % 32] % 7,
+                            "experience_relevance": 4 + digest[(i + 3) % 32] % 7,
+                            "confidence": 4 + digest[(i + 4) % 32] % 7,
+                            "explanation": "Stub evaluation of the answer."} for i in range(1, count + 1)])
+    if "evaluate them on the following criteria" in lower or "provide scores" in lower:
+        names = ["Technical Knowledge", "Communication Skills", "Problem Solving",
+                 "Experience Relevance", "Confidence"]
+        lines = [f"{name}: {4 + digest[i] % 7}" for i, name in enumerate(names)]
+        return "\n".join(lines) + "\nExplanation: stub evaluation of the answer."
+    if "comprehensive evaluation" in lower:
+        recommendation = ["HIRE", "MAYBE", "NO HIRE"][digest[0] % 3]
+        return (f"1. Overall score: {50 + digest[1] % 50}\n2. Strengths: clear answers\n"
+                f"3. Areas for improvement: depth\n4. Recommendation: {recommendation}\n5. Stub feedback.")
+    if "question" in lower and ("numbered list" in lower or "generate" in lower):
+        return "\n".join(f"{i}. Stub technical question {i} ({digest[i] % 100})?" for i in range(1, 6))
+    if "running summary" in lower:
+        return "- Stub summary of the earlier conversation."
+    return f"Stub reply {digest[:4].hex()} to a {len(prompt)}-character prompt."
+
+
+def stub_embedding(text: str, dim: int = 256) -> List[float]:
+    """Deterministic hashed bag-of-words vector, so texts sharing words come out similar."""
+    vector = [0.0] * dim
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        vector[int.from_bytes(hashlib.sha256(word.encode("utf-8")).digest()[:4], "little") % dim] += 1.0
+    return vector
+
+
+class StubTransport:
+    """In-process fake model: canned replies, sampled latency, optional injected 429/503s."""
+
+    def __init__(self, latency: str = LLM_STUB_LATENCY, fail_rate: float = LLM_STUB_FAIL_RATE,
+                 seed: int = LLM_STUB_SEED):
+        self.sample_latency = parse_latency(latency)
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def _wait(self, timeout: float):
+        with self.lock:
+            delay = self.sample_latency(self.rng) / 1000
+            failed = self.fail_rate > 0 and self.rng.random() < self.fail_rate
+        if delay:
+            time.sleep(min(delay, timeout))
+        if delay > timeout:
+            raise TimeoutError("stub latency exceeded the request timeout")
+        if failed:
+            raise StubAPIError(429 if self.rng.random() < 0.5 else 503)
+
+    def generate(self, prompt: str, timeout: float) -> str:
+        self._wait(timeout)
+        return stub_reply(prompt)
+
+    def stream(self, prompt: str, timeout: float) -> Iterator[str]:
+        self._wait(timeout)
+        words = stub_reply(prompt).split(" ")
+        for i in range(0, len(words), 4):
+            yield " ".join(words[i:i + 4]) + " "
+
+    def embed(self, texts: List[str], model: str, timeout: float) -> List[List[float]]:
+        self._wait(timeout)
+        return [stub_embedding(text) for text in texts]
+
+
+def make_transport(model_name: str, api_key: Optional[str] = None, backend: str = LLM_BACKEND, **model_kwargs):
+    """Model backend selected by config (LLM_BACKEND=gemini|stub)."""
+    if backend == "stub":
+        return StubTransport()
+    return GeminiTransport(model_name, api_key=api_key, **model_kwargs)
+
+
+class LLMClient:
+    def __init__(self, transport, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 rate_per_sec: float = LLM_RATE_PER_SEC, burst: int = LLM_BURST,
+                 max_retries: int = LLM_MAX_RETRIES, deadline: float = LLM_DEADLINE_SECONDS,
+                 backoff: float = 0.5, max_backoff: float = 8.0):
+        self.transport = transport
+        self.max_retries = max_retries
+        self.deadline = deadline
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._bucket = TokenBucket(rate_per_sec, burst)
+        # Calls run on this pool so the caller can stop waiting at its deadline.
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._usage: Dict[str, Dict[str, int]] = {}
+        self.counters = {"calls": 0, "errors": 0, "retries": 0, "timeouts": 0, "in_flight": 0,
+                         "prompt_tokens": 0, "output_tokens": 0}
+
+    # ---------------- Bookkeeping ----------------
+    def _count(self, name: str, delta: int = 1):
+        with self._lock:
+            self.counters[name] += delta
+
+    def _use(self, operation: str, prompt: str = "", output: str = "", calls: int = 0):
+        """Per-operation call count and estimated prompt/output tokens."""
+        prompt_tokens = estimate_tokens(prompt) if prompt else 0
+        output_tokens = estimate_tokens(output) if output else 0
+        with self._lock:
+            usage = self._usage.setdefault(operation, {"calls": 0, "prompt_tokens": 0, "output_tokens": 0})
+            usage["calls"] += calls
+            usage["prompt_tokens"] += prompt_tokens
+            usage["output_tokens"] += output_tokens
+            self.counters["prompt_tokens"] += prompt_tokens
+            self.counters["output_tokens"] += output_tokens
+
+    def _observe(self, operation: str, started: float):
+        ms = (time.monotonic() - started) * 1000
+        with self._lock:
+            self._histograms.setdefault(operation, LatencyHistogram()).observe(ms)
+
+    def _release_slot(self, *_):
+        self._count("in_flight", -1)
+        self._slots.release()
+
+    def _acquire_slot(self, deadline_at: float, operation: str):
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0 or not self._bucket.acquire(remaining):
+            raise LLMTimeout(f"{operation}: deadline expired waiting for rate limit")
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0 or not self._slots.acquire(timeout=remaining):
+            raise LLMTimeout(f"{operation}: deadline expired waiting for a free LLM slot")
+        self._count("in_flight")
+        return deadline_at - time.monotonic()
+
+    def _backoff(self, attempt: int, deadline_at: float, exc: BaseException):
+        """Sleep before the next attempt, or re-raise if retrying can't finish in time."""
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt)) * random.uniform(0.5, 1.0)
+        if attempt >= self.max_retries or not is_retryable(exc) or time.monotonic() + delay >= deadline_at:
+            raise exc
+        self._count("retries")
+        time.sleep(delay)
+
+    def _call(self, operation: str, deadline: Optional[float], method, *args):
+        """Run `method(*args, timeout)` on the pool, retrying transient errors within the deadline."""
+        started = time.monotonic()
+        deadline_at = started + (deadline or self.deadline)
+        self._count("calls")
+        try:
+            for attempt in range(self.max_retries + 1):
+                remaining = self._acquire_slot(deadline_at, operation)
+                future = self._pool.submit(method, *args, remaining)
+                future.add_done_callback(self._release_slot)
+                try:
+                    return future.result(timeout=remaining)
+                except FutureTimeout:
+                    raise LLMTimeout(f"{operation}: no response within the deadline")
+                except Exception as e:
+                    self._backoff(attempt, deadline_at, e)
+        except LLMTimeout:
+            self._count("timeouts")
+            raise
+        except Exception:
+            self._count("errors")
+            raise
+        finally:
+            self._observe(operation, started)
+
+    # ---------------- Sync Entry Points ----------------
+    def generate(self, prompt: str, operation: str = "default", deadline: Optional[float] = None) -> str:
+        """Return the model's text for `prompt`, retrying transient errors within the deadline."""
+        self._use(operation, prompt, calls=1)
+        text = self._call(operation, deadline, self.transport.generate, prompt)
+        self._use(operation, output=text or "")
+        return text
+
+    def embed(self, texts: List[str], operation: str = "default", model: str = LLM_EMBED_MODEL,
+              deadline: Optional[float] = None) -> List[List[float]]:
+        """One embedding vector per text, in one request; callers keep batches within the API limit."""
+        self._use(operation, "\n".join(texts), calls=1)
+        return self._call(operation, deadline, self.transport.embed, list(texts), model)
+
+    def stream(self, prompt: str, operation: str = "default", deadline: Optional[float] = None) -> Iterator[str]:
+        """Yield text chunks; retries only happen before the first chunk arrives."""
+        started = time.monotonic()
+        deadline_at = started + (deadline or self.deadline)
+        self._count("calls")
+        self._use(operation, prompt, calls=1)
+        try:
+            for attempt in range(self.max_retries + 1):
+                remaining = self._acquire_slot(deadline_at, operation)
+                chunks: queue.Queue = queue.Queue()
+
+                def pump(timeout=remaining):
+                    try:
+                        for text in self.transport.stream(prompt, timeout):
+                            chunks.put(("chunk", text))
+                        chunks.put(("end", None))
+                    except Exception as e:
+                        chunks.put(("error", e))
+
+                self._pool.submit(pump).add_done_callback(self._release_slot)
+                received = False
+                while True:
+                    try:
+                        kind, value = chunks.get(timeout=max(0.0, deadline_at - time.monotonic()))
+                    except queue.Empty:
+                        raise LLMTimeout(f"{operation}: stream stalled past the deadline")
+                    if kind == "chunk":
+                        received = True
+                        self._use(operation, output=value)
+                        yield value
+                    elif kind == "end":
+                        return
+                    elif received:
+                        raise value
+                    else:
+                        self._backoff(attempt, deadline_at, value)
+                        break
+        except LLMTimeout:
+            self._count("timeouts")
+            raise
+        except Exception:
+            self._count("errors")
+            raise
+        finally:
+            self._observe(operation, started)
+
+    # ---------------- Async Entry Point ----------------
+    async def agenerate(self, prompt: str, operation: str = "default", deadline: Optional[float] = None) -> str:
+        """Awaitable generate(); waits on a worker thread so the event loop never blocks."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.generate, prompt, operation, deadline))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self.counters,
+                    "usage": {op: dict(usage) for op, usage in self._usage.items()},
+                    "latency_ms": {op: hist.snapshot() for op, hist in self._histograms.items()}}
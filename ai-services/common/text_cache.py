@@ -0,0 +1,100 @@
+"""Extracted-text cache shared by resume_screening and interview_analysis.
+
+Entries are "<sha256 of file bytes>.txt" files holding ASCII-normalized text
+in TEXT_CACHE_DIR, so both services on a host reuse each other's parses.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Optional
+
+TEXT_CACHE_DIR = os.getenv("TEXT_CACHE_DIR", os.path.join(tempfile.gettempdir(), "hrms_text_cache"))
+TEXT_CACHE_MAX_MB = int(os.getenv("TEXT_CACHE_MAX_MB", "256"))
+
+
+def file_digest(file_bytes: bytes) -> str:
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+class TextCache:
+    def __init__(self, cache_dir: str = TEXT_CACHE_DIR, max_bytes: int = TEXT_CACHE_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total = sum(size for _, _, size in self._entries())
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.txt")
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".txt"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, name, st.st_size))
+        return entries
+
+    def _evict(self):
+        """Drop least recently used entries until the cache is under 90% of its budget."""
+        entries = sorted(self._entries())
+        self._total = sum(size for _, _, size in entries)
+        target = self.max_bytes * 0.9
+        for _, name, size in entries:
+            if self._total <= target:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                self._total -= size
+            except OSError:
+                pass
+
+    def get(self, digest: str) -> Optional[str]:
+        """Return cached text for a digest, or None."""
+        path = self._path(digest)
+        try:
+            with open(path, "r", encoding="ascii") as f:
+                text = f.read()
+            os.utime(path)  # mark as recently used for eviction
+            return text
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def put(self, digest: str, text: str) -> None:
+        """Store text for a digest, evicting old entries past the size budget."""
+        if not text:
+            return
+        data = text.encode("ascii", "ignore")
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(digest))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._total += len(data)
+            if self._total > self.max_bytes:
+                self._evict()
+
+
+_text_cache = None
+_text_cache_lock = threading.Lock()
+
+
+def get_text_cache() -> TextCache:
+    """Return the process-wide cache, creating it on first use."""
+    global _text_cache
+    with _text_cache_lock:
+        if _text_cache is None:
+            _text_cache = TextCache()
+        return _text_cache
@@ -1,5 +1,5 @@
 # Updated to use Gemini 1.5 Flash instead of OpenAI
-from config.gemini_config import model, INTERVIEW_PROMPTS
+from config.gemini_config import llm, INTERVIEW_PROMPTS
 from tools.parser import extract_text_from_pdf, read_text_from_file
 from tools.keyword_matcher import match_keywords
 from tools.save_data import save_candidate_data
@@ -35,8 +35,7 @@ def screen_candidate_with_gemini():
         """
         
         # Get response from Gemini
-        result = model.generate_content(screening_prompt)
-        screening_result = result.text
+        screening_result = llm.generate(screening_prompt, operation="screening")
         
         return screening_result
         
@@ -82,8 +81,7 @@ def generate_interview_questions(screening_result):
         Make the questions conversational and suitable for a voice interview.
         """
         
-        result = model.generate_content(interview_prompt)
-        return result.text
+        return llm.generate(interview_prompt, operation="interview.questions")
         
     except Exception as e:
         print(f"Error generating questions: {e}")
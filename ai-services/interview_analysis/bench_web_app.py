@@ -0,0 +1,90 @@
+"""
+Throughput benchmark for the interview Flask endpoints with the offline LLM stub.
+
+    python bench_web_app.py --interviews 200 --threads 16 --latency fixed:0
+    python bench_web_app.py --interviews 50 --threads 32 --latency lognormal:400,0.6
+    python bench_web_app.py --interviews 30 --threads 16 --latency fixed:800 --think-ms 1000
+    SCORING_BATCH_SIZE=1 python bench_web_app.py   # per-answer scoring calls, for comparison
+
+Runs complete interviews (start -> 5 answers -> deep follow-ups -> 5 answers
+-> finish) through Flask's test client with LLM_BACKEND=stub, so the numbers
+measure this service's own overhead (plus the simulated model latency)
+without network access or Gemini quota. CSV/Mongo persistence is disabled.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interview web app load benchmark (stub LLM)")
+    parser.add_argument("--interviews", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--latency", default="fixed:0", help="LLM_STUB_LATENCY distribution")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Injected 429/503 rate")
+    parser.add_argument("--concurrency", type=int, default=64, help="LLM_MAX_CONCURRENCY")
+    parser.add_argument("--think-ms", type=float, default=0, help="Candidate time per answer")
+    args = parser.parse_args()
+
+    # Must be set before the app (and its LLM client) is imported.
+    os.environ.update(LLM_BACKEND="stub", LLM_STUB_LATENCY=args.latency,
+                      LLM_STUB_FAIL_RATE=str(args.fail_rate), LLM_MAX_CONCURRENCY=str(args.concurrency))
+    os.environ.pop("MONGODB_URI", None)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import web_app
+    web_app.MONGO_AVAILABLE = False
+    web_app.save_candidate_data = lambda **kwargs: None
+
+    client = web_app.app.test_client()
+    timings = defaultdict(list)
+
+    def call(endpoint, payload):
+        start = time.perf_counter()
+        response = client.post(endpoint, json=payload)
+        timings[endpoint].append((time.perf_counter() - start) * 1000)
+        return response.get_json()
+
+    def interview(i):
+        session_id = call("/api/start", {})["session_id"]
+        while True:
+            step = call("/api/next", {"session_id": session_id})
+            if step.get("done"):
+                break
+            time.sleep(args.think_ms / 1000)
+            call("/api/answer", {"session_id": session_id, "answer": f"Answer {i} to {step['question']}"})
+        call("/api/finish", {"session_id": session_id})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(interview, range(args.interviews)))
+    elapsed = time.perf_counter() - start
+
+    requests = sum(len(v) for v in timings.values())
+    print(f"{args.interviews} interviews, {requests} requests in {elapsed:.2f}s "
+          f"-> {requests / elapsed:.0f} req/s ({args.threads} threads, stub latency {args.latency})")
+    for endpoint, samples in sorted(timings.items()):
+        samples.sort()
+        p95 = samples[min(len(samples) - 1, int(0.95 * len(samples)))]
+        print(f"  {endpoint:<14} n={len(samples):<6} p50={statistics.median(samples):7.2f} ms  p95={p95:7.2f} ms")
+    llm_stats = web_app.llm.stats()
+    print("LLM:", {k: v for k, v in llm_stats.items() if k not in ("latency_ms", "usage")})
+    print(f"Per interview (scoring batch size {web_app.SCORING.batch_size if web_app.SCORING.batch_fn else 1}):")
+    for operation, usage in sorted(llm_stats["usage"].items()):
+        print(f"  {operation:<22} calls={usage['calls'] / args.interviews:5.1f}  "
+              f"prompt_tokens={usage['prompt_tokens'] / args.interviews:7.0f}  "
+              f"output_tokens={usage['output_tokens'] / args.interviews:6.0f}")
+    print(f"  {'total':<22} calls={llm_stats['calls'] / args.interviews:5.1f}  "
+          f"prompt_tokens={llm_stats['prompt_tokens'] / args.interviews:7.0f}  "
+          f"output_tokens={llm_stats['output_tokens'] / args.interviews:6.0f}")
+    prefetch = web_app.PREFETCH.stats()
+    handoff = prefetch.pop("handoff_ms")
+    print("Deep follow-up prefetch:", prefetch)
+    print(f"  phase handoff mean={handoff['mean_ms']} ms  max={handoff['max_ms']} ms")
+
+
+if __name__ == "__main__":
+    main()
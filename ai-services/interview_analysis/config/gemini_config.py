@@ -1,15 +1,19 @@
-import google.generativeai as genai
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from tools.llm_client import LLMClient, make_transport
+
 # Configure Gemini API
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-genai.configure(api_key=GEMINI_API_KEY)
 
-# Initialize Gemini model
-model = genai.GenerativeModel('gemini-2.0-flash')
+# Shared Gemini client: every model call goes through llm.generate(...) so it
+# gets the concurrency cap, rate limit, retries and deadline (see ai-services/common/llm_client.py)
+llm = LLMClient(make_transport('gemini-2.0-flash', api_key=GEMINI_API_KEY))
+
+# Underlying Gemini model, kept for code that still expects it (None with LLM_BACKEND=stub)
+model = getattr(llm.transport, "model", None)
 
 # Interview Configuration
 INTERVIEW_DURATION_MINUTES = 15  # Fixed interview duration
@@ -52,6 +56,21 @@ INTERVIEW_PROMPTS = {
     Provide scores for each criterion and a brief explanation for each score.
     """,
     
+    "batch_scoring_prompt": """
+    Evaluate each of the candidate's answers below on the following criteria (0-10 scale):
+    1. Technical Knowledge: How well did they demonstrate understanding of the subject?
+    2. Communication Skills: How clear and articulate was their response?
+    3. Problem Solving: How well did they approach and solve problems?
+    4. Experience Relevance: How relevant was their experience to the question?
+    5. Confidence: How confident and professional did they sound?
+
+    {answers}
+
+    Respond with ONLY a JSON array, one object per answer, in this exact form:
+    [{{"index": 1, "technical_knowledge": 0, "communication_skills": 0, "problem_solving": 0,
+      "experience_relevance": 0, "confidence": 0, "explanation": "one or two sentences"}}]
+    """,
+
     "final_evaluation": """
     Based on all the candidate's responses during this interview, provide a comprehensive evaluation:
     
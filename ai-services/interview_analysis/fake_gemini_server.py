@@ -0,0 +1,119 @@
+"""
+Local fake of the Gemini REST API for load, timeout and retry testing.
+
+    python fake_gemini_server.py --port 8089 --latency-ms 300 --fail-every 5 --hang-every 0
+    GEMINI_API_BASE=http://127.0.0.1:8089 python web_app.py
+
+Serves `POST /v1beta/models/<model>:generateContent`,
+`:streamGenerateContent` (a streamed JSON array, as the REST transport
+expects) and `:batchEmbedContents`. Every `--fail-every`-th request gets a 429 (alternating with 503)
+and every `--hang-every`-th request never answers, so the shared LLM
+client's retries, deadlines and histograms can be exercised without a key.
+GET /stats returns the request counters.
+"""
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tools.llm_client import stub_embedding, stub_reply
+
+counter = itertools.count(1)
+stats = {"requests": 0, "failed": 0, "hung": 0, "in_flight": 0, "max_in_flight": 0}
+stats_lock = threading.Lock()
+
+
+class Handler(BaseHTTPRequestHandler):
+    options = None
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith("/stats"):
+            with stats_lock:
+                return self._json(200, dict(stats))
+        self._json(404, {"error": {"code": 404, "message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        prompt = " ".join(part.get("text", "") for content in request.get("contents", [])
+                          for part in content.get("parts", []))
+        n = next(counter)
+        with stats_lock:
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            opts = self.options
+            if opts.hang_every and n % opts.hang_every == 0:
+                with stats_lock:
+                    stats["hung"] += 1
+                time.sleep(3600)
+                return
+            time.sleep(opts.latency_ms / 1000)
+            if opts.fail_every and n % opts.fail_every == 0:
+                with stats_lock:
+                    stats["failed"] += 1
+                status = 429 if (n // opts.fail_every) % 2 else 503
+                return self._json(status, {"error": {"code": status, "message": "fake transient error",
+                                                     "status": "RESOURCE_EXHAUSTED" if status == 429 else "UNAVAILABLE"}})
+
+            if ":batchEmbedContents" in self.path:
+                texts = [" ".join(part.get("text", "") for part in item.get("content", {}).get("parts", []))
+                         for item in request.get("requests", [])]
+                return self._json(200, {"embeddings": [{"values": stub_embedding(text)} for text in texts]})
+
+            text = stub_reply(prompt)
+            if ":streamGenerateContent" in self.path:
+                return self._stream(text)
+            self._json(200, {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]},
+                                             "finishReason": "STOP", "index": 0}]})
+        finally:
+            with stats_lock:
+                stats["in_flight"] -= 1
+
+    def _stream(self, text):
+        words = text.split(" ")
+        pieces = [" ".join(words[i:i + 4]) + " " for i in range(0, len(words), 4)]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(b"[")
+        for i, piece in enumerate(pieces):
+            chunk = {"candidates": [{"content": {"role": "model", "parts": [{"text": piece}]}, "index": 0}]}
+            self.wfile.write((("," if i else "") + json.dumps(chunk) + "\n").encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.options.chunk_ms / 1000)
+        self.wfile.write(b"]")
+        self.close_connection = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Gemini REST server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=200, help="Delay before each response")
+    parser.add_argument("--chunk-ms", type=float, default=50, help="Delay between streamed chunks")
+    parser.add_argument("--fail-every", type=int, default=0, help="Return 429/503 on every Nth request")
+    parser.add_argument("--hang-every", type=int, default=0, help="Never answer every Nth request")
+    Handler.options = parser.parse_args()
+    server = ThreadingHTTPServer((Handler.options.host, Handler.options.port), Handler)
+    server.daemon_threads = True
+    print(f"Fake Gemini API on http://{Handler.options.host}:{Handler.options.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from tools.scoring_queue import ScoringQueue, score_key
+from tools.session_store import MemorySessionStore
+
+ITEMS = [{"question": "Q1", "response": "A1"}, {"question": "Q2", "response": "A2"}]
+
+
+def score(question, answer):
+    return {"score": 5, "answer": answer}
+
+
+def score_batch(pairs):
+    return [score(question, answer) for question, answer in pairs]
+
+
+@pytest.fixture
+def store():
+    store = MemorySessionStore()
+    store.put("s1", {"responses": [dict(item) for item in ITEMS]})
+    return store
+
+
+def test_cancelled_future_is_not_raised(store):
+    queue = ScoringQueue(score, store, batch_fn=score_batch, batch_size=10)
+    futures = [queue.submit("s1", i, item["question"], item["response"]) for i, item in enumerate(ITEMS)]
+    # discard() cancels held futures; a reader that already copied them must not see CancelledError.
+    for future in futures:
+        future.cancel()
+    assert queue.result("s1", 0) is None
+    assert queue.status("s1", 2)["pending"] == 2
+    assert queue.collect("s1", ITEMS) == [score("Q1", "A1"), score("Q2", "A2")]
+
+
+def test_cancelled_future_falls_back_to_store(store):
+    queue = ScoringQueue(score, store, batch_fn=score_batch, batch_size=10)
+    queue.submit("s1", 0, "Q1", "A1").cancel()
+    store.put(score_key("s1", 0), {"score": 7})
+    assert queue.result("s1", 0) == {"score": 7}
+
+
+def test_timed_out_answers_are_scored_inline(store):
+    release = threading.Event()
+
+    def slow_score(question, answer):
+        if threading.current_thread().name.startswith("answer-scoring"):
+            release.wait(5)
+        return score(question, answer)
+
+    queue = ScoringQueue(slow_score, store, batch_size=1)
+    for i, item in enumerate(ITEMS):
+        queue.submit("s1", i, item["question"], item["response"])
+    try:
+        results = queue.collect("s1", ITEMS, timeout=0.05)
+    finally:
+        release.set()
+    assert results == [score("Q1", "A1"), score("Q2", "A2")]
+    assert all("error" not in result for result in results)
@@ -0,0 +1,141 @@
+"""Parsed interview assets (job description + resume), loaded once.
+
+Pairs are named in INTERVIEW_ASSET_PAIRS as
+"name=jd_file:resume_file,other=jd2.txt:cv2.pdf" (paths relative to
+ASSETS_DIR); the "default" pair is always the stock job_description.txt /
+CV-English.pdf. Each file is parsed on first use (or by preload() at
+startup) and kept in memory with its mtime and size. Callers get the cached
+text until the file changes on disk, which is checked at most every
+ASSET_CHECK_SECONDS.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from tools.parser import extract_text_from_docx, extract_text_from_pdf, read_text_from_file
+
+ASSETS_DIR = os.getenv("ASSETS_DIR", "assets")
+INTERVIEW_ASSET_PAIRS = os.getenv("INTERVIEW_ASSET_PAIRS", "")
+ASSET_CHECK_SECONDS = float(os.getenv("ASSET_CHECK_SECONDS", "2"))
+DEFAULT_PAIR = "default"
+
+
+def extract_candidate_name(resume_text: str) -> str:
+    lines = [ln.strip() for ln in resume_text.split('\n') if ln.strip()]
+    for line in lines[:10]:
+        if 2 < len(line) < 60 and 1 <= len(line.split()) <= 4:
+            return line
+    return "Candidate"
+
+
+def parse_asset_pairs(spec: str) -> Dict[str, Tuple[str, str]]:
+    pairs = {DEFAULT_PAIR: ("job_description.txt", "CV-English.pdf")}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, files = item.partition("=")
+        jd_file, _, resume_file = files.partition(":")
+        if not (name.strip() and jd_file.strip() and resume_file.strip()):
+            raise ValueError(f"Bad INTERVIEW_ASSET_PAIRS entry: {item!r}")
+        pairs[name.strip()] = (jd_file.strip(), resume_file.strip())
+    return pairs
+
+
+def _parse_file(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".pdf":
+        return extract_text_from_pdf(path)
+    if ext == ".docx":
+        return extract_text_from_docx(path)
+    return read_text_from_file(path)
+
+
+@dataclass
+class _Entry:
+    signature: Optional[Tuple[int, int]]   # (mtime_ns, size); None if the file is missing
+    text: str
+    checked_at: float
+
+
+@dataclass(frozen=True)
+class InterviewAssets:
+    pair: str
+    job_description: str
+    resume_text: str
+    candidate_name: str
+
+
+class AssetRegistry:
+    def __init__(self, assets_dir: str = ASSETS_DIR, pairs: Optional[Dict[str, Tuple[str, str]]] = None,
+                 check_seconds: float = ASSET_CHECK_SECONDS):
+        self.assets_dir = assets_dir
+        self.pairs = pairs if pairs is not None else parse_asset_pairs(INTERVIEW_ASSET_PAIRS)
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._names: Dict[str, str] = {}
+        self.stats = {"hits": 0, "parses": 0, "errors": 0}
+
+    def _signature(self, path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def text(self, filename: str) -> str:
+        """Parsed text of an asset file, re-parsed only when its mtime/size changes."""
+        path = os.path.join(self.assets_dir, filename)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and now - entry.checked_at < self.check_seconds:
+                self.stats["hits"] += 1
+                return entry.text
+
+        signature = self._signature(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.signature == signature:
+                entry.checked_at = now
+                self.stats["hits"] += 1
+                return entry.text
+
+        # Parse outside the lock; a concurrent duplicate parse is harmless.
+        text = ""
+        if signature is not None:
+            try:
+                text = _parse_file(path)
+            except Exception as e:
+                print(f"Could not parse asset {path}: {e}")
+                with self._lock:
+                    self.stats["errors"] += 1
+        with self._lock:
+            self._entries[path] = _Entry(signature, text, now)
+            self._names.pop(path, None)
+            self.stats["parses"] += 1
+        return text
+
+    def _candidate_name(self, filename: str, resume_text: str) -> str:
+        if not resume_text:
+            return "Interview Candidate"
+        path = os.path.join(self.assets_dir, filename)
+        with self._lock:
+            name = self._names.get(path)
+        if name is None:
+            name = extract_candidate_name(resume_text)
+            with self._lock:
+                self._names[path] = name
+        return name
+
+    def get(self, pair: str = DEFAULT_PAIR) -> InterviewAssets:
+        """Assets for a named pair; KeyError if the pair is not configured."""
+        jd_file, resume_file = self.pairs[pair]
+        job_description = self.text(jd_file)
+        resume_text = self.text(resume_file)
+        return InterviewAssets(pair, job_description, resume_text,
+                               self._candidate_name(resume_file, resume_text))
+
+    def preload(self):
+        for pair in self.pairs:
+            self.get(pair)
@@ -0,0 +1,77 @@
+"""Score several interview answers with one structured LLM call.
+
+One "batch_scoring_prompt" call asks for a JSON array with the five
+criteria per answer, instead of repeating the scoring instructions once per
+answer. Answers the reply does not cover (or the whole batch, if the call
+fails or the JSON does not parse) are scored one by one with the regular
+per-answer prompt, so a bad batch reply never loses a score.
+
+SCORING_BATCH_SIZE is shared by the web app's ScoringQueue and the voice
+agent's InterviewSession.
+"""
+import json
+import os
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.gemini_config import INTERVIEW_PROMPTS
+
+SCORING_BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "5"))
+
+SCORE_FIELDS = ["technical_knowledge", "communication_skills", "problem_solving",
+                "experience_relevance", "confidence"]
+
+
+def parse_scores(score_text: str) -> Dict[str, int]:
+    """Naive extraction from free-text scoring replies: the first five numbers, in criteria order."""
+    numbers = re.findall(r"\b(\d+)\b", score_text)
+    if len(numbers) < len(SCORE_FIELDS):
+        return {field: 5 for field in SCORE_FIELDS}
+    return {field: min(10, max(0, int(n))) for field, n in zip(SCORE_FIELDS, numbers)}
+
+
+def build_batch_prompt(items: List[Tuple[str, str]]) -> str:
+    answers = "\n\n".join(f"Answer {i}\nQuestion asked: {question}\nCandidate's response: {answer}"
+                          for i, (question, answer) in enumerate(items, 1))
+    return INTERVIEW_PROMPTS["batch_scoring_prompt"].format(answers=answers)
+
+
+def parse_batch_reply(text: str, count: int) -> List[Optional[Dict]]:
+    """Per-answer {"scores", "score_text"} from a JSON array reply; None where unusable."""
+    results: List[Optional[Dict]] = [None] * count
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end <= start:
+        return results
+    try:
+        entries = json.loads(text[start:end + 1])
+    except ValueError:
+        return results
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        index = entry.get("index")
+        if not isinstance(index, int) or not 1 <= index <= count:
+            continue
+        try:
+            scores = {field: min(10, max(0, int(entry[field]))) for field in SCORE_FIELDS}
+        except (KeyError, TypeError, ValueError):
+            continue
+        lines = [f"{field.replace('_', ' ').title()}: {value}" for field, value in scores.items()]
+        if entry.get("explanation"):
+            lines.append(f"Explanation: {entry['explanation']}")
+        results[index - 1] = {"scores": scores, "score_text": "\n".join(lines)}
+    return results
+
+
+def score_batch(llm, items: List[Tuple[str, str]], score_one: Callable[[str, str], Dict]) -> List[Dict]:
+    """Scores for (question, answer) pairs: one batched call, per-answer fallback for the gaps."""
+    if len(items) == 1:
+        return [score_one(*items[0])]
+    try:
+        reply = llm.generate(build_batch_prompt(items), operation="interview.score_batch") or ""
+        parsed = parse_batch_reply(reply, len(items))
+    except Exception as e:
+        print(f"Batch scoring failed, scoring answers one by one: {e}")
+        parsed = [None] * len(items)
+    return [result if result is not None else score_one(question, answer)
+            for result, (question, answer) in zip(parsed, items)]
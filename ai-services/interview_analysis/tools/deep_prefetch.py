@@ -0,0 +1,146 @@
+"""Speculative generation of the deep-phase follow-up questions.
+
+Once DEEP_PREFETCH_MIN_ANSWERS initial answers are in, every further answer
+except the last starts a background `generate_fn(job_description, responses)`
+with all the answers so far. The last answer is followed straight away by
+the handoff, so a run started there would only be waited on; the follow-ups
+are built from every answer but the last one instead, while the candidate
+answers it. A queued generation is cancelled when a newer one supersedes it.
+/api/next then serves the follow-ups with no wait:
+
+- "hit":   the final prefetch (all answers but the last) has finished.
+- "stale": the final prefetch is still running; wait up to
+           DEEP_PREFETCH_WAIT_SECONDS for it, else serve the newest result
+           from fewer answers.
+- "waited": nothing finished yet; wait for the in-flight generation.
+- "miss":  nothing was prefetched (e.g. another worker took the answers);
+           generate inline from every answer.
+
+DEEP_PREFETCH_MIN_ANSWERS=0 (the default) means one less than the number of
+initial questions, i.e. a single generation per interview; each answer
+below that costs one more LLM call. Handoff latency is kept in a histogram
+for stats().
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tools.llm_client import LatencyHistogram
+from tools.session_store import SESSION_MAX_ITEMS, SessionStore
+
+DEEP_PREFETCH = os.getenv("DEEP_PREFETCH", "true").lower() == "true"
+DEEP_PREFETCH_MIN_ANSWERS = int(os.getenv("DEEP_PREFETCH_MIN_ANSWERS", "0"))
+DEEP_PREFETCH_WAIT_SECONDS = float(os.getenv("DEEP_PREFETCH_WAIT_SECONDS", "0.5"))
+DEEP_PREFETCH_WORKERS = int(os.getenv("DEEP_PREFETCH_WORKERS", "32"))
+
+
+def prefetch_key(session_id: str) -> str:
+    return f"{session_id}#deep"
+
+
+class DeepFollowupPrefetcher:
+    def __init__(self, generate_fn: Callable[[str, List[Dict]], List[str]], store: SessionStore,
+                 initial_questions: int, enabled: bool = DEEP_PREFETCH,
+                 min_answers: int = DEEP_PREFETCH_MIN_ANSWERS,
+                 wait_seconds: float = DEEP_PREFETCH_WAIT_SECONDS, max_workers: int = DEEP_PREFETCH_WORKERS,
+                 max_sessions: int = SESSION_MAX_ITEMS):
+        self.generate_fn = generate_fn
+        self.store = store
+        self.enabled = enabled
+        # The final prefetch covers every initial answer but the last.
+        self.final_answers = max(1, initial_questions - 1)
+        self.min_answers = min(min_answers or self.final_answers, self.final_answers)
+        self.wait_seconds = wait_seconds
+        self.max_sessions = max_sessions
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="deep-prefetch")
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[str, Tuple[int, Future]]" = OrderedDict()
+        self._latest: "OrderedDict[str, Tuple[int, List[str]]]" = OrderedDict()
+        self.counters = {"generations": 0, "cancelled": 0, "hit": 0, "stale": 0, "waited": 0, "miss": 0}
+        self._handoff = LatencyHistogram()
+
+    def update(self, session_id: str, job_description: str, responses: List[Dict]):
+        """Called after each initial-phase answer; (re)starts the speculative generation."""
+        answered = len(responses)
+        if not self.enabled or not self.min_answers <= answered <= self.final_answers:
+            return
+        with self._lock:
+            previous = self._pending.get(session_id)
+            if previous is not None and previous[1].cancel():
+                self.counters["cancelled"] += 1
+            future = self._pool.submit(self._run, session_id, answered, job_description, list(responses))
+            self._pending[session_id] = (answered, future)
+            self._pending.move_to_end(session_id)
+            while len(self._pending) > self.max_sessions:
+                self._pending.popitem(last=False)
+
+    def _run(self, session_id: str, answered: int, job_description: str, responses: List[Dict]) -> List[str]:
+        questions = self.generate_fn(job_description, responses)
+        with self._lock:
+            self.counters["generations"] += 1
+            if session_id not in self._pending:
+                return questions   # taken or discarded meanwhile
+            current = self._latest.get(session_id)
+            newest = current is None or current[0] < answered
+            if newest:
+                self._latest[session_id] = (answered, questions)
+                self._latest.move_to_end(session_id)
+                while len(self._latest) > self.max_sessions:
+                    self._latest.popitem(last=False)
+        if newest:
+            # Visible to other workers sharing the session store, unless one
+            # of them has already handed the interview over to the deep phase.
+            session = self.store.get(session_id)
+            if session is not None and session.get("phase", "initial") == "initial":
+                self.store.put(prefetch_key(session_id), {"answered": answered, "questions": questions})
+        return questions
+
+    def _best(self, session_id: str) -> Optional[Tuple[int, List[str]]]:
+        with self._lock:
+            latest = self._latest.get(session_id)
+        if latest is None:
+            stored = self.store.get(prefetch_key(session_id))
+            if stored:
+                latest = (stored["answered"], stored["questions"])
+        return latest
+
+    def take(self, session_id: str, job_description: str, responses: List[Dict]) -> List[str]:
+        """Follow-up questions for the phase handoff, waiting as little as possible."""
+        start = time.perf_counter()
+        answered = min(len(responses), self.final_answers)
+        with self._lock:
+            pending = self._pending.get(session_id)
+        best = self._best(session_id)
+
+        if best is not None and best[0] >= answered:
+            outcome, questions = "hit", best[1]
+        elif pending is not None and pending[0] >= answered and not pending[1].cancelled():
+            try:
+                questions = pending[1].result(timeout=self.wait_seconds if best else None)
+                outcome = "waited" if best is None else "hit"
+            except FutureTimeout:
+                outcome, questions = "stale", best[1]
+        else:
+            outcome, questions = "miss", self.generate_fn(job_description, responses)
+
+        with self._lock:
+            self.counters[outcome] += 1
+            self._handoff.observe((time.perf_counter() - start) * 1000)
+        self.discard(session_id)
+        return questions
+
+    def discard(self, session_id: str):
+        with self._lock:
+            pending = self._pending.pop(session_id, None)
+            self._latest.pop(session_id, None)
+        if pending is not None:
+            pending[1].cancel()
+        self.store.delete(prefetch_key(session_id))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self.counters, "enabled": self.enabled, "min_answers": self.min_answers,
+                    "handoff_ms": self._handoff.snapshot()}
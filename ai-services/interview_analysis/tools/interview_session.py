@@ -1,8 +1,9 @@
 import time
 import threading
 from datetime import datetime, timedelta
-from config.gemini_config import model, INTERVIEW_DURATION_MINUTES, QUESTION_INTERVAL_SECONDS, INTERVIEW_PROMPTS
+from config.gemini_config import llm, INTERVIEW_DURATION_MINUTES, QUESTION_INTERVAL_SECONDS, INTERVIEW_PROMPTS
 from tools.voice_processor import voice_processor
+from tools.batch_scoring import SCORING_BATCH_SIZE, score_batch
 
 class InterviewSession:
     def __init__(self, candidate_name, job_description):
@@ -13,6 +14,7 @@ class InterviewSession:
         self.questions_asked = []
         self.responses = []
         self.scores = []
+        self.pending_scores = []   # (question, response) waiting for a batched scoring call
         self.is_active = False
         self.timer_thread = None
         
@@ -77,30 +79,54 @@ class InterviewSession:
     
     def score_response(self, question, response):
         """Score a single response using Gemini"""
+        result = self._score_one(question, response)
+        if "error" in result:
+            print(f"Error scoring response: {result['error']}")
+            return None
+        self.scores.append(self._score_entry(question, response, result["scores"]))
+        return result["scores"]
+    
+    def queue_score(self, question, response):
+        """Queue a response; scores SCORING_BATCH_SIZE of them per Gemini call. Returns newly scored entries."""
+        self.pending_scores.append((question, response))
+        if len(self.pending_scores) >= SCORING_BATCH_SIZE:
+            return self.flush_scores()
+        return []
+
+    def flush_scores(self):
+        """Score every queued response (one batched call, per-answer fallback)"""
+        pending, self.pending_scores = self.pending_scores, []
+        if not pending:
+            return []
+        results = score_batch(llm, pending, self._score_one)
+        scored = []
+        for (question, response), result in zip(pending, results):
+            if "error" in result:
+                print(f"Error scoring response: {result['error']}")
+                continue
+            scored.append(self._score_entry(question, response, result["scores"]))
+        self.scores.extend(scored)
+        return scored
+
+    def _score_entry(self, question, response, scores):
+        return {
+            "question": question,
+            "response": response,
+            "scores": scores,
+            "timestamp": datetime.now().strftime("%H:%M:%S")
+        }
+
+    def _score_one(self, question, response):
         try:
             scoring_prompt = INTERVIEW_PROMPTS["scoring_prompt"].format(
                 response=response,
                 question=question
             )
-            
-            result = model.generate_content(scoring_prompt)
-            score_text = result.text
-            
-            # Parse scores from response (basic parsing)
-            scores = self._parse_scores(score_text)
-            self.scores.append({
-                "question": question,
-                "response": response,
-                "scores": scores,
-                "timestamp": datetime.now().strftime("%H:%M:%S")
-            })
-            
-            return scores
-            
+            score_text = llm.generate(scoring_prompt, operation="interview.score")
+            return {"score_text": score_text, "scores": self._parse_scores(score_text)}
         except Exception as e:
-            print(f"Error scoring response: {e}")
-            return None
-    
+            return {"error": str(e)}
+
     def _parse_scores(self, score_text):
         """Parse scores from Gemini response"""
         # Simple parsing - in production, you'd want more robust parsing
@@ -128,6 +154,7 @@ class InterviewSession:
         """End the interview session"""
         self.is_active = False
         self.end_time = datetime.now()
+        self.flush_scores()
         
         voice_processor.speak("Thank you for your time. The interview is now complete. I'll analyze your responses and provide feedback shortly.")
         
@@ -145,8 +172,7 @@ class InterviewSession:
                 interview_summary=interview_summary
             )
             
-            result = model.generate_content(final_prompt)
-            evaluation = result.text
+            evaluation = llm.generate(final_prompt, operation="interview.final")
             
             return {
                 "candidate_name": self.candidate_name,
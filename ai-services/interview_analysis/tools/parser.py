@@ -1,17 +1,44 @@
+import io
+import unicodedata
+
 import pdfplumber
 import docx2txt
 
-def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from a PDF resume."""
+from tools.text_cache import file_digest, get_text_cache
+
+def to_ascii(s: str) -> str:
+    """Normalize text to plain ASCII (same rules as the resume screening service)."""
+    if not s:
+        return ""
+    s = s.replace('\xa0', ' ')
+    return unicodedata.normalize('NFKD', s).encode('ascii', 'ignore').decode('ascii')
+
+def _cached_extract(path: str, parse) -> str:
+    """Run parse(file_obj) unless these exact bytes were parsed before."""
+    with open(path, "rb") as f:
+        file_bytes = f.read()
+    cache = get_text_cache()
+    digest = file_digest(file_bytes)
+    text = cache.get(digest)
+    if text is None:
+        text = to_ascii(parse(io.BytesIO(file_bytes))).strip()
+        cache.put(digest, text)
+    return text
+
+def _parse_pdf(file_obj) -> str:
     text = ""
-    with pdfplumber.open(pdf_path) as pdf:
+    with pdfplumber.open(file_obj) as pdf:
         for page in pdf.pages:
-            text += page.extract_text() + "\n"
+            text += (page.extract_text() or "") + "\n"
     return text
 
+def extract_text_from_pdf(pdf_path: str) -> str:
+    """Extract text from a PDF resume."""
+    return _cached_extract(pdf_path, _parse_pdf)
+
 def extract_text_from_docx(docx_path: str) -> str:
     """Extract text from a DOCX resume."""
-    return docx2txt.process(docx_path)
+    return _cached_extract(docx_path, docx2txt.process)
 
 def read_text_from_file(file_path: str) -> str:
     """Read text from a file."""
@@ -0,0 +1,204 @@
+"""Background answer scoring for the interview web app.
+
+/api/answer queues each answer here and returns immediately; a worker pool
+runs `score_fn(question, answer)` and keeps one future per answer, grouped
+by session. Finished results are also written to the session store under
+score_key(session_id, index), so a worker process that did not score an
+answer (shared SQLite/Redis store) can still read it. Results are kept in
+their own records rather than in the session dict so a scorer never races
+the request handlers that rewrite the session.
+
+With a `batch_fn` and SCORING_BATCH_SIZE > 1, answers are held per session
+and scored together in one call once SCORING_BATCH_SIZE of them are queued,
+the oldest has waited SCORING_BATCH_WINDOW_SECONDS, or collect() needs them.
+Buffers are per process: with several workers behind a shared store,
+batching needs sticky sessions (all of an interview's requests reach the
+same worker). Without them, collect() batch-scores whatever the finishing
+worker does not hold, and the answers other workers still buffer are
+scored again there for nothing; set SCORING_BATCH_SIZE=1 in that setup.
+Score records are not written for interviews that have been finished.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tools.batch_scoring import SCORING_BATCH_SIZE
+from tools.session_store import SESSION_MAX_ITEMS, SessionStore
+
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "32"))
+SCORING_WAIT_SECONDS = float(os.getenv("SCORING_WAIT_SECONDS", "120"))
+SCORING_BATCH_WINDOW_SECONDS = float(os.getenv("SCORING_BATCH_WINDOW_SECONDS", "300"))
+
+
+def score_key(session_id: str, index: int) -> str:
+    return f"{session_id}#score{index}"
+
+
+class ScoringQueue:
+    def __init__(self, score_fn: Callable[[str, str], Dict], store: SessionStore,
+                 max_workers: int = SCORING_WORKERS, max_sessions: int = SESSION_MAX_ITEMS,
+                 batch_fn: Optional[Callable[[List[Tuple[str, str]]], List[Dict]]] = None,
+                 batch_size: int = SCORING_BATCH_SIZE, batch_window: float = SCORING_BATCH_WINDOW_SECONDS):
+        self.score_fn = score_fn
+        self.store = store
+        self.max_sessions = max_sessions
+        self.batch_fn = batch_fn if batch_size > 1 else None
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="answer-scoring")
+        self._lock = threading.Lock()
+        self._futures: "OrderedDict[str, Dict[int, Future]]" = OrderedDict()
+        # session -> [(index, question, answer, future, queued_at)] waiting for a batch
+        self._buffers: Dict[str, List[tuple]] = {}
+        self._discarded: "OrderedDict[str, None]" = OrderedDict()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def submit(self, session_id: str, index: int, question: str, answer: str) -> Future:
+        if self.batch_fn is None:
+            future = self._pool.submit(self._run, session_id, index, question, answer)
+        else:
+            future = Future()
+        full = False
+        with self._lock:
+            self._futures.setdefault(session_id, {})[index] = future
+            self._futures.move_to_end(session_id)
+            # Abandoned interviews never reach /api/finish; forget the oldest.
+            while len(self._futures) > self.max_sessions:
+                self._futures.popitem(last=False)
+            if self.batch_fn is not None:
+                buffer = self._buffers.setdefault(session_id, [])
+                buffer.append((index, question, answer, future, time.monotonic()))
+                full = len(buffer) >= self.batch_size
+                if self._sweeper is None:
+                    self._sweeper = threading.Thread(target=self._sweep, name="scoring-batch-window", daemon=True)
+                    self._sweeper.start()
+        if full:
+            self.flush(session_id)
+        return future
+
+    # ---------------- Batching ----------------
+    def flush(self, session_id: str):
+        """Send a session's held answers to the pool as one batch now."""
+        with self._lock:
+            entries = self._buffers.pop(session_id, [])
+        if entries:
+            self._pool.submit(self._run_batch, session_id, entries)
+
+    def _sweep(self):
+        while True:
+            time.sleep(min(1.0, self.batch_window / 4))
+            cutoff = time.monotonic() - self.batch_window
+            with self._lock:
+                expired = [sid for sid, entries in self._buffers.items() if entries[0][4] <= cutoff]
+            for session_id in expired:
+                self.flush(session_id)
+
+    def _run_batch(self, session_id: str, entries: List[tuple]):
+        try:
+            results = self.batch_fn([(question, answer) for _, question, answer, _, _ in entries])
+        except Exception as e:
+            results = [{"error": str(e)}] * len(entries)
+        self._save(session_id, {index: result for (index, _, _, _, _), result in zip(entries, results)})
+        for (_, _, _, future, _), result in zip(entries, results):
+            future.set_result(result)
+
+    def _run(self, session_id: str, index: int, question: str, answer: str) -> Dict:
+        try:
+            result = self.score_fn(question, answer)
+        except Exception as e:
+            result = {"error": str(e)}
+        self._save(session_id, {index: result})
+        return result
+
+    def _save(self, session_id: str, results: Dict[int, Dict]):
+        """Write score records, unless /api/finish (on any worker) already merged them."""
+        with self._lock:
+            if session_id in self._discarded:
+                return
+        session = self.store.get(session_id)
+        if session is None:
+            return
+        responses = session.get("responses", [])
+        for index, result in results.items():
+            if index < len(responses) and "scores" not in responses[index]:
+                self.store.put(score_key(session_id, index), result)
+
+    def _local(self, session_id: str) -> Dict[int, Future]:
+        with self._lock:
+            return dict(self._futures.get(session_id, {}))
+
+    @staticmethod
+    def _finished(future: Optional[Future]) -> Optional[Dict]:
+        """A future's result, or None if it is missing, running or cancelled by discard()."""
+        if future is None or not future.done() or future.cancelled():
+            return None
+        return future.result()
+
+    def result(self, session_id: str, index: int) -> Optional[Dict]:
+        """Finished result for one answer, or None if it is still pending."""
+        result = self._finished(self._local(session_id).get(index))
+        if result is not None:
+            return result
+        return self.store.get(score_key(session_id, index))
+
+    def status(self, session_id: str, answered: int) -> Dict:
+        results = [self.result(session_id, i) for i in range(answered)]
+        return {
+            "answered": answered,
+            "scored": sum(1 for r in results if r is not None),
+            "pending": sum(1 for r in results if r is None),
+            "failed": sum(1 for r in results if r is not None and "error" in r),
+        }
+
+    def collect(self, session_id: str, items: List[Dict], timeout: float = SCORING_WAIT_SECONDS) -> List[Dict]:
+        """Results for every answer, waiting only on the ones still outstanding.
+
+        `items` are the session's responses ({"question", "response"}); ones
+        that already carry "scores" are returned as they are. Answers
+        without a finished result (held by another worker, scored on one
+        that restarted, cancelled, or still running after `timeout`) are
+        scored inline, through batch_fn when there is one.
+        """
+        self.flush(session_id)
+        local = self._local(session_id)
+        outstanding = [f for f in local.values() if not f.done()]
+        if outstanding:
+            wait(outstanding, timeout=timeout)
+
+        results: List[Optional[Dict]] = []
+        for index, item in enumerate(items):
+            if "scores" in item:
+                results.append(item)   # merged by an earlier collect()
+                continue
+            result = self._finished(local.get(index))
+            if result is None:
+                result = self.store.get(score_key(session_id, index))
+            results.append(result)
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        pairs = [(items[i]["question"], items[i]["response"]) for i in missing]
+        if self.batch_fn is not None and len(pairs) > 1:
+            try:
+                scored = self.batch_fn(pairs)
+            except Exception as e:
+                scored = [{"error": str(e)}] * len(pairs)
+        else:
+            scored = [self._run(session_id, i, *pair) for i, pair in zip(missing, pairs)]
+        for i, result in zip(missing, scored):
+            results[i] = result
+        return results
+
+    def discard(self, session_id: str, answered: int):
+        with self._lock:
+            self._futures.pop(session_id, None)
+            entries = self._buffers.pop(session_id, [])
+            self._discarded[session_id] = None
+            while len(self._discarded) > self.max_sessions:
+                self._discarded.popitem(last=False)
+        for _, _, _, future, _ in entries:
+            future.cancel()
+        for index in range(answered):
+            self.store.delete(score_key(session_id, index))
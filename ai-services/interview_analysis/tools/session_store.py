@@ -0,0 +1,154 @@
+"""Pluggable interview session stores.
+
+The web app only needs get / put / delete on JSON-serializable session
+dicts. Three backends, chosen by SESSION_STORE:
+
+- "memory": per-process LRU with an idle TTL (bounded, no leak); fine for
+  a single worker.
+- "sqlite": one shared file (WAL mode), so every gunicorn worker on the host
+  sees the same sessions.
+- "redis": any Redis-compatible server (needs the `redis` package), for
+  several hosts.
+
+Shared backends store compact records: zlib-compressed, whitespace-free JSON.
+Every backend expires sessions SESSION_TTL_SECONDS after their last write.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Dict, Optional
+
+SESSION_STORE = os.getenv("SESSION_STORE", "memory")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "7200"))
+SESSION_MAX_ITEMS = int(os.getenv("SESSION_MAX_ITEMS", "10000"))
+SESSION_SQLITE_PATH = os.getenv("SESSION_SQLITE_PATH", "interview_sessions.db")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+def new_session_id() -> str:
+    """Collision-free id (the old second-resolution timestamp ids clashed under load)."""
+    return f"sess_{uuid.uuid4().hex}"
+
+
+def encode_session(session: Dict) -> bytes:
+    return zlib.compress(json.dumps(session, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_session(blob: bytes) -> Dict:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class SessionStore:
+    """Interface: callers must put() a session back after mutating it."""
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def put(self, session_id: str, session: Dict):
+        raise NotImplementedError
+
+    def delete(self, session_id: str):
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    def __init__(self, max_items: int = SESSION_MAX_ITEMS, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        with self._lock:
+            item = self._items.get(session_id)
+            if item is None:
+                return None
+            expires_at, session = item
+            if expires_at < time.time():
+                del self._items[session_id]
+                return None
+            self._items.move_to_end(session_id)
+            return session
+
+    def put(self, session_id: str, session: Dict):
+        with self._lock:
+            self._items[session_id] = (time.time() + self.ttl_seconds, session)
+            self._items.move_to_end(session_id)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._items.pop(session_id, None)
+
+
+class SQLiteSessionStore(SessionStore):
+    def __init__(self, path: str = SESSION_SQLITE_PATH, ttl_seconds: int = SESSION_TTL_SECONDS,
+                 purge_every: int = 200):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._writes = 0
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS sessions ("
+                         "id TEXT PRIMARY KEY, data BLOB NOT NULL, expires_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_expiry ON sessions (expires_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        row = self._conn().execute("SELECT data FROM sessions WHERE id = ? AND expires_at >= ?",
+                                   (session_id, time.time())).fetchone()
+        return decode_session(row[0]) if row else None
+
+    def put(self, session_id: str, session: Dict):
+        with self._conn() as conn:
+            conn.execute("INSERT OR REPLACE INTO sessions (id, data, expires_at) VALUES (?, ?, ?)",
+                         (session_id, encode_session(session), time.time() + self.ttl_seconds))
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                conn.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+
+    def delete(self, session_id: str):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+
+class RedisSessionStore(SessionStore):
+    def __init__(self, url: str = REDIS_URL, ttl_seconds: int = SESSION_TTL_SECONDS, prefix: str = "interview:"):
+        import redis  # optional dependency, only needed for this backend
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        blob = self.client.get(self.prefix + session_id)
+        return decode_session(blob) if blob else None
+
+    def put(self, session_id: str, session: Dict):
+        self.client.set(self.prefix + session_id, encode_session(session), ex=self.ttl_seconds)
+
+    def delete(self, session_id: str):
+        self.client.delete(self.prefix + session_id)
+
+
+def create_session_store(kind: str = SESSION_STORE) -> SessionStore:
+    if kind == "sqlite":
+        return SQLiteSessionStore()
+    if kind == "redis":
+        return RedisSessionStore()
+    return MemorySessionStore()
@@ -1,7 +1,7 @@
 import os
 import time
 from datetime import datetime
-from config.gemini_config import model, INTERVIEW_PROMPTS
+from config.gemini_config import llm, INTERVIEW_PROMPTS
 from tools.voice_processor import voice_processor
 from tools.interview_session import InterviewSession
 from tools.parser import extract_text_from_pdf, read_text_from_file
@@ -67,8 +67,7 @@ class VoiceInterviewAgent:
             Keep each question under 10 words. Make them simple and conversational.
             """
             
-            result = model.generate_content(prompt)
-            questions_text = result.text
+            questions_text = llm.generate(prompt, operation="interview.questions")
             
             # Parse questions from response
             questions = self._parse_questions(questions_text)
@@ -140,10 +139,9 @@ class VoiceInterviewAgent:
             
             if response:
                 print(f"Response received: {response}")
-                # Score the response
-                scores = self.session.score_response(question, response)
-                if scores:
-                    print(f"Scores: {scores}")
+                # Score the response (batched, see SCORING_BATCH_SIZE)
+                for scored in self.session.queue_score(question, response):
+                    print(f"Scores: {scored['scores']}")
             else:
                 print(f"No response received for question {i+1}")
             
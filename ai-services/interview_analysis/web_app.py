@@ -1,15 +1,20 @@
 import os
 import json
+import threading
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 from flask import Flask, request, jsonify, render_template_string
 from flask_cors import CORS
 from dotenv import load_dotenv
 
-from config.gemini_config import model, INTERVIEW_PROMPTS
-from tools.parser import read_text_from_file, extract_text_from_pdf
+from config.gemini_config import llm, INTERVIEW_PROMPTS
+from tools.asset_registry import AssetRegistry, DEFAULT_PAIR
 from tools.save_data import save_candidate_data
+from tools.batch_scoring import parse_scores, score_batch
+from tools.deep_prefetch import DeepFollowupPrefetcher
+from tools.scoring_queue import ScoringQueue
+from tools.session_store import create_session_store, new_session_id
 
 # Optional MongoDB
 try:
@@ -24,16 +29,16 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}}, supports_credentials=True)
 
-# In-memory session store (simple for single-user dev use)
-SESSIONS: Dict[str, Dict] = {}
+# Interview sessions: in-memory LRU+TTL by default, SQLite/Redis to share
+# them across workers and hosts (SESSION_STORE, see tools/session_store.py).
+# Handlers must SESSIONS.put() a session back after changing it.
+SESSIONS = create_session_store()
 
-
-def _extract_candidate_name(resume_text: str) -> str:
-    lines = [ln.strip() for ln in resume_text.split('\n') if ln.strip()]
-    for line in lines[:10]:
-        if 2 < len(line) < 60 and 1 <= len(line.split()) <= 4:
-            return line
-    return "Candidate"
+# JD/resume pairs are parsed once and re-parsed only when the files change
+# (INTERVIEW_ASSET_PAIRS, see tools/asset_registry.py). Warm them in the
+# background so the first /api/start does not pay for the PDF parse.
+ASSETS = AssetRegistry()
+threading.Thread(target=ASSETS.preload, name="asset-preload", daemon=True).start()
 
 
 FIXED_INITIAL_QUESTIONS = [
@@ -154,8 +159,7 @@ def _generate_deep_followups(job_description: str, responses: List[Dict]) -> Lis
         - Target concrete topics (e.g., Assembly on x86/ARM, SIMD (SSE/AVX/Neon), debugging with GDB/WinDbg, firmware/UEFI, Docker, Java, C/C++, Python) as applicable
         - Do NOT include any explanations, ONLY the questions
         """
-        result = model.generate_content(prompt)
-        text = (result.text or "").strip()
+        text = (llm.generate(prompt, operation="interview.questions") or "").strip()
         qs = []
         for line in text.split('\n'):
             s = line.strip()
@@ -178,6 +182,35 @@ def _generate_deep_followups(job_description: str, responses: List[Dict]) -> Lis
     ][:5]
 
 
+def _score_answer(question: str, answer_text: str) -> Dict:
+    """Score one answer with Gemini (runs on the SCORING pool)."""
+    try:
+        scoring_prompt = INTERVIEW_PROMPTS["scoring_prompt"].format(
+            response=answer_text,
+            question=question
+        )
+        score_text = (llm.generate(scoring_prompt, operation="interview.score") or "").strip()
+    except Exception as e:
+        score_text = f"Scoring error: {e}"
+
+    # naive score extraction (keep compatible with existing logic expectation)
+    scores = parse_scores(score_text)
+    return {"score_text": score_text, "scores": scores}
+
+
+def _score_answers(items: List[Tuple[str, str]]) -> List[Dict]:
+    """Score several (question, answer) pairs in one JSON request, per-answer fallback."""
+    return score_batch(llm, items, _score_answer)
+
+
+# Answers are scored in the background, SCORING_BATCH_SIZE per LLM call;
+# /api/finish waits for stragglers.
+SCORING = ScoringQueue(_score_answer, SESSIONS, batch_fn=_score_answers)
+
+# Deep follow-ups are generated speculatively while the initial phase runs.
+PREFETCH = DeepFollowupPrefetcher(_generate_deep_followups, SESSIONS, len(FIXED_INITIAL_QUESTIONS))
+
+
 @app.route("/")
 def index():
     # Minimal single-file UI using Web Speech API for TTS/STT
@@ -191,30 +224,43 @@ def api_test():
     return jsonify({"ok": True, "service": "interview"})
 
 
+@app.get("/api/llm/stats")
+def api_llm_stats():
+    # Call counts, retries, timeouts and per-operation latency histograms
+    return jsonify(llm.stats())
+
+
+@app.get("/api/prefetch/stats")
+def api_prefetch_stats():
+    # Deep follow-up prefetch outcomes and phase handoff latency
+    return jsonify(PREFETCH.stats())
+
+
+@app.get("/api/assets")
+def api_assets():
+    # Configured JD/resume pairs and parse/cache counters
+    return jsonify({"ok": True, "pairs": sorted(ASSETS.pairs), "stats": dict(ASSETS.stats)})
+
+
 @app.post("/api/start")
 @app.post("/api/interview/start")
 def api_start():
     data = request.get_json(force=True, silent=True) or {}
-    session_id = data.get("session_id") or f"sess_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-
-    # Load assets
-    try:
-        job_description = read_text_from_file("assets/job_description.txt")
-    except Exception:
-        job_description = ""
-
-    try:
-        resume_text = extract_text_from_pdf("assets/CV-English.pdf")
-    except Exception:
-        resume_text = ""
+    session_id = data.get("session_id") or new_session_id()
 
-    candidate_name = _extract_candidate_name(resume_text) if resume_text else "Interview Candidate"
+    # Load assets (cached, see ASSETS)
+    pair = data.get("asset_pair") or DEFAULT_PAIR
+    if pair not in ASSETS.pairs:
+        return jsonify({"ok": False, "error": f"Unknown asset pair: {pair}"}), 400
+    assets = ASSETS.get(pair)
+    job_description = assets.job_description
+    candidate_name = assets.candidate_name
 
     # Phase 1: Fixed initial questions
     questions = FIXED_INITIAL_QUESTIONS.copy()
 
     # Initialize session
-    SESSIONS[session_id] = {
+    SESSIONS.put(session_id, {
         "candidate_name": candidate_name,
         "job_description": job_description,
         "questions": questions,
@@ -224,7 +270,8 @@ def api_start():
         "started_at": datetime.now().isoformat(),
         "phase": "initial",
         "deep_questions": [],
-    }
+        "asset_pair": pair,
+    })
 
     return jsonify({
         "ok": True,
@@ -250,11 +297,12 @@ def api_next():
     # If finished current phase's questions
     if idx >= len(qs):
         if phase == "initial":
-            # Generate deep follow-ups using Gemini and prior answers
-            deep_qs = _generate_deep_followups(sess.get("job_description", ""), sess.get("responses", []))
+            # Deep follow-ups from Gemini and prior answers, usually prefetched already
+            deep_qs = PREFETCH.take(session_id, sess.get("job_description", ""), sess.get("responses", []))
             sess["questions"] = deep_qs
             sess["q_index"] = 0
             sess["phase"] = "deep"
+            SESSIONS.put(session_id, sess)
 
             # Serve first deep question
             if deep_qs:
@@ -284,48 +332,34 @@ def api_answer():
         return jsonify({"ok": False, "error": "Interview already completed"}), 400
 
     question = sess["questions"][idx]
+    index = len(sess["responses"])
 
-    # Score with Gemini
-    try:
-        scoring_prompt = INTERVIEW_PROMPTS["scoring_prompt"].format(
-            response=answer_text,
-            question=question
-        )
-        result = model.generate_content(scoring_prompt)
-        score_text = (result.text or "").strip()
-    except Exception as e:
-        score_text = f"Scoring error: {e}"
-
-    # naive score extraction (keep compatible with existing logic expectation)
-    import re
-    numbers = re.findall(r"\b(\d+)\b", score_text)
-    scores = {
-        "technical_knowledge": 5,
-        "communication_skills": 5,
-        "problem_solving": 5,
-        "experience_relevance": 5,
-        "confidence": 5,
-    }
-    if len(numbers) >= 5:
-        scores = {
-            "technical_knowledge": min(10, max(0, int(numbers[0]))),
-            "communication_skills": min(10, max(0, int(numbers[1]))),
-            "problem_solving": min(10, max(0, int(numbers[2]))),
-            "experience_relevance": min(10, max(0, int(numbers[3]))),
-            "confidence": min(10, max(0, int(numbers[4]))),
-        }
-
-    # persist in session
+    # persist in session; the score arrives later from the scoring pool
     sess["responses"].append({
         "question": question,
         "response": answer_text,
-        "score_text": score_text,
-        "scores": scores,
         "timestamp": datetime.now().isoformat(),
     })
     sess["q_index"] += 1
+    SESSIONS.put(session_id, sess)
+    SCORING.submit(session_id, index, question, answer_text)
+    if sess.get("phase", "initial") == "initial":
+        PREFETCH.update(session_id, sess.get("job_description", ""), sess["responses"])
+
+    return jsonify({"ok": True, "queued": True, "index": index})
+
+
+@app.post("/api/status")
+@app.post("/api/interview/status")
+def api_status():
+    data = request.get_json(force=True)
+    session_id = data.get("session_id")
+    sess = SESSIONS.get(session_id)
+    if not sess:
+        return jsonify({"ok": False, "error": "Invalid session"}), 400
 
-    return jsonify({"ok": True, "scores": scores, "score_text": score_text})
+    status = SCORING.status(session_id, len(sess["responses"]))
+    return jsonify({"ok": True, "phase": sess.get("phase", "initial"), "q_index": sess["q_index"], **status})
 
 
 @app.post("/api/finish")
@@ -337,6 +371,15 @@ def api_finish():
     if not sess:
         return jsonify({"ok": False, "error": "Invalid session"}), 400
 
+    # Wait only for answers whose scores are still outstanding
+    results = SCORING.collect(session_id, sess["responses"])
+    for qa, result in zip(sess["responses"], results):
+        qa["score_text"] = result.get("score_text") or f"Scoring error: {result.get('error', 'unknown')}"
+        qa["scores"] = result.get("scores", {})
+    SESSIONS.put(session_id, sess)
+    SCORING.discard(session_id, len(sess["responses"]))
+    PREFETCH.discard(session_id)
+
     # Build interview summary
     summary_lines = [
         f"Interview with {sess['candidate_name']}",
@@ -354,8 +397,7 @@ def api_finish():
         final_prompt = INTERVIEW_PROMPTS["final_evaluation"].format(
             interview_summary=interview_summary
         )
-        result = model.generate_content(final_prompt)
-        evaluation_text = (result.text or "").strip()
+        evaluation_text = (llm.generate(final_prompt, operation="interview.final") or "").strip()
     except Exception as e:
         evaluation_text = f"Evaluation error: {e}"
 
@@ -0,0 +1,109 @@
+# filename: contact_info.py
+# Fast contact-info extraction: compiled regexes first, then a tokenizer-only
+# spaCy pass (no tagger/parser/NER) for emails the regex misses.
+import re, threading
+from text_extraction import to_ascii
+
+# ---------------- Compiled Patterns ----------------
+EMAIL_RE = re.compile(r"([a-zA-Z0-9_.+\-]+@[a-zA-Z0-9\-]+\.[a-zA-Z0-9.\-]+)", re.IGNORECASE)
+PLACEHOLDER_EMAIL_RE = re.compile(r"(example\.com|test\.com|email\.com)")
+EMAIL_CLEAN_RE = re.compile(r"[^a-zA-Z0-9@._+-]")
+OBFUSCATION_RE = re.compile(r"\[at\]|\(at\)|\[dot\]|\(dot\)")
+OBFUSCATION_MAP = {"[at]": "@", "(at)": "@", "[dot]": ".", "(dot)": "."}
+WHITESPACE_RE = re.compile(r"\s+")
+# Digit groups joined by at most one separator (" ", ".", "-" or parentheses),
+# so "2015 - 2018" style ranges break into separate short runs.
+PHONE_RE = re.compile(r"(?<![\w@+])(\+?(?:\(\d+\)|\d+)(?:[ .-]?\(\d+\)|(?:[ .-]|(?<=\)))\d+){0,5})(?![\w@])")
+DIGIT_GROUP_RE = re.compile(r"\d+")
+YEAR_RE = re.compile(r"(?:19|20)\d\d")
+# 2-4 title-cased (or all-caps) words: "Jane Doe", "Mary-Jane O'Neil", "J. R. Smith", "JANE DOE".
+NAME_WORD = r"(?:[A-Z][a-z]*(?:['\-][A-Z]?[a-z]+)*|[A-Z]\.?|[A-Z]{2,}(?:['\-][A-Z]+)*)"
+NAME_LINE_RE = re.compile(rf"^{NAME_WORD}(?: {NAME_WORD}){{1,3}}$")
+NAME_TOKEN_RE = re.compile(r"[a-z]{3,}")
+# Section headings and job-title words that also come as short capitalized lines.
+NAME_STOPWORDS = set("""
+    resume curriculum vitae cv profile summary contact objective experience education skills
+    projects references personal details information career professional work employment history
+    certifications languages achievements interests hobbies declaration address phone email
+    engineer engineering developer development manager management analyst consultant designer
+    architect administrator specialist intern trainee lead senior junior principal head director
+    officer executive assistant associate coordinator scientist programmer tester accountant
+    software data web full stack frontend backend devops cloud product project business sales
+    marketing human resources hr finance operations technical technology support
+""".split())
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+def get_tokenizer():
+    # spacy.blank only builds the rule-based tokenizer; no model weights are loaded.
+    # spaCy itself is imported here so it stays off the service's import path.
+    global _tokenizer
+    with _tokenizer_lock:
+        if _tokenizer is None:
+            import spacy
+            _tokenizer = spacy.blank("en")
+        return _tokenizer
+
+# ---------------- Extractors ----------------
+def normalize_for_email(text):
+    text = text.replace("\n", " ").replace("\r", " ")
+    text = OBFUSCATION_RE.sub(lambda m: OBFUSCATION_MAP[m.group(0)], text.lower())
+    return to_ascii(WHITESPACE_RE.sub(" ", text))
+
+def find_email(normalized):
+    for match in EMAIL_RE.finditer(normalized):
+        clean = match.group(1).strip().replace(" ", "").replace("|", "")
+        if "@" in clean and not PLACEHOLDER_EMAIL_RE.search(clean):
+            return clean
+
+    for token in get_tokenizer().tokenizer(normalized):
+        if token.like_email:
+            email = EMAIL_CLEAN_RE.sub("", token.text.strip())
+            if "@" in email and "." in email.split("@")[-1] and not PLACEHOLDER_EMAIL_RE.search(email):
+                return email
+    return None
+
+def find_phone(text):
+    for match in PHONE_RE.finditer(text):
+        candidate = match.group(1).strip()
+        groups = DIGIT_GROUP_RE.findall(candidate)
+        if not 10 <= sum(len(g) for g in groups) <= 15:
+            continue
+        if any(len(g) < 2 for g in groups[1:]):
+            continue  # version numbers and the like; only a country code may be one digit
+        if len(groups) > 1 and all(YEAR_RE.fullmatch(g) for g in groups):
+            continue  # "2015 2018 2019": a run of years
+        return WHITESPACE_RE.sub(" ", candidate)
+    return None
+
+def find_name(text, email=None, filename=None):
+    """Candidate name from the resume header, or None unless it is a confident match.
+
+    A name-shaped line counts when it is the first non-empty line, or when
+    one of its words also appears in the email address or the filename
+    (a name two lines below "Curriculum Vitae" with jane.doe@... as email).
+    """
+    hints = set(NAME_TOKEN_RE.findall(f"{email or ''} {filename or ''}".lower()))
+    lines = [WHITESPACE_RE.sub(" ", line).strip() for line in text.splitlines()]
+    lines = [line for line in lines if line][:5]
+    for position, line in enumerate(lines):
+        if not NAME_LINE_RE.match(line):
+            continue
+        words = [word.lower().strip(".") for word in line.split()]
+        if any(word in NAME_STOPWORDS for word in words):
+            continue
+        if position == 0 or hints & set(words):
+            return line.title() if line.isupper() else line
+    return None
+
+def extract_contact_info(text, filename=None):
+    """Return {"email", "phone", "name"} for a resume (None where not found)."""
+    if not text:
+        return {"email": None, "phone": None, "name": None}
+    email = find_email(normalize_for_email(text))
+    return {
+        "email": email,
+        "phone": find_phone(text),
+        "name": find_name(text, email, filename),
+    }
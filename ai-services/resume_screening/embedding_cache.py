@@ -0,0 +1,135 @@
+# filename: embedding_cache.py
+# Content-addressed cache of sentence embeddings.
+#
+# Vectors live in an append-only float32 file that is memory-mapped for
+# reads; a sidecar text file maps "<sha256 key> <row>" so other processes
+# sharing the directory pick up new rows. A small LRU tier sits on top.
+import hashlib, os, threading
+from collections import OrderedDict
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on the in-process lock only
+    fcntl = None
+
+def normalize_text(text):
+    return " ".join((text or "").split())
+
+def cache_key(text, model_name):
+    payload = f"{model_name}\n{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+class EmbeddingCache:
+    def __init__(self, cache_dir, model_name, dim, memory_items=10000):
+        self.model_name = model_name
+        self.dim = dim
+        self.row_bytes = dim * 4
+        self.memory_items = memory_items
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        base = os.path.join(cache_dir, model_name.replace("/", "_"))
+        self.vectors_path = base + ".f32"
+        self.keys_path = base + ".keys"
+        self.lock_path = base + ".lock"
+        for path in (self.vectors_path, self.keys_path):
+            open(path, "ab").close()
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._index = {}
+        self._keys_offset = 0
+        self._mmap = None
+        self._mapped_rows = 0
+
+    # ---------------- Disk Tier ----------------
+    def _refresh_index(self):
+        """Read key lines appended (by any process) since the last refresh."""
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1
+        for line in chunk[:end].decode("ascii").splitlines():
+            key, _, row = line.partition(" ")
+            if row:
+                self._index[key] = int(row)
+        self._keys_offset += end
+
+    def _read_row(self, row):
+        if row >= self._mapped_rows:
+            rows = os.path.getsize(self.vectors_path) // self.row_bytes
+            if row >= rows:
+                return None
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+            self._mapped_rows = rows
+        return np.array(self._mmap[row])
+
+    def _append(self, keys, vectors):
+        lock_file = open(self.lock_path, "ab")
+        try:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            first_row = os.path.getsize(self.vectors_path) // self.row_bytes
+            with open(self.vectors_path, "r+b") as f:
+                f.seek(first_row * self.row_bytes)
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            with open(self.keys_path, "ab") as f:
+                lines = "".join(f"{key} {first_row + i}\n" for i, key in enumerate(keys))
+                f.write(lines.encode("ascii"))
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    # ---------------- Memory Tier ----------------
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # ---------------- Public API ----------------
+    def get_many(self, texts):
+        """Return a cached vector (or None) for each text."""
+        keys = [cache_key(t, self.model_name) for t in texts]
+        vectors = []
+        with self._lock:
+            refreshed = False
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is None:
+                    if key not in self._index and not refreshed:
+                        self._refresh_index()
+                        refreshed = True
+                    row = self._index.get(key)
+                    if row is not None:
+                        vector = self._read_row(row)
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._remember(key, vector)
+                vectors.append(vector)
+        return vectors
+
+    def put_many(self, texts, vectors):
+        keys, rows, seen = [], [], set()
+        for text, vector in zip(texts, vectors):
+            key = cache_key(text, self.model_name)
+            if key in seen:
+                continue
+            seen.add(key)
+            keys.append(key)
+            rows.append(np.asarray(vector, dtype=np.float32))
+        if not keys:
+            return
+        with self._lock:
+            self._append(keys, np.vstack(rows))
+            for key, vector in zip(keys, rows):
+                self._remember(key, vector)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "memory_items": len(self._memory)}
@@ -0,0 +1,169 @@
+# filename: mail_outbox.py
+# Background outbox for shortlist emails.
+#
+# Screening only enqueues messages; one daemon thread delivers them over a
+# single authenticated SMTP connection that stays open while the queue has
+# work (so a batch shares one TLS handshake + login), reconnecting and
+# retrying with exponential backoff when the server drops or errors. Plain
+# SMTP connections are upgraded with STARTTLS before any login.
+import queue, smtplib, ssl, threading, time, uuid
+from collections import OrderedDict
+from email.message import EmailMessage
+from text_extraction import to_ascii
+
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPAuthenticationError,
+                    smtplib.SMTPNotSupportedError)
+
+class ShortlistOutbox:
+    def __init__(self, host, port, username=None, password=None, use_ssl=True, use_starttls=True,
+                 max_retries=3, backoff=1.0, idle_timeout=2.0, keep_batches=1000):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.use_starttls = use_starttls
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.idle_timeout = idle_timeout
+        self.keep_batches = keep_batches
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = OrderedDict()
+        self._worker = None
+        self._server = None
+        self.connections_opened = 0
+
+    # ---------------- Batches ----------------
+    def start_batch(self):
+        batch_id = uuid.uuid4().hex
+        with self._lock:
+            self._batches[batch_id] = {"closed": False, "recipients": []}
+            while len(self._batches) > self.keep_batches:
+                self._batches.popitem(last=False)
+        return batch_id
+
+    def close_batch(self, batch_id):
+        with self._lock:
+            if batch_id in self._batches:
+                self._batches[batch_id]["closed"] = True
+
+    def enqueue(self, batch_id, msg):
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return
+            entry = {"to": msg["To"], "status": "queued", "attempts": 0, "error": None}
+            batch["recipients"].append(entry)
+        self._queue.put((entry, msg))
+        self._ensure_worker()
+
+    def batch_status(self, batch_id):
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return None
+            recipients = [dict(entry) for entry in batch["recipients"]]
+            closed = batch["closed"]
+        counts = {"queued": 0, "sent": 0, "failed": 0}
+        for entry in recipients:
+            counts[entry["status"]] += 1
+        done = closed and counts["queued"] == 0
+        return {"batch_id": batch_id, "done": done, **counts, "recipients": recipients}
+
+    def wait_idle(self, timeout=None):
+        """Block until every queued message has been attempted; False if `timeout` runs out first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    # ---------------- Delivery ----------------
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="shortlist-outbox", daemon=True)
+                self._worker.start()
+
+    def _connect(self):
+        if self.use_ssl:
+            server = smtplib.SMTP_SSL(self.host, self.port, timeout=30)
+        else:
+            server = smtplib.SMTP(self.host, self.port, timeout=30)
+        login = bool(self.username and self.password)
+        if not self.use_ssl and self.use_starttls:
+            # Never send credentials in the clear: a server that cannot
+            # STARTTLS fails here (permanently) when we are about to log in.
+            server.ehlo_or_helo_if_needed()
+            if login or server.has_extn("starttls"):
+                server.starttls(context=ssl.create_default_context())
+        if login:
+            server.login(self.username, self.password)
+        self.connections_opened += 1
+        return server
+
+    def _disconnect(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+    def _update(self, entry, **fields):
+        with self._lock:
+            entry.update(fields)
+
+    def _deliver(self, entry, msg):
+        error = None
+        for attempt in range(self.max_retries + 1):
+            self._update(entry, attempts=attempt + 1)
+            try:
+                if self._server is None:
+                    self._server = self._connect()
+                self._server.send_message(msg)
+                self._update(entry, status="sent", error=None)
+                print(f"Email sent to {entry['to']}")
+                return
+            except PERMANENT_ERRORS as e:
+                error = str(e)
+                break
+            except Exception as e:
+                error = str(e)
+                self._disconnect()
+                if attempt < self.max_retries:
+                    time.sleep(self.backoff * (2 ** attempt))
+        self._update(entry, status="failed", error=error)
+        print(f"Failed to send email to {entry['to']}: {error}")
+
+    def _run(self):
+        while True:
+            try:
+                entry, msg = self._queue.get(timeout=self.idle_timeout)
+            except queue.Empty:
+                # Queue drained: release the connection until the next batch.
+                self._disconnect()
+                continue
+            try:
+                self._deliver(entry, msg)
+            finally:
+                self._queue.task_done()
+
+def build_shortlist_message(sender, to_email, name):
+    msg = EmailMessage()
+    msg["From"] = to_ascii(sender)
+    msg["To"] = to_ascii(to_email)
+    msg["Subject"] = to_ascii("Shortlisted for Next Round!")
+    msg.set_content(to_ascii(f"""
+Hi {to_ascii(name)},
+
+Congratulations! You have been shortlisted for the next round of our recruitment process.
+Our HR team will reach out to you soon with further details.
+
+Regards,
+HR Team
+"""))
+    return msg
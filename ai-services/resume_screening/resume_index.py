@@ -0,0 +1,298 @@
+# filename: resume_index.py
+# Persistent approximate-nearest-neighbour index over screened resumes.
+#
+# Vectors are L2-normalized and appended to a float32 file; candidate
+# metadata is appended to a JSON-lines file, which is compacted to one line
+# per resume once re-screens have more than doubled it. Search uses an IVF index
+# (k-means centroids + inverted lists, probing the `nprobe` closest lists)
+# once the pool is large enough, and an exact matrix product below that
+# (brute force is already a few ms for tens of thousands of resumes).
+# The IVF is retrained in a background thread whenever the pool has doubled
+# since the last training; new rows are assigned to the nearest centroid.
+import json, os, threading, time
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on the in-process lock only
+    fcntl = None
+
+class ResumeIndex:
+    def __init__(self, index_dir, dim, nprobe=16, min_ivf_rows=50000, kmeans_iters=8, kmeans_sample=50000):
+        self.dim = dim
+        self.row_bytes = dim * 4
+        self.nprobe = nprobe
+        self.min_ivf_rows = min_ivf_rows
+        self.kmeans_iters = kmeans_iters
+        self.kmeans_sample = kmeans_sample
+
+        os.makedirs(index_dir, exist_ok=True)
+        self.vectors_path = os.path.join(index_dir, "vectors.f32")
+        self.meta_path = os.path.join(index_dir, "meta.jsonl")
+        self.ivf_path = os.path.join(index_dir, "ivf.npz")
+        self.lock_path = os.path.join(index_dir, "index.lock")
+
+        self._lock = threading.Lock()
+        self._training = False
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._meta = []
+        self._rows_by_key = {}
+        self._meta_inode = None
+        self._meta_offset = 0
+        self._meta_lines = 0
+        self._centroids = None
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._trained_rows = 0
+        self._lists = None
+        self._load()
+
+    # ---------------- Persistence ----------------
+    # Several worker processes may share index_dir. Appends happen under an
+    # flock on index.lock; row numbers come from the size of vectors.f32
+    # under that lock, and each process reads back whatever the others
+    # appended before it writes.
+    @contextmanager
+    def _file_lock(self):
+        lock_file = open(self.lock_path, "ab")
+        try:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def _load(self):
+        with self._lock, self._file_lock():
+            self._sync()
+        if os.path.exists(self.ivf_path):
+            ivf = np.load(self.ivf_path)
+            self._centroids = ivf["centroids"]
+            self._trained_rows = int(ivf["trained_rows"])
+            self._assign = np.zeros(self._size, dtype=np.int32)
+            if self._size:
+                self._assign[:] = self._nearest_centroid(self._vectors[: self._size])
+
+    def _disk_rows(self):
+        try:
+            return os.path.getsize(self.vectors_path) // self.row_bytes
+        except OSError:
+            return 0
+
+    def _stale(self):
+        """Whether another process has appended rows, appended metadata or compacted meta.jsonl."""
+        if self._disk_rows() > self._size:
+            return True
+        try:
+            st = os.stat(self.meta_path)
+        except OSError:
+            return False
+        return st.st_ino != self._meta_inode or st.st_size != self._meta_offset
+
+    def _sync(self):
+        """Read rows and metadata appended by other processes (caller holds both locks)."""
+        rows = self._disk_rows()
+        if rows > self._size:
+            with open(self.vectors_path, "rb") as f:
+                f.seek(self._size * self.row_bytes)
+                data = f.read((rows - self._size) * self.row_bytes)
+            block = np.frombuffer(data, dtype=np.float32).reshape(-1, self.dim)
+            self._meta.extend([None] * len(block))
+            self._append_rows(block)
+
+        try:
+            st = os.stat(self.meta_path)
+        except OSError:
+            return
+        if st.st_ino != self._meta_inode or st.st_size < self._meta_offset:
+            # First read, or another process compacted the file.
+            self._meta_inode, self._meta_offset, self._meta_lines = st.st_ino, 0, 0
+        if st.st_size == self._meta_offset:
+            return
+        with open(self.meta_path, "rb") as f:
+            f.seek(self._meta_offset)
+            data = f.read()
+        self._meta_offset += len(data)
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn line after a crash
+            self._meta_lines += 1
+            row = record.get("row", -1)
+            if 0 <= row < self._size:
+                self._meta[row] = record
+                self._rows_by_key[record["key"]] = row
+
+    def _compact_meta(self):
+        """Rewrite meta.jsonl with one line per row (caller holds both locks)."""
+        tmp_path = self.meta_path + ".tmp"
+        records = [record for record in self._meta[: self._size] if record is not None]
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(record) + "\n" for record in records)
+        os.replace(tmp_path, self.meta_path)
+        st = os.stat(self.meta_path)
+        self._meta_inode, self._meta_offset, self._meta_lines = st.st_ino, st.st_size, len(records)
+
+    def _save_ivf(self, centroids, trained_rows):
+        tmp_path = self.ivf_path + ".tmp.npz"
+        np.savez(tmp_path, centroids=centroids, trained_rows=trained_rows)
+        os.replace(tmp_path, self.ivf_path)
+
+    # ---------------- Insertion ----------------
+    def add_many(self, keys, vectors, metas):
+        """Insert (or refresh the metadata of) resumes keyed by content hash."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+
+        with self._lock, self._file_lock():
+            self._sync()
+            new_rows, lines = [], []
+            for key, vector, meta in zip(keys, vectors, metas):
+                row = self._rows_by_key.get(key)
+                if row is None:
+                    row = self._size + len(new_rows)
+                    self._rows_by_key[key] = row
+                    new_rows.append(vector)
+                    self._meta.append(None)
+                else:
+                    current = self._meta[row] or {}
+                    if all(current.get(name) == value for name, value in meta.items()):
+                        continue  # re-screened with nothing new to record
+                record = {**meta, "key": key, "row": row, "indexed_at": time.time()}
+                self._meta[row] = record
+                lines.append(json.dumps(record) + "\n")
+
+            if new_rows:
+                block = np.vstack(new_rows)
+                # Rows start at the last whole row, overwriting any torn tail a crashed writer left.
+                mode = "r+b" if os.path.exists(self.vectors_path) else "wb"
+                with open(self.vectors_path, mode) as f:
+                    f.seek(self._size * self.row_bytes)
+                    f.write(block.tobytes())
+                    f.truncate()
+                self._append_rows(block)
+            if lines:
+                with open(self.meta_path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+                self._meta_lines += len(lines)
+                self._meta_offset = os.path.getsize(self.meta_path)
+                if self._meta_inode is None:
+                    self._meta_inode = os.stat(self.meta_path).st_ino
+            if self._meta_lines > 2 * self._size + 1000:
+                self._compact_meta()
+            needs_training = self._size >= self.min_ivf_rows and self._size >= 2 * self._trained_rows
+
+        if needs_training:
+            self._train_async()
+
+    def _append_rows(self, block):
+        needed = self._size + len(block)
+        if needed > len(self._vectors):
+            grown = np.zeros((max(needed, 2 * len(self._vectors), 1024), self.dim), dtype=np.float32)
+            grown[: self._size] = self._vectors[: self._size]
+            self._vectors = grown
+        self._vectors[self._size: needed] = block
+        if self._centroids is not None:
+            self._assign = np.concatenate([self._assign, self._nearest_centroid(block)])
+            self._lists = None
+        self._size = needed
+
+    # ---------------- IVF Training ----------------
+    def _nearest_centroid(self, vectors):
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+
+    def _train_async(self):
+        with self._lock:
+            if self._training:
+                return
+            self._training = True
+        threading.Thread(target=self._train, name="resume-index-train", daemon=True).start()
+
+    def _train(self):
+        try:
+            with self._lock:
+                rows = self._size
+                data = self._vectors[:rows].copy()
+            nlist = max(1, int(2 * np.sqrt(rows)))
+            rng = np.random.default_rng(0)
+            sample = data[rng.choice(rows, size=min(rows, self.kmeans_sample), replace=False)]
+            centroids = sample[rng.choice(len(sample), size=min(nlist, len(sample)), replace=False)].copy()
+            for _ in range(self.kmeans_iters):
+                assign = np.argmax(sample @ centroids.T, axis=1)
+                counts = np.bincount(assign, minlength=len(centroids))
+                order = np.argsort(assign, kind="stable")
+                starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+                sums = np.zeros_like(centroids)
+                filled = counts > 0
+                sums[filled] = np.add.reduceat(sample[order], starts[filled], axis=0)
+                sums[filled] /= counts[filled, None]
+                norms = np.linalg.norm(sums, axis=1, keepdims=True)
+                norms[norms == 0] = 1.0
+                centroids = np.where(filled[:, None], sums / norms, centroids)
+
+            with self._lock:
+                self._centroids = centroids.astype(np.float32)
+                self._assign = self._nearest_centroid(self._vectors[: self._size])
+                self._lists = None
+                self._trained_rows = rows
+                self._save_ivf(self._centroids, rows)
+            print(f"Resume index: trained {len(centroids)} IVF lists on {rows} resumes")
+        finally:
+            with self._lock:
+                self._training = False
+                # Rows added while training may already warrant another pass.
+                retrain = self._size >= 2 * self._trained_rows
+        if retrain:
+            self._train_async()
+
+    def _inverted_lists(self):
+        if self._lists is None:
+            order = np.argsort(self._assign, kind="stable")
+            bounds = np.searchsorted(self._assign[order], np.arange(len(self._centroids) + 1))
+            self._lists = (order, bounds)
+        return self._lists
+
+    # ---------------- Search ----------------
+    def search(self, query, k=10, nprobe=None):
+        """Return [(score, metadata)] for the k resumes most similar to query."""
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        query = query / (np.linalg.norm(query) or 1.0)
+        nprobe = nprobe or self.nprobe
+        if self._stale():
+            with self._lock, self._file_lock():
+                self._sync()
+
+        with self._lock:
+            if self._size == 0:
+                return []
+            if self._centroids is None or self._size < self.min_ivf_rows:
+                candidates = None
+                scores = self._vectors[: self._size] @ query
+            else:
+                order, bounds = self._inverted_lists()
+                probe = np.argsort(-(self._centroids @ query))[:nprobe]
+                candidates = np.concatenate([order[bounds[c]: bounds[c + 1]] for c in probe])
+                scores = self._vectors[candidates] @ query
+
+            k = min(k, len(scores))
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            rows = top if candidates is None else candidates[top]
+            return [(float(scores[i]), self._meta[row]) for i, row in zip(top, rows) if self._meta[row] is not None]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "resumes": self._size,
+                "ivf_lists": 0 if self._centroids is None else len(self._centroids),
+                "trained_rows": self._trained_rows,
+                "training": self._training,
+            }
@@ -1,123 +1,299 @@
 # filename: resume_screening_flask.py
-from flask import Flask, request, render_template, jsonify
-import os, re, smtplib, unicodedata
-from pdfminer.high_level import extract_text as pdf_extract_text
-import docx2txt
-from email.message import EmailMessage
-from sentence_transformers import SentenceTransformer, util
+import time
+_IMPORT_START = time.perf_counter()
+
+from flask import Flask, Response, request, render_template, jsonify, stream_with_context
+import argparse, json, os, threading
 from dotenv import load_dotenv
-import spacy
+import numpy as np
 from flask_cors import CORS
+from text_extraction import to_ascii, iter_extracted, get_pool
+from embedding_cache import EmbeddingCache, cache_key
+from resume_index import ResumeIndex
+from contact_info import extract_contact_info, get_tokenizer
+from screening_jobs import ScreeningJobQueue
+from mail_outbox import ShortlistOutbox, build_shortlist_message
 
 # ---------------- Load Environment Variables ----------------
 load_dotenv()
 SENDER_EMAIL = os.getenv("SENDER_EMAIL")
 APP_PASSWORD = os.getenv("APP_PASSWORD")
-
-# ---------------- Initialize Flask + NLP + Model ----------------
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_SSL = os.getenv("SMTP_SSL", "true").lower() != "false"
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() != "false"
+SMTP_MAX_RETRIES = int(os.getenv("SMTP_MAX_RETRIES", "3"))
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+EMBED_CACHE_DIR = os.getenv("EMBED_CACHE_DIR", "embedding_cache")
+EMBED_CACHE_ITEMS = int(os.getenv("EMBED_CACHE_ITEMS", "10000"))
+RESUME_INDEX_DIR = os.getenv("RESUME_INDEX_DIR", "resume_index")
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "screening_jobs.db")
+SCREEN_JOB_WORKERS = int(os.getenv("SCREEN_JOB_WORKERS", "1"))
+SCREEN_JOB_LEASE_SECONDS = int(os.getenv("SCREEN_JOB_LEASE_SECONDS", "120"))
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "true").lower() == "true"
+MODEL_NAME = "all-MiniLM-L6-v2"
+MODEL_DIM = 384  # all-MiniLM-L6-v2; lets the embedding cache open before the model loads
+
+# ---------------- Initialize Flask + Model ----------------
 app = Flask(__name__)
 CORS(app, origins=["https://fwc-ai-hrms-new.vercel.app"])  # Allow only your frontend origin
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
-nlp = spacy.load("en_core_web_sm")
+embedding_cache = EmbeddingCache(EMBED_CACHE_DIR, MODEL_NAME, MODEL_DIM, memory_items=EMBED_CACHE_ITEMS)
+resume_index = ResumeIndex(RESUME_INDEX_DIR, MODEL_DIM)
+
+outbox = ShortlistOutbox(
+    SMTP_HOST, SMTP_PORT, SENDER_EMAIL, APP_PASSWORD,
+    use_ssl=SMTP_SSL, use_starttls=SMTP_STARTTLS, max_retries=SMTP_MAX_RETRIES,
+)
+
+# ---------------- Lazy Model Loading ----------------
+# Heavy models load on first use (or via warm-up), not at import, so cold
+# starts can serve "/" and health checks immediately.
+_model = None
+_model_lock = threading.Lock()
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+LOAD_TIMES_MS = {}
+
+def get_model():
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                start = time.perf_counter()
+                from sentence_transformers import SentenceTransformer
+                loaded = SentenceTransformer(MODEL_NAME)
+                if loaded.get_sentence_embedding_dimension() != MODEL_DIM:
+                    raise RuntimeError(f"{MODEL_NAME} dimension does not match MODEL_DIM={MODEL_DIM}")
+                LOAD_TIMES_MS["sentence_transformer"] = round((time.perf_counter() - start) * 1000, 1)
+                _model = loaded
+    return _model
+
+def load_tokenizer():
+    if "tokenizer" not in LOAD_TIMES_MS:
+        start = time.perf_counter()
+        get_tokenizer()
+        LOAD_TIMES_MS.setdefault("tokenizer", round((time.perf_counter() - start) * 1000, 1))
+
+def load_extraction_pool():
+    if "extraction_pool" not in LOAD_TIMES_MS:
+        start = time.perf_counter()
+        get_pool().submit(to_ascii, "").result()  # forces worker processes to start
+        LOAD_TIMES_MS.setdefault("extraction_pool", round((time.perf_counter() - start) * 1000, 1))
+
+def warm_up():
+    """Load every lazily initialized component; returns load times (ms)."""
+    get_model()
+    load_tokenizer()
+    load_extraction_pool()
+    return dict(LOAD_TIMES_MS)
+
+def start_warm_up():
+    """Run warm_up() in a background thread unless one is already running."""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None or not _warmup_thread.is_alive():
+            _warmup_thread = threading.Thread(target=warm_up, name="model-warmup", daemon=True)
+            _warmup_thread.start()
+
+def readiness():
+    return {
+        "ready": _model is not None,
+        "import_ms": IMPORT_MS,
+        "models": {
+            "sentence_transformer": _model is not None,
+            "tokenizer": "tokenizer" in LOAD_TIMES_MS,
+            "extraction_pool": "extraction_pool" in LOAD_TIMES_MS,
+        },
+        "load_ms": dict(LOAD_TIMES_MS),
+    }
 
 # ---------------- Helper Functions ----------------
-def to_ascii(s):
-    if not s:
-        return ""
-    s = s.replace('\xa0', ' ')
-    return unicodedata.normalize('NFKD', s).encode('ascii', 'ignore').decode('ascii')
-
-def extract_text(file_storage):
-    filename = to_ascii(file_storage.filename.lower())
-    file_bytes = file_storage.read()
-    text = ""
-
-    try:
-        temp_path = f"temp_{filename}"
-        with open(temp_path, "wb") as f:
-            f.write(file_bytes)
-
-        if filename.endswith(".pdf"):
-            text = pdf_extract_text(temp_path)
-        elif filename.endswith(".docx"):
-            text = docx2txt.process(temp_path)
-        else:
-            text = file_bytes.decode("utf-8", errors="ignore")
-
-        os.remove(temp_path)
-    except Exception as e:
-        print(f" Error reading {filename}: {e}")
-        text = ""
-
-    return to_ascii(text).strip()
-
-def extract_email(text):
-    if not text:
-        return None
-
-    text = text.replace("\n", " ").replace("\r", " ")
-    text = text.replace("[at]", "@").replace("(at)", "@")
-    text = text.replace("[dot]", ".").replace("(dot)", ".").lower()
-    text = re.sub(r"\s+", " ", text)
-    text = to_ascii(text)
-
-    doc = nlp(text)
-    for token in doc:
-        if token.like_email:
-            email = re.sub(r"[^a-zA-Z0-9@._+-]", "", token.text.strip())
-            if "@" in email and "." in email.split("@")[-1]:
-                print(f"Found email via spaCy: {email}")
-                return email
-
-    pattern = re.compile(r"([a-zA-Z0-9_.+\-]+@[a-zA-Z0-9\-]+\.[a-zA-Z0-9.\-]+)", re.IGNORECASE)
-    matches = re.findall(pattern, text)
-    for email in matches:
-        clean = email.strip().replace(" ", "").replace("|", "")
-        if "@" in clean and not re.search(r"(example\.com|test\.com|email\.com)", clean):
-            print(f"Found email via regex: {clean}")
-            return clean
-
-    print("No valid email found in this resume.")
-    return None
-
-def send_email(to_email, name):
+def send_email(to_email, name, batch_id):
+    """Queue a shortlist email on the background outbox."""
     if not to_email or "@" not in to_email:
         print(f"Invalid email for {name}, skipping.")
         return
+    outbox.enqueue(batch_id, build_shortlist_message(SENDER_EMAIL, to_email, name))
+
+# ---------------- Batched Screening ----------------
+def encode_texts(texts, batch_size=EMBED_BATCH_SIZE):
+    """Embed texts, running the model only for texts missing from the cache."""
+    vectors = embedding_cache.get_many(texts)
+    missing = [i for i, vector in enumerate(vectors) if vector is None]
+    if missing:
+        missing_texts = [texts[i] for i in missing]
+        encoded = get_model().encode(missing_texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False)
+        embedding_cache.put_many(missing_texts, encoded)
+        for i, vector in zip(missing, encoded):
+            vectors[i] = vector
+    return np.vstack(vectors).astype(np.float32)
+
+def read_uploads(resumes):
+    uploads = []
+    for file in resumes:
+        if not file or file.filename.strip() == "":
+            continue
+        file.stream.seek(0)
+        uploads.append((file.filename, file.read()))
+    return uploads
+
+def cosine_scores(query, matrix):
+    """Cosine similarity of one query vector against every row of matrix."""
+    query = query.reshape(-1)
+    norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+    norms[norms == 0] = 1.0
+    return (matrix @ query) / norms
+
+def round_timings(timings):
+    return {stage: round(ms, 1) for stage, ms in timings.items()}
+
+def iter_screening(jd, uploads, cutoff, send_mails, timings, mail_batch=None):
+    """Yield a result dict for each non-empty resume as soon as its batch is scored.
+
+    Uploads are parsed in the extraction process pool; as parsed texts arrive
+    they are grouped into batches of EMBED_BATCH_SIZE, embedded and scored
+    with one cosine-similarity matrix per batch while the pool keeps parsing
+    the rest. Time (ms) spent per stage is accumulated into `timings`.
+    Shortlist emails go to `mail_batch` on the outbox (a private batch is
+    opened when none is given).
+    """
+    own_batch = send_mails and mail_batch is None
+    if own_batch:
+        mail_batch = outbox.start_batch()
+    for stage in ("extract_wait_ms", "contact_ms", "embed_ms", "score_ms", "index_ms", "email_ms"):
+        timings.setdefault(stage, 0.0)
+
+    pending = []
+    jd_embedding = None
+
+    def score_pending():
+        nonlocal jd_embedding
+        stage_start = time.perf_counter()
+        for candidate in pending:
+            contact = extract_contact_info(candidate["text"], candidate["filename"])
+            candidate["email"], candidate["phone"] = contact["email"], contact["phone"]
+            # Name from the resume header when find_name is confident; else the filename stem.
+            candidate["candidate_name"] = contact["name"] or candidate["candidate_name"]
+        timings["contact_ms"] += (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
+        if jd_embedding is None:
+            jd_embedding = encode_texts([jd])
+        resume_embeddings = encode_texts([c["text"] for c in pending])
+        timings["embed_ms"] += (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
+        scores = cosine_scores(jd_embedding, resume_embeddings).tolist()
+        timings["score_ms"] += (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
+        resume_index.add_many(
+            [cache_key(c["text"], MODEL_NAME) for c in pending],
+            resume_embeddings,
+            [{
+                "filename": c["filename"],
+                "name": c["candidate_name"],
+                "email": c["email"],
+                "phone": c["phone"],
+            } for c in pending],
+        )
+        timings["index_ms"] += (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
+        results = []
+        for candidate, score in zip(pending, scores):
+            email = candidate["email"]
+            results.append({
+                "filename": candidate["filename"],
+                "name": candidate["candidate_name"],
+                "email": email or "Not Found",
+                "phone": candidate["phone"] or "Not Found",
+                "score": round(score, 3),
+                "status": "Shortlisted" if score >= cutoff else "❌ Not Shortlisted"
+            })
+
+            if send_mails and email and score >= cutoff:
+                send_email(email, candidate["candidate_name"], mail_batch)
+        timings["email_ms"] += (time.perf_counter() - stage_start) * 1000
+
+        pending.clear()
+        return results
 
-    name_ascii = to_ascii(name)
-    subject_ascii = to_ascii("Shortlisted for Next Round!")
-    body = f"""
-Hi {name_ascii},
-
-Congratulations! You have been shortlisted for the next round of our recruitment process.
-Our HR team will reach out to you soon with further details.
-
-Regards,
-HR Team
-"""
-    body_ascii = to_ascii(body)
+    try:
+        extracted = iter_extracted(uploads)
+        while True:
+            stage_start = time.perf_counter()
+            item = next(extracted, None)
+            timings["extract_wait_ms"] += (time.perf_counter() - stage_start) * 1000
+            if item is None:
+                break
+
+            filename, resume_text = item
+            filename_safe = to_ascii(filename)
+            print(f"Processing: {filename_safe}")
+            if not resume_text.strip():
+                print(f"Skipping empty resume: {filename_safe}")
+                continue
+
+            pending.append({
+                "filename": filename_safe,
+                "candidate_name": to_ascii(filename.rsplit('.', 1)[0]),
+                "text": resume_text,
+            })
+            if len(pending) >= EMBED_BATCH_SIZE:
+                yield from score_pending()
+        if pending:
+            yield from score_pending()
+    finally:
+        if own_batch:
+            outbox.close_batch(mail_batch)
+
+def screen_batch(jd, resumes, cutoff, send_mails, mail_batch=None):
+    """Screen all uploads and return (results sorted by score, per-stage timings)."""
+    timings = {}
+    total_start = time.perf_counter()
+
+    stage_start = time.perf_counter()
+    uploads = read_uploads(resumes)
+    timings["read_ms"] = (time.perf_counter() - stage_start) * 1000
+
+    results = list(iter_screening(jd, uploads, cutoff, send_mails, timings, mail_batch))
+    timings["total_ms"] = (time.perf_counter() - total_start) * 1000
 
-    msg = EmailMessage()
-    msg["From"] = to_ascii(SENDER_EMAIL)
-    msg["To"] = to_ascii(to_email)
-    msg["Subject"] = subject_ascii
-    msg.set_content(body_ascii)
+    results.sort(key=lambda x: x["score"], reverse=True)
+    timings = round_timings(timings)
+    print(f"Screening timings for {len(results)} resumes: {timings}")
+    print(f"Embedding cache: {embedding_cache.stats()}")
+    return results, timings
 
-    try:
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(SENDER_EMAIL, APP_PASSWORD)
-            server.send_message(msg)
-        print(f"Email sent to {to_email}")
-    except Exception as e:
-        print(f"Failed to send email to {to_email}: {e}")
+# Started by create_app() / __main__ (or lazily by the first submitted job),
+# never at import, so spawned helper processes do not recover jobs.
+job_queue = ScreeningJobQueue(
+    JOBS_DB_PATH, iter_screening, workers=SCREEN_JOB_WORKERS, lease_seconds=SCREEN_JOB_LEASE_SECONDS
+)
 
 # ---------------- Routes ----------------
 @app.route("/")
 def home():
     return render_template("upload.html")
 
+@app.route("/healthz")
+def healthz():
+    return jsonify({"ok": True})
+
+@app.route("/readyz")
+def readyz():
+    state = readiness()
+    if not state["ready"]:
+        start_warm_up()  # with WARMUP_ON_START=false the first probe starts loading
+    return jsonify(state), (200 if state["ready"] else 503)
+
+@app.route("/api/warmup", methods=["POST"])
+def api_warmup():
+    load_ms = warm_up()
+    return jsonify({"success": True, "load_ms": load_ms, **readiness()})
+
 @app.route("/screen", methods=["POST"])
 def screen_resumes():
     jd = request.form.get("jd", "").strip()
@@ -131,41 +307,8 @@ def screen_resumes():
         return render_template("upload.html", error="Please upload at least one resume.")
     cutoff = float(cutoff) if cutoff else 0.5
 
-    jd_embedding = model.encode(jd, convert_to_tensor=True)
-    results = []
     print(f"Total resumes received: {len(resumes)}")
-
-    for file in resumes:
-        if not file or file.filename.strip() == "":
-            continue
-
-        filename_safe = to_ascii(file.filename)
-        print(f"Processing: {filename_safe}")
-        file.stream.seek(0)
-        resume_text = extract_text(file)
-        email = extract_email(resume_text)
-        candidate_name = to_ascii(file.filename.rsplit('.', 1)[0])
-
-        if not resume_text.strip():
-            print(f"Skipping empty resume: {filename_safe}")
-            continue
-
-        resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-        score = float(util.cos_sim(jd_embedding, resume_embedding))
-
-        result = {
-            "filename": filename_safe,
-            "name": candidate_name,
-            "email": email or "Not Found",
-            "score": round(score, 3),
-            "status": "Shortlisted" if score >= cutoff else "❌ Not Shortlisted"
-        }
-        results.append(result)
-
-        if send_mails and email and score >= cutoff:
-            send_email(email, candidate_name)
-
-    results.sort(key=lambda x: x["score"], reverse=True)
+    results, _ = screen_batch(jd, resumes, cutoff, send_mails)
     print(f"Screening complete. {len(results)} resumes processed.")
     return render_template("results.html", results=results, cutoff=cutoff)
 
@@ -183,42 +326,177 @@ def api_screen_resumes():
 
     cutoff = float(cutoff) if cutoff else 0.5
 
-    jd_embedding = model.encode(jd, convert_to_tensor=True)
-    results = []
-
-    for file in resumes:
-        if not file or file.filename.strip() == "":
-            continue
-
-        filename_safe = to_ascii(file.filename)
-        file.stream.seek(0)
-        resume_text = extract_text(file)
-        email = extract_email(resume_text)
-        candidate_name = to_ascii(file.filename.rsplit('.', 1)[0])
-
-        if not resume_text.strip():
-            continue
+    mail_batch = outbox.start_batch() if send_mails else None
+    try:
+        results, timings = screen_batch(jd, resumes, cutoff, send_mails, mail_batch)
+    finally:
+        if mail_batch:
+            outbox.close_batch(mail_batch)
+    return jsonify({
+        "success": True, "results": results, "cutoff": cutoff, "timings": timings, "mail_batch_id": mail_batch
+    })
+
+@app.route("/api/screen/stream", methods=["POST"])
+def api_screen_resumes_stream():
+    """NDJSON variant of /api/screen.
+
+    Emits {"type": "result", ...} per scored resume as soon as its batch is
+    done, then one {"type": "summary", "ranking": [...]} record sorted by score.
+    """
+    jd = request.form.get("jd", "").strip()
+    cutoff = request.form.get("cutoff", "").strip()
+    send_mails = request.form.get("send_mails") == "on"
+    resumes = request.files.getlist("resumes[]")
 
-        resume_embedding = model.encode(resume_text, convert_to_tensor=True)
-        score = float(util.cos_sim(jd_embedding, resume_embedding))
+    if not jd:
+        return jsonify({"success": False, "message": "Job description is required"}), 400
+    if not resumes or (resumes and resumes[0].filename == ""):
+        return jsonify({"success": False, "message": "At least one resume is required"}), 400
 
-        result = {
-            "filename": filename_safe,
-            "name": candidate_name,
-            "email": email or "Not Found",
-            "score": round(score, 3),
-            "status": "Shortlisted" if score >= cutoff else "❌ Not Shortlisted"
-        }
-        results.append(result)
+    cutoff = float(cutoff) if cutoff else 0.5
+    uploads = read_uploads(resumes)
+
+    def generate():
+        timings = {}
+        total_start = time.perf_counter()
+        ranking = []
+        # Opened here, not in the view: a client that disconnects before the
+        # first chunk never starts the generator, and its batch would stay open.
+        mail_batch = outbox.start_batch() if send_mails else None
+        try:
+            for result in iter_screening(jd, uploads, cutoff, send_mails, timings, mail_batch):
+                ranking.append({key: result[key] for key in ("filename", "name", "score", "status")})
+                yield json.dumps({"type": "result", **result}) + "\n"
+        except Exception as e:
+            print(f"Streaming screening failed: {e}")
+            yield json.dumps({"type": "error", "success": False, "message": str(e)}) + "\n"
+            return
+        finally:
+            if mail_batch:
+                outbox.close_batch(mail_batch)
+
+        timings["total_ms"] = (time.perf_counter() - total_start) * 1000
+        ranking.sort(key=lambda x: x["score"], reverse=True)
+        yield json.dumps({
+            "type": "summary",
+            "success": True,
+            "count": len(ranking),
+            "cutoff": cutoff,
+            "ranking": ranking,
+            "timings": round_timings(timings),
+            "mail_batch_id": mail_batch,
+        }) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.route("/api/jobs", methods=["POST"])
+def api_submit_screening_job():
+    jd = request.form.get("jd", "").strip()
+    cutoff = request.form.get("cutoff", "").strip()
+    send_mails = request.form.get("send_mails") == "on"
+    resumes = request.files.getlist("resumes[]")
 
-        if send_mails and email and score >= cutoff:
-            send_email(email, candidate_name)
+    if not jd:
+        return jsonify({"success": False, "message": "Job description is required"}), 400
+    if not resumes or (resumes and resumes[0].filename == ""):
+        return jsonify({"success": False, "message": "At least one resume is required"}), 400
 
-    results.sort(key=lambda x: x["score"], reverse=True)
-    return jsonify({"success": True, "results": results, "cutoff": cutoff})
+    cutoff = float(cutoff) if cutoff else 0.5
+    job_id = job_queue.submit(jd, read_uploads(resumes), cutoff, send_mails)
+    return jsonify({"success": True, "job_id": job_id, "status": "queued"}), 202
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def api_screening_job_status(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Job not found"}), 404
+    return jsonify({"success": True, **job})
+
+@app.route("/api/jobs/<job_id>/results", methods=["GET"])
+def api_screening_job_results(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "message": "Job not found"}), 404
+
+    page = max(1, request.args.get("page", 1, type=int))
+    per_page = min(500, max(1, request.args.get("per_page", 50, type=int)))
+    total, results = job_queue.results(job_id, page, per_page)
+    return jsonify({
+        "success": True,
+        "job_id": job_id,
+        "status": job["status"],
+        "cutoff": job["cutoff"],
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "results": results,
+    })
+
+@app.route("/api/search", methods=["POST"])
+def api_search_candidates():
+    """Top-k previously screened resumes for a JD, from the persistent ANN index."""
+    data = request.get_json(silent=True) or request.form
+    jd = (data.get("jd") or "").strip()
+    if not jd:
+        return jsonify({"success": False, "message": "Job description is required"}), 400
+    try:
+        k = min(200, max(1, int(data.get("k") or 10)))
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "message": "k must be an integer"}), 400
+
+    start = time.perf_counter()
+    jd_embedding = encode_texts([jd])
+    embed_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    matches = resume_index.search(jd_embedding[0], k)
+    search_ms = (time.perf_counter() - start) * 1000
+
+    results = [{
+        "rank": rank,
+        "score": round(score, 3),
+        "filename": meta.get("filename"),
+        "name": meta.get("name"),
+        "email": meta.get("email") or "Not Found",
+        "phone": meta.get("phone") or "Not Found",
+        "indexed_at": meta.get("indexed_at"),
+    } for rank, (score, meta) in enumerate(matches, 1)]
+    return jsonify({
+        "success": True,
+        "results": results,
+        "timings": {"embed_ms": round(embed_ms, 1), "search_ms": round(search_ms, 2)},
+        "index": resume_index.stats(),
+    })
+
+@app.route("/api/mail/<batch_id>", methods=["GET"])
+def api_mail_batch_status(batch_id):
+    status = outbox.batch_status(batch_id)
+    if status is None:
+        return jsonify({"success": False, "message": "Mail batch not found"}), 404
+    return jsonify({"success": True, **status})
+
+IMPORT_MS = round((time.perf_counter() - _IMPORT_START) * 1000, 1)
+print(f"resume_screening_flask imported in {IMPORT_MS} ms")
 
 # ---------------- Run App ----------------
+def create_app():
+    """WSGI entry point, e.g. `gunicorn "resume_screening_flask:create_app()"`."""
+    job_queue.start()
+    if WARMUP_ON_START:
+        start_warm_up()
+    return app
+
 if __name__ == "__main__":
-    import os
-    port = int(os.environ.get("PORT", 5000))
-    app.run(host="0.0.0.0", port=port)
+    parser = argparse.ArgumentParser(description="Bulk resume screening service")
+    parser.add_argument("--warmup", action="store_true", help="Load all models, print load times and exit")
+    args = parser.parse_args()
+
+    if args.warmup:
+        print(json.dumps({"load_ms": warm_up(), "import_ms": IMPORT_MS}))
+    else:
+        port = int(os.environ.get("PORT", 5000))
+        create_app().run(host="0.0.0.0", port=port)
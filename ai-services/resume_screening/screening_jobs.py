@@ -0,0 +1,248 @@
+# filename: screening_jobs.py
+# Background resume screening jobs persisted in SQLite.
+#
+# A job stores its JD, options and uploaded files; a small thread pool runs
+# the screening generator and records results as they are scored, so callers
+# can poll progress and page through the ranking. Uploads are dropped once a
+# job finishes; finished jobs and their results survive restarts.
+#
+# Several processes (gunicorn workers) may share the database. A job is run
+# by whoever claims it with an atomic UPDATE; the owner refreshes a heartbeat
+# while it runs, and a job whose heartbeat is older than the lease is
+# reclaimed by another process's recovery poller (results cleared, emails
+# off). Nothing happens at construction: call start() from the entry point.
+import json, os, sqlite3, threading, time, uuid
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    jd TEXT NOT NULL,
+    cutoff REAL NOT NULL,
+    send_mails INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    timings TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    heartbeat REAL
+);
+CREATE TABLE IF NOT EXISTS job_uploads (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    name TEXT,
+    email TEXT,
+    phone TEXT,
+    score REAL NOT NULL,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_job_results_rank ON job_results (job_id, score DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, heartbeat);
+"""
+
+RESULT_FIELDS = ("filename", "name", "email", "phone", "score", "status")
+
+class ScreeningJobQueue:
+    def __init__(self, db_path, screen_func, workers=1, lease_seconds=120):
+        """screen_func(jd, uploads, cutoff, send_mails, timings) must yield result dicts."""
+        self.db_path = db_path
+        self.screen_func = screen_func
+        self.lease_seconds = lease_seconds
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="screening-job")
+        self._started = False
+        self._start_lock = threading.Lock()
+        self._pending = set()   # job ids waiting in this process's executor
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, kind in (("owner", "TEXT"), ("heartbeat", "REAL")):
+                if columns and column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    # ---------------- Leases ----------------
+    def start(self):
+        """Start the heartbeat and recovery threads (idempotent; call once per process)."""
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._heartbeat_loop, name="screening-heartbeat", daemon=True).start()
+        threading.Thread(target=self._recovery_loop, name="screening-recovery", daemon=True).start()
+
+    def _claim(self, job_id):
+        """Atomically take a queued job, or a running one whose lease expired.
+
+        A reclaimed job restarts from scratch with emails disabled, since some
+        candidates may have been mailed before its previous owner died.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            claimed = conn.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, heartbeat = ?, started_at = ? "
+                "WHERE id = ? AND status = 'queued'",
+                (self.owner, now, now, job_id),
+            ).rowcount
+            if claimed:
+                return True
+            reclaimed = conn.execute(
+                "UPDATE jobs SET owner = ?, heartbeat = ?, started_at = ?, processed = 0, send_mails = 0 "
+                "WHERE id = ? AND status = 'running' AND heartbeat < ?",
+                (self.owner, now, now, job_id, now - self.lease_seconds),
+            ).rowcount
+            if reclaimed:
+                conn.execute("DELETE FROM job_results WHERE job_id = ?", (job_id,))
+                print(f"Reclaimed screening job {job_id} after its lease expired")
+            return bool(reclaimed)
+
+    def _heartbeat_loop(self):
+        while True:
+            time.sleep(self.lease_seconds / 3)
+            try:
+                with self._connect() as conn:
+                    conn.execute("UPDATE jobs SET heartbeat = ? WHERE owner = ? AND status = 'running'",
+                                 (time.time(), self.owner))
+            except sqlite3.Error as e:
+                print(f"Screening job heartbeat failed: {e}")
+
+    def _recovery_loop(self):
+        """Pick up jobs nobody is running: never claimed, or left by a dead process."""
+        while True:
+            try:
+                with self._connect() as conn:
+                    rows = conn.execute(
+                        "SELECT id FROM jobs WHERE (status = 'queued' AND created_at < ?) "
+                        "OR (status = 'running' AND heartbeat < ?)",
+                        (time.time() - self.lease_seconds, time.time() - self.lease_seconds),
+                    ).fetchall()
+                for (job_id,) in rows:
+                    self._enqueue(job_id)
+            except sqlite3.Error as e:
+                print(f"Screening job recovery failed: {e}")
+            time.sleep(self.lease_seconds / 2)
+
+    # ---------------- Submission ----------------
+    def submit(self, jd, uploads, cutoff, send_mails):
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, jd, cutoff, send_mails, total, created_at) VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, jd, cutoff, int(send_mails), len(uploads), time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO job_uploads (job_id, seq, filename, data) VALUES (?, ?, ?, ?)",
+                [(job_id, seq, filename, sqlite3.Binary(data)) for seq, (filename, data) in enumerate(uploads)],
+            )
+        self.start()
+        self._enqueue(job_id)
+        return job_id
+
+    def _enqueue(self, job_id):
+        with self._start_lock:
+            if job_id in self._pending:
+                return
+            self._pending.add(job_id)
+        self._executor.submit(self._run, job_id)
+
+    # ---------------- Worker ----------------
+    def _run(self, job_id):
+        with self._start_lock:
+            self._pending.discard(job_id)
+        if not self._claim(job_id):
+            return   # another process owns it, or it already finished
+        with self._connect() as conn:
+            job = conn.execute("SELECT jd, cutoff, send_mails FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            uploads = conn.execute(
+                "SELECT filename, data FROM job_uploads WHERE job_id = ? ORDER BY seq", (job_id,)
+            ).fetchall()
+
+        jd, cutoff, send_mails = job
+        uploads = [(filename, bytes(data)) for filename, data in uploads]
+        timings = {}
+        total_start = time.perf_counter()
+        conn = self._connect()
+        owned = True
+        try:
+            for result in self.screen_func(jd, uploads, cutoff, bool(send_mails), timings):
+                # Every write is conditional on still holding the lease, so a
+                # stalled owner that lost its job cannot add duplicate results.
+                owned = conn.execute(
+                    "UPDATE jobs SET processed = processed + 1, heartbeat = ? WHERE id = ? AND owner = ?",
+                    (time.time(), job_id, self.owner),
+                ).rowcount == 1
+                if not owned:
+                    print(f"Lost the lease on screening job {job_id}; stopping")
+                    conn.rollback()
+                    return
+                conn.execute(
+                    "INSERT INTO job_results (job_id, filename, name, email, phone, score, status) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, *(result.get(field) for field in RESULT_FIELDS)),
+                )
+                conn.commit()
+            timings["total_ms"] = (time.perf_counter() - total_start) * 1000
+            owned = conn.execute(
+                "UPDATE jobs SET status = 'finished', processed = total, finished_at = ?, timings = ? "
+                "WHERE id = ? AND owner = ?",
+                (time.time(), json.dumps({k: round(v, 1) for k, v in timings.items()}), job_id, self.owner),
+            ).rowcount == 1
+        except Exception as e:
+            print(f"Screening job {job_id} failed: {e}")
+            conn.rollback()
+            owned = conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ? AND owner = ?",
+                (str(e), time.time(), job_id, self.owner),
+            ).rowcount == 1
+        finally:
+            if owned:
+                conn.execute("DELETE FROM job_uploads WHERE job_id = ?", (job_id,))
+            conn.commit()
+            conn.close()
+
+    # ---------------- Queries ----------------
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, status, cutoff, total, processed, timings, error, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job_id, status, cutoff, total, processed, timings, error, created_at, started_at, finished_at = row
+        return {
+            "job_id": job_id,
+            "status": status,
+            "cutoff": cutoff,
+            "progress": {"processed": processed, "total": total},
+            "timings": json.loads(timings) if timings else None,
+            "error": error,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+        }
+
+    def results(self, job_id, page=1, per_page=50):
+        offset = (page - 1) * per_page
+        with self._connect() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM job_results WHERE job_id = ?", (job_id,)).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {', '.join(RESULT_FIELDS)} FROM job_results WHERE job_id = ? "
+                "ORDER BY score DESC, rowid LIMIT ? OFFSET ?",
+                (job_id, per_page, offset),
+            ).fetchall()
+        return count, [dict(zip(RESULT_FIELDS, row)) for row in rows]
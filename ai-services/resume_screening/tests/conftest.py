@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The service runs as a flat script directory; make its modules importable.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
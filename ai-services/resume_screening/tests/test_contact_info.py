@@ -0,0 +1,44 @@
+import pytest
+
+from contact_info import extract_contact_info, find_name, find_phone
+
+
+@pytest.mark.parametrize("text", [
+    "Software Engineer\nJane Doe\njane@corp.io",
+    "Senior Data Analyst\n5 years of experience\nwork@corp.io",
+    "Curriculum Vitae\nProfessional Summary\nBuilt things.",
+    "FULL STACK DEVELOPER\nReact, Node",
+    "software engineer\njane doe",
+    "Project Manager",
+])
+def test_title_and_section_lines_are_not_names(text):
+    assert find_name(text.split("\n", 1)[0] + "\nno name here") is None
+
+
+def test_first_line_name():
+    assert find_name("Jane Doe\nSoftware Engineer\njane@corp.io") == "Jane Doe"
+    assert find_name("JANE DOE\nSoftware Engineer") == "Jane Doe"
+    assert find_name("Mary-Jane O'Neil\nDeveloper") == "Mary-Jane O'Neil"
+
+
+def test_name_below_a_heading_needs_a_hint():
+    text = "Curriculum Vitae\nJane Doe\nSoftware Engineer"
+    assert find_name(text) is None
+    assert find_name(text, email="jane.doe@corp.io") == "Jane Doe"
+    assert find_name(text, filename="doe_cv.pdf") == "Jane Doe"
+
+
+def test_title_line_resume_keeps_filename_fallback():
+    info = extract_contact_info("Software Engineer\nPython, Go\nworked 2015 - 2018 2019", "john_smith.pdf")
+    assert info["name"] is None
+    assert info["phone"] is None
+
+
+@pytest.mark.parametrize("text, phone", [
+    ("Phone: +1 (555) 123-4567", "+1 (555) 123-4567"),
+    ("Tel +44 20 7946 0958", "+44 20 7946 0958"),
+    ("Worked 2015 - 2018 2019 at X", None),
+    ("Windows 10.0.19041.1", None),
+])
+def test_find_phone(text, phone):
+    assert find_phone(text) == phone
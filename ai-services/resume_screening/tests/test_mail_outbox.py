@@ -0,0 +1,107 @@
+import socket
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from mail_outbox import ShortlistOutbox, build_shortlist_message
+
+
+class Handler:
+    """Records delivered messages; answers the first `fail_first` DATA commands with a 451."""
+
+    def __init__(self, fail_first=0):
+        self.fail_first = fail_first
+        self.delivered = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bounce"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if self.fail_first:
+            self.fail_first -= 1
+            return "451 Try again later"
+        self.delivered.append(envelope.rcpt_tos[0])
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtpd(request):
+    handler = Handler(**getattr(request, "param", {}))
+    controller = Controller(
+        handler, hostname="127.0.0.1", port=free_port(),
+        authenticator=lambda *args: AuthResult(success=True), auth_require_tls=False,
+    )
+    controller.start()
+    yield controller
+    controller.stop()
+
+
+def outbox_for(controller, **kwargs):
+    kwargs.setdefault("use_ssl", False)
+    return ShortlistOutbox(controller.hostname, controller.port, backoff=0.01, idle_timeout=0.1, **kwargs)
+
+
+def send(outbox, *recipients):
+    batch_id = outbox.start_batch()
+    for to in recipients:
+        outbox.enqueue(batch_id, build_shortlist_message("hr@example.com", to, "Jane Doe"))
+    outbox.close_batch(batch_id)
+    assert outbox.wait_idle(timeout=10)
+    return outbox.batch_status(batch_id)
+
+
+def test_batch_is_delivered_over_one_connection(smtpd):
+    outbox = outbox_for(smtpd)
+    status = send(outbox, "a@example.com", "b@example.com")
+    assert status["done"] and status["sent"] == 2 and status["failed"] == 0
+    assert smtpd.handler.delivered == ["a@example.com", "b@example.com"]
+    assert outbox.connections_opened == 1
+
+
+@pytest.mark.parametrize("smtpd", [{"fail_first": 2}], indirect=True)
+def test_transient_errors_are_retried(smtpd):
+    status = send(outbox_for(smtpd, max_retries=3), "a@example.com")
+    assert status["sent"] == 1
+    assert status["recipients"][0]["attempts"] == 3
+    assert smtpd.handler.delivered == ["a@example.com"]
+
+
+@pytest.mark.parametrize("smtpd", [{"fail_first": 5}], indirect=True)
+def test_retries_are_bounded(smtpd):
+    status = send(outbox_for(smtpd, max_retries=2), "a@example.com")
+    assert status["failed"] == 1
+    assert status["recipients"][0]["attempts"] == 3
+    assert "451" in status["recipients"][0]["error"]
+
+
+def test_rejected_recipient_is_not_retried(smtpd):
+    status = send(outbox_for(smtpd), "bounce@example.com", "a@example.com")
+    assert status["done"] and status["sent"] == 1 and status["failed"] == 1
+    assert status["recipients"][0]["attempts"] == 1
+    assert smtpd.handler.delivered == ["a@example.com"]
+
+
+def test_login_requires_starttls(smtpd):
+    # The stand-in server offers no STARTTLS, so credentials must never be sent.
+    status = send(outbox_for(smtpd, username="hr@example.com", password="secret"), "a@example.com")
+    assert status["failed"] == 1
+    assert status["recipients"][0]["attempts"] == 1
+    assert "STARTTLS" in status["recipients"][0]["error"]
+    assert smtpd.handler.delivered == []
+
+
+def test_starttls_can_be_disabled_for_local_servers(smtpd):
+    outbox = outbox_for(smtpd, username="hr@example.com", password="secret", use_starttls=False)
+    assert send(outbox, "a@example.com")["sent"] == 1
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from resume_index import ResumeIndex
+
+DIM = 8
+
+
+def vector(seed):
+    return np.random.default_rng(seed).standard_normal(DIM)
+
+
+@pytest.fixture
+def pair(tmp_path):
+    """Two handles on one index directory, as two worker processes would hold."""
+    return ResumeIndex(str(tmp_path), DIM), ResumeIndex(str(tmp_path), DIM)
+
+
+def names(results):
+    return [meta["name"] for _, meta in results]
+
+
+def test_sees_rows_added_elsewhere(pair):
+    writer, reader = pair
+    writer.add_many(["a", "b"], [vector(1), vector(2)], [{"name": "A"}, {"name": "B"}])
+    assert names(reader.search(vector(1), k=1)) == ["A"]
+    assert reader.stats()["resumes"] == 2
+
+
+def test_sees_metadata_only_updates_elsewhere(pair):
+    writer, reader = pair
+    writer.add_many(["a"], [vector(1)], [{"name": "A", "score": 0.5}])
+    assert reader.search(vector(1), k=1)[0][1]["score"] == 0.5
+    # A re-screen adds no row, only a new metadata line.
+    writer.add_many(["a"], [vector(1)], [{"name": "A", "score": 0.9}])
+    assert reader.search(vector(1), k=1)[0][1]["score"] == 0.9
+
+
+def test_sees_metadata_after_compaction_elsewhere(pair):
+    writer, reader = pair
+    writer.add_many(["a"], [vector(1)], [{"name": "A", "score": 0}])
+    reader.search(vector(1))
+    for score in range(1, 1005):
+        writer.add_many(["a"], [vector(1)], [{"name": "A", "score": score}])
+    assert writer._meta_lines < 1000  # compacted along the way
+    assert reader.search(vector(1), k=1)[0][1]["score"] == 1004
@@ -0,0 +1,10 @@
+# filename: text_cache.py
+# Extracted-text cache keyed by the SHA-256 of the uploaded file bytes; the
+# implementation is shared with interview_analysis in ai-services/common/text_cache.py.
+import os, sys
+
+_AI_SERVICES = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _AI_SERVICES not in sys.path:
+    sys.path.append(_AI_SERVICES)
+
+from common.text_cache import *  # noqa: E402,F401,F403
@@ -0,0 +1,117 @@
+# filename: text_extraction.py
+# Resume text extraction, kept free of Flask/model imports so worker
+# processes can import it cheaply.
+import io, multiprocessing, os, threading, unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pdfminer.high_level import extract_text as pdf_extract_text
+import docx2txt
+from text_cache import file_digest, get_text_cache
+
+# ---------------- Worker Pool Settings ----------------
+EXTRACT_WORKERS = max(1, int(os.getenv("EXTRACT_WORKERS", "0")) or min(4, os.cpu_count() or 1))
+# "fork" where available: spawn/forkserver workers re-import the main module
+# (the Flask app and its import-time setup) just to parse files.
+EXTRACT_START_METHOD = os.getenv(
+    "EXTRACT_START_METHOD", "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# ---------------- Helper Functions ----------------
+def to_ascii(s):
+    if not s:
+        return ""
+    s = s.replace('\xa0', ' ')
+    return unicodedata.normalize('NFKD', s).encode('ascii', 'ignore').decode('ascii')
+
+def extract_text_from_bytes(filename, file_bytes):
+    """Parse a PDF/DOCX/plain-text upload straight from memory."""
+    filename = to_ascii((filename or "").lower())
+    text = ""
+
+    try:
+        if filename.endswith(".pdf"):
+            text = pdf_extract_text(io.BytesIO(file_bytes))
+        elif filename.endswith(".docx"):
+            text = docx2txt.process(io.BytesIO(file_bytes))
+        else:
+            text = file_bytes.decode("utf-8", errors="ignore")
+    except Exception as e:
+        print(f" Error reading {filename}: {e}")
+        text = ""
+
+    return to_ascii(text).strip()
+
+# ---------------- Process Pool ----------------
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=EXTRACT_WORKERS, mp_context=multiprocessing.get_context(EXTRACT_START_METHOD)
+            )
+        return _pool
+
+def _reset_pool(broken):
+    """Drop a pool whose worker died (OOM, parser segfault); get_pool() builds a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+def _submit(filename, data):
+    """(pool, future) for one upload, rebuilding the pool once if it is already broken."""
+    pool = get_pool()
+    try:
+        return pool, pool.submit(extract_text_from_bytes, filename, data)
+    except BrokenProcessPool:
+        _reset_pool(pool)
+        pool = get_pool()
+        return pool, pool.submit(extract_text_from_bytes, filename, data)
+
+def iter_extracted(uploads):
+    """Yield (filename, text) for each (filename, bytes) upload, in upload order.
+
+    Files already in the text cache are served without touching the pool;
+    every other file is submitted up front, so the workers keep parsing ahead
+    while the caller consumes (and embeds) earlier results.
+    """
+    cache = get_text_cache()
+    jobs = []
+    for filename, data in uploads:
+        digest = file_digest(data)
+        text = cache.get(digest)
+        submitted = _submit(filename, data) if text is None else None
+        jobs.append([filename, data, digest, text, submitted])
+
+    for i, (filename, data, digest, text, submitted) in enumerate(jobs):
+        if submitted is not None:
+            try:
+                text = submitted[1].result()
+                cache.put(digest, text)
+            except BrokenProcessPool:
+                # A dead worker takes the whole pool down: rebuild it, retry
+                # this file once on its own, then resubmit the files after it.
+                print(f" Extraction pool broke on {to_ascii(filename)}; retrying on a new pool")
+                _reset_pool(submitted[0])
+                pool, future = _submit(filename, data)
+                try:
+                    text = future.result()
+                    cache.put(digest, text)
+                except BrokenProcessPool:
+                    print(f" Extraction crashed twice for {to_ascii(filename)}; skipping it")
+                    _reset_pool(pool)
+                    text = ""
+                except Exception as e:
+                    print(f" Extraction worker failed for {to_ascii(filename)}: {e}")
+                    text = ""
+                for later in jobs[i + 1:]:
+                    if later[4] is not None:
+                        later[4] = _submit(later[0], later[1])
+            except Exception as e:
+                print(f" Extraction worker failed for {to_ascii(filename)}: {e}")
+                text = ""
+        yield filename, text
@@ -1,4 +1,5 @@
 import express from "express";
+import axios from "axios";
 import { spawn } from "child_process";
 import path from "path";
 import { fileURLToPath } from "url";
@@ -12,6 +13,17 @@ const __dirname = path.dirname(__filename);
 const CHATBOT_DIR = path.join(__dirname, "../../../ai-services/chatbot");
 const CHATBOT_PATH = path.join(CHATBOT_DIR, "bot.py");
 
+// Persistent chatbot server (python bot.py --serve). When set, messages are
+// forwarded over HTTP instead of spawning a Python process per message.
+const CHATBOT_SERVICE_URL = process.env.CHATBOT_SERVICE_URL;
+
+// Conversation memory is always keyed under the caller's user id. A client
+// sessionId only picks one of that user's conversations; it is never used as
+// a raw key, so nobody can read or write another user's memory.
+const clientSessionId = (req) =>
+  String(req.body.sessionId || "default").replace(/[^\w-]/g, "").slice(0, 64) || "default";
+const chatSessionId = (req) => `user-${req.user._id}:${clientSessionId(req)}`;
+
 /**
  * @route   GET /api/chatbot/test
  * @desc    Test endpoint for the chatbot (no auth required)
@@ -34,6 +46,19 @@ router.post("/message", protect, async (req, res) => {
       return res.status(400).json({ error: "Message is required" });
     }
 
+    if (CHATBOT_SERVICE_URL) {
+      try {
+        const { data } = await axios.post(`${CHATBOT_SERVICE_URL}/message`, {
+          message,
+          session_id: chatSessionId(req)
+        });
+        return res.json({ response: data.response, sessionId: clientSessionId(req) });
+      } catch (serviceError) {
+        // Fall back to the one-shot process below if the server is down
+        console.error("Chatbot server unavailable, spawning process:", serviceError.message);
+      }
+    }
+
     // Spawn a Python process to run the chatbot script
     // Try 'python3' first, fallback to 'python' if that fails
     const pythonCommand = process.platform === 'win32' ? 'python' : 'python3';
@@ -43,7 +68,9 @@ router.post("/message", protect, async (req, res) => {
     const python = spawn(pythonCommand, [
       CHATBOT_PATH,
       "--message", 
-      message
+      message,
+      "--session",
+      chatSessionId(req)
     ], { 
       cwd: CHATBOT_DIR,  // Set working directory to chatbot directory
       env: { ...process.env }  // Pass environment variables
@@ -81,4 +108,74 @@ router.post("/message", protect, async (req, res) => {
   }
 });
 
+/**
+ * @route   POST /api/chatbot/message/stream
+ * @desc    Stream the chatbot reply as NDJSON: {"type":"chunk","text"} lines
+ *          as the model produces them, then one {"type":"done"} line with
+ *          the full response and time-to-first-token
+ * @access  Private
+ */
+router.post("/message/stream", protect, async (req, res) => {
+  const { message } = req.body;
+
+  if (!message) {
+    return res.status(400).json({ error: "Message is required" });
+  }
+
+  const startStream = () => {
+    res.setHeader("Content-Type", "application/x-ndjson");
+    res.setHeader("Cache-Control", "no-cache");
+    res.setHeader("X-Accel-Buffering", "no");
+  };
+
+  if (CHATBOT_SERVICE_URL) {
+    try {
+      // Pipe the chatbot server's NDJSON stream straight through without buffering it
+      const response = await axios.post(`${CHATBOT_SERVICE_URL}/message/stream`, {
+        message,
+        session_id: chatSessionId(req)
+      }, {
+        responseType: "stream"
+      });
+      startStream();
+      response.data.on("error", (streamError) => {
+        console.error("Chatbot stream error:", streamError);
+        res.end();
+      });
+      return response.data.pipe(res);
+    } catch (serviceError) {
+      // Fall back to the one-shot process below if the server is down
+      console.error("Chatbot server unavailable, spawning process:", serviceError.message);
+    }
+  }
+
+  const pythonCommand = process.platform === 'win32' ? 'python' : 'python3';
+  const python = spawn(pythonCommand, [
+    CHATBOT_PATH,
+    "--message",
+    message,
+    "--stream",
+    "--session",
+    chatSessionId(req)
+  ], {
+    cwd: CHATBOT_DIR,
+    env: { ...process.env }
+  });
+
+  // bot.py --stream prints (and flushes) one NDJSON line per chunk
+  startStream();
+  python.stdout.pipe(res);
+  python.stderr.on("data", (data) => {
+    console.error(`Chatbot: ${data.toString().trim()}`);
+  });
+  python.on("error", (spawnError) => {
+    console.error("Chatbot process error:", spawnError);
+    res.end();
+  });
+  // Stop generating if the client goes away mid-stream
+  res.on("close", () => {
+    if (python.exitCode === null) python.kill();
+  });
+});
+
 export default router;
\ No newline at end of file
@@ -112,6 +112,77 @@ router.post("/screen", protect, upload.array("resumes[]"), async (req, res) => {
   }
 });
 
+/**
+ * @route   POST /api/resume/screen/stream
+ * @desc    Screen resumes and stream one NDJSON line per scored resume,
+ *          followed by a summary line with the sorted ranking
+ * @access  Private (HR only)
+ */
+router.post("/screen/stream", protect, upload.array("resumes[]"), async (req, res) => {
+  try {
+    if (req.user.role.toLowerCase() !== "hr") {
+      return res.status(403).json({ 
+        success: false, 
+        message: "Access denied. Only HR can screen resumes." 
+      });
+    }
+
+    const { jd, cutoff, autoEmail } = req.body;
+    const files = req.files;
+
+    if (!jd) {
+      return res.status(400).json({ 
+        success: false, 
+        message: "Job description is required" 
+      });
+    }
+
+    if (!files || files.length === 0) {
+      return res.status(400).json({ 
+        success: false, 
+        message: "At least one resume file is required" 
+      });
+    }
+
+    const formData = new FormData();
+    formData.append("jd", jd);
+    formData.append("cutoff", cutoff || "0.5");
+    if (autoEmail === true || autoEmail === "true") {
+      formData.append("send_mails", "on");
+    }
+
+    for (const file of files) {
+      const fileData = fs.readFileSync(file.path);
+      const blob = new Blob([fileData]);
+      formData.append("resumes[]", blob, file.originalname);
+    }
+
+    // Pipe the Flask NDJSON stream straight through without buffering it
+    const response = await axios.post(`${FLASK_SERVICE_URL}/api/screen/stream`, formData, {
+      headers: {
+        "Content-Type": "multipart/form-data"
+      },
+      responseType: "stream"
+    });
+
+    res.setHeader("Content-Type", "application/x-ndjson");
+    res.setHeader("Cache-Control", "no-cache");
+    res.setHeader("X-Accel-Buffering", "no");
+    response.data.on("error", (streamError) => {
+      console.error("Resume screening stream error:", streamError);
+      res.end();
+    });
+    response.data.pipe(res);
+  } catch (error) {
+    console.error("Resume screening stream error:", error);
+    return res.status(500).json({ 
+      success: false, 
+      message: "Failed to screen resumes", 
+      error: error.message 
+    });
+  }
+});
+
 /**
  * @route   GET /api/resume/test
  * @desc    Test if Flask service is running